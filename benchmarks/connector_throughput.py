@@ -0,0 +1,121 @@
+"""Benchmark of the dialogue turn loop.
+
+Runs conversations between users with scripted inputs and a ParrotAgent on the
+InMemoryPlatform, i.e., Platform -> DialogueConnector -> Agent without any
+I/O, and reports the number of turns per second and the time per turn as the
+number of concurrent sessions grows. A turn is a user utterance and the agent's
+response. As the agent does next to no work, the time per turn is the overhead
+of the framework.
+
+Usage:
+    python -m benchmarks.connector_throughput --sessions 1 10 100 1000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from dialoguekit.connector import ExportFormat
+from dialoguekit.platforms import InMemoryPlatform
+from sample_agents.parrot_agent import ParrotAgent
+
+
+def run_benchmark(
+    num_sessions: int, num_turns: int, repeat: int, save: bool
+) -> Dict[str, float]:
+    """Runs interleaved sessions and measures the turn throughput.
+
+    Args:
+        num_sessions: Number of concurrent sessions.
+        num_turns: Number of turns per session.
+        repeat: Number of runs; the fastest one is reported.
+        save: Whether the dialogues are exported (JSONL) on disconnect.
+
+    Returns:
+        Number of turns, turns per second and microseconds per turn of the
+        fastest run.
+    """
+    connector_kwargs: Dict[str, Any] = (
+        {"export_format": ExportFormat.JSONL}
+        if save
+        else {"save_dialogue_history": False}
+    )
+    user_ids = [f"USR{i}" for i in range(num_sessions)]
+    best = float("inf")
+    for _ in range(repeat):
+        platform = InMemoryPlatform(ParrotAgent, connector_kwargs)
+        for user_id in user_ids:
+            platform.connect(user_id)
+        start = time.perf_counter()
+        for turn in range(num_turns):
+            text = f"Turn {turn}"
+            for user_id in user_ids:
+                platform.message(user_id, text)
+        for user_id in user_ids:
+            platform.disconnect(user_id)
+        best = min(best, time.perf_counter() - start)
+
+    turns = num_sessions * num_turns
+    return {
+        "turns": turns,
+        "turns_per_second": turns / best,
+        "us_per_turn": best / turns * 1e6,
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    """Runs the benchmark for each number of sessions and prints a table.
+
+    Args:
+        args: Command line arguments.
+    """
+    rows: List[str] = [
+        f"{'sessions':>10} {'turns':>10} {'turns/s':>12} {'us/turn':>10}"
+    ]
+    with tempfile.TemporaryDirectory() as export_dir:
+        # Exports go to 'dialogue_export' in the working directory.
+        os.chdir(export_dir)
+        for num_sessions in args.sessions:
+            result = run_benchmark(
+                num_sessions, args.turns, args.repeat, args.save
+            )
+            rows.append(
+                f"{num_sessions:>10} {result['turns']:>10} "
+                f"{result['turns_per_second']:>12.0f} "
+                f"{result['us_per_turn']:>10.1f}"
+            )
+    print("\n".join(rows))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parses the command line arguments.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="connector_throughput.py")
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100, 1000],
+        help="Numbers of concurrent sessions to benchmark.",
+    )
+    parser.add_argument(
+        "--turns", type=int, default=20, help="Turns per session."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per configuration."
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Export the dialogues (JSONL) on disconnect.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,162 @@
+"""Benchmark of loading dialogue exports for intent-only analytics.
+
+Writes a synthetic JSON Lines export, loads it with `json_to_dialogues()` with
+eager and with lazy decoding of the annotations, or streams it with
+`iter_dialogues()`, and counts the intents of the utterances. Reports the time
+taken and the peak memory allocated, measured with tracemalloc, for each
+mode.
+
+Usage:
+    python -m benchmarks.export_loading --dialogues 2000
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+from dialoguekit.core import AnnotatedUtterance, Dialogue
+from dialoguekit.utils.dialogue_reader import iter_dialogues, json_to_dialogues
+
+_INTENTS = ["DISCLOSE", "INQUIRE", "REVEAL", "ELICIT", "THANK", "BYE"]
+_SLOTS = ["cuisine", "price_range", "area", "rating"]
+
+
+def generate_dialogue(index: int, num_turns: int, rng: random.Random) -> Dict:
+    """Generates a dialogue in the export format.
+
+    Args:
+        index: Index of the dialogue.
+        num_turns: Number of utterances.
+        rng: Random number generator.
+
+    Returns:
+        Dialogue as dictionary.
+    """
+    conversation: List[Dict[str, Any]] = []
+    for turn in range(num_turns):
+        participant = "USER" if turn % 2 else "AGENT"
+        conversation.append(
+            {
+                "participant": participant,
+                "utterance": f"Utterance {turn} of dialogue {index}",
+                "utterance ID": f"CNV{index}_{participant}_{turn}",
+                "dialogue_acts": [
+                    {
+                        "intent": rng.choice(_INTENTS),
+                        "slot_values": [
+                            [slot, f"value {rng.randrange(100)}", None, None]
+                            for slot in rng.sample(_SLOTS, 2)
+                        ],
+                    }
+                ],
+                "annotations": [["sentiment", rng.choice(["pos", "neg"])]],
+            }
+        )
+    return {
+        "conversation ID": f"CNV{index}",
+        "conversation": conversation,
+        "agent": {"id": "Agent"},
+        "user": {"id": f"User{index % 50}"},
+    }
+
+
+def load(filepath: str, mode: str) -> Iterable[Dialogue]:
+    """Loads an export.
+
+    Args:
+        filepath: Path to the export.
+        mode: 'eager', 'lazy' or 'streaming'.
+
+    Returns:
+        Dialogues.
+    """
+    if mode == "streaming":
+        return iter_dialogues(filepath, lazy=True)
+    return json_to_dialogues(filepath, lazy=mode == "lazy")
+
+
+def measure(filepath: str, mode: str) -> Tuple[float, float, Counter]:
+    """Loads an export and counts the intents of its utterances.
+
+    Args:
+        filepath: Path to the export.
+        mode: 'eager', 'lazy' or 'streaming', see `load()`.
+
+    Returns:
+        Time taken in seconds, peak memory in MiB and intent counts.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    counts: Counter = Counter()
+    dialogues = load(filepath, mode)
+    for dialogue in dialogues:
+        for utterance in dialogue.utterances:
+            if isinstance(utterance, AnnotatedUtterance):
+                counts.update(
+                    intent.label for intent in utterance.get_intents()
+                )
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del dialogues
+    return elapsed, peak / 2**20, counts
+
+
+def main(args: argparse.Namespace) -> None:
+    """Runs the benchmark and prints a table.
+
+    Args:
+        args: Command line arguments.
+    """
+    rng = random.Random(0)
+    fd, filepath = tempfile.mkstemp(suffix=".jsonl")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for index in range(args.dialogues):
+                dialogue = generate_dialogue(index, args.turns, rng)
+                f.write(json.dumps(dialogue) + "\n")
+        results = {
+            mode: measure(filepath, mode)
+            for mode in ["eager", "lazy", "streaming"]
+        }
+    finally:
+        os.remove(filepath)
+    assert len({str(counts) for _, _, counts in results.values()}) == 1
+
+    print(f"{'mode':>10} {'seconds':>10} {'peak MiB':>10}")
+    for mode, (elapsed, peak, _) in results.items():
+        print(f"{mode:>10} {elapsed:>10.2f} {peak:>10.1f}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parses the command line arguments.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="export_loading.py")
+    parser.add_argument(
+        "--dialogues",
+        type=int,
+        default=2000,
+        help="Number of dialogues in the export.",
+    )
+    parser.add_argument(
+        "--turns",
+        type=int,
+        default=20,
+        help="Number of utterances per dialogue.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
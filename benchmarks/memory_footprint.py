@@ -0,0 +1,201 @@
+"""Benchmark of the memory footprint of annotated utterances.
+
+Builds a synthetic corpus of annotated utterances and reports the number of
+bytes allocated per utterance, measured with tracemalloc, for the compact
+(slotted, with containers created on first access) core dataclasses and for
+replicas of their former layout (with an instance dictionary and eagerly
+created containers). Strings are shared between both corpora, so the
+difference is the overhead of the objects themselves.
+
+Usage:
+    python -m benchmarks.memory_footprint --utterances 100000
+"""
+
+import argparse
+import gc
+import random
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+
+from dialoguekit.core import AnnotatedUtterance, Intent, SlotValueAnnotation
+from dialoguekit.core.dialogue_act import DialogueAct
+from dialoguekit.participant import DialogueParticipant
+
+_INTENTS = ["DISCLOSE", "INQUIRE", "REVEAL", "ELICIT", "THANK", "BYE"]
+_SLOTS = ["cuisine", "price_range", "area", "rating"]
+
+
+@dataclass(eq=True, unsafe_hash=True)
+class _LegacyAnnotation:
+    key: str = field(hash=True)
+    value: Any = field(default=None, hash=True)
+
+
+@dataclass(eq=True, unsafe_hash=True)
+class _LegacySlotValueAnnotation(_LegacyAnnotation):
+    slot: str = field(default=None, hash=True)
+    start: int = field(default=None, hash=True)
+    end: int = field(default=None, hash=True)
+
+
+@dataclass(eq=True, unsafe_hash=True)
+class _LegacyDialogueAct:
+    intent: Intent = field(default=None, hash=True)
+    annotations: List[_LegacySlotValueAnnotation] = field(
+        default_factory=list, compare=True, hash=False
+    )
+
+
+@dataclass(eq=True, unsafe_hash=True)
+class _LegacyAnnotatedUtterance:
+    text: str = field(hash=True)
+    participant: DialogueParticipant = field(hash=True)
+    utterance_id: str = field(default=None, hash=True)
+    timestamp: Any = field(default=None, hash=True)
+    dialogue_acts: List[_LegacyDialogueAct] = field(
+        default_factory=list, compare=True, hash=False
+    )
+    annotations: List[_LegacyAnnotation] = field(
+        default_factory=list, compare=True, hash=False
+    )
+    metadata: Dict[str, Any] = field(
+        default_factory=dict, compare=True, hash=False
+    )
+
+
+def generate_records(
+    num_utterances: int, seed: int = 0
+) -> List[Dict[str, Any]]:
+    """Generates utterance records.
+
+    A third of the utterances have a dialogue act with slot-value
+    annotations, a third have a dialogue act with an intent only, and the
+    rest have no annotations.
+
+    Args:
+        num_utterances: Number of utterances.
+        seed: Random seed. Defaults to 0.
+
+    Returns:
+        Records with the text, participant, intent and slot-values.
+    """
+    rng = random.Random(seed)
+    intents = {name: Intent(name) for name in _INTENTS}
+    records = []
+    for i in range(num_utterances):
+        record: Dict[str, Any] = {
+            "text": f"Utterance {i}",
+            "participant": (
+                DialogueParticipant.USER if i % 2 else DialogueParticipant.AGENT
+            ),
+            "intent": None,
+            "slot_values": [],
+        }
+        if i % 3 < 2:
+            record["intent"] = intents[rng.choice(_INTENTS)]
+        if i % 3 == 0:
+            record["slot_values"] = [
+                (slot, f"value {rng.randrange(100)}")
+                for slot in rng.sample(_SLOTS, 2)
+            ]
+        records.append(record)
+    return records
+
+
+def build_compact(record: Dict[str, Any]) -> AnnotatedUtterance:
+    """Builds a compact annotated utterance from a record.
+
+    Args:
+        record: Utterance record.
+
+    Returns:
+        Annotated utterance.
+    """
+    dialogue_acts = None
+    if record["intent"] is not None:
+        annotations = [
+            SlotValueAnnotation(slot, value)
+            for slot, value in record["slot_values"]
+        ]
+        dialogue_acts = [DialogueAct(record["intent"], annotations or None)]
+    return AnnotatedUtterance(
+        record["text"], record["participant"], dialogue_acts=dialogue_acts
+    )
+
+
+def build_legacy(record: Dict[str, Any]) -> _LegacyAnnotatedUtterance:
+    """Builds an annotated utterance with the former layout from a record.
+
+    Args:
+        record: Utterance record.
+
+    Returns:
+        Annotated utterance.
+    """
+    dialogue_acts = []
+    if record["intent"] is not None:
+        annotations = [
+            _LegacySlotValueAnnotation(slot, value, slot)
+            for slot, value in record["slot_values"]
+        ]
+        dialogue_acts = [_LegacyDialogueAct(record["intent"], annotations)]
+    return _LegacyAnnotatedUtterance(
+        record["text"], record["participant"], dialogue_acts=dialogue_acts
+    )
+
+
+def measure(
+    records: List[Dict[str, Any]], build: Callable[[Dict[str, Any]], Any]
+) -> float:
+    """Measures the memory allocated per utterance.
+
+    Args:
+        records: Utterance records.
+        build: Function building an utterance from a record.
+
+    Returns:
+        Bytes allocated per utterance.
+    """
+    gc.collect()
+    tracemalloc.start()
+    utterances = [build(record) for record in records]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del utterances
+    return size / len(records)
+
+
+def main(args: argparse.Namespace) -> None:
+    """Runs the benchmark and prints a table.
+
+    Args:
+        args: Command line arguments.
+    """
+    records = generate_records(args.utterances)
+    before = measure(records, build_legacy)
+    after = measure(records, build_compact)
+    print(f"{'layout':>10} {'bytes/utterance':>16}")
+    print(f"{'before':>10} {before:>16.1f}")
+    print(f"{'after':>10} {after:>16.1f}")
+    print(f"{'saving':>10} {1 - after / before:>16.1%}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parses the command line arguments.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="memory_footprint.py")
+    parser.add_argument(
+        "--utterances",
+        type=int,
+        default=100000,
+        help="Number of utterances in the corpus.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
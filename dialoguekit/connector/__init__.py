@@ -1,4 +1,48 @@
 """Dialogue connector level init."""
+from dialoguekit.connector.async_dialogue_connector import (
+    AsyncDialogueConnector,
+)
+from dialoguekit.connector.batch_simulation import (
+    iter_simulated_dialogues,
+    run_simulations,
+)
 from dialoguekit.connector.dialogue_connector import DialogueConnector
+from dialoguekit.connector.dialogue_export import (
+    Compression,
+    ExportFormat,
+    RotationPolicy,
+    compact_export_shards,
+    read_manifest,
+    select_export_files,
+)
+from dialoguekit.connector.dialogue_store import DialogueStore
+from dialoguekit.connector.export_writer import (
+    ExportWriter,
+    FsyncPolicy,
+    get_export_writer,
+)
+from dialoguekit.connector.metrics import InMemoryMetricsSink, MetricsSink
+from dialoguekit.connector.sqlite_dialogue_store import SQLiteDialogueStore
+from dialoguekit.connector.turn_log import TurnLog, recover_dialogues
 
-__all__ = ["DialogueConnector"]
+__all__ = [
+    "AsyncDialogueConnector",
+    "Compression",
+    "DialogueConnector",
+    "DialogueStore",
+    "ExportFormat",
+    "ExportWriter",
+    "FsyncPolicy",
+    "InMemoryMetricsSink",
+    "MetricsSink",
+    "RotationPolicy",
+    "SQLiteDialogueStore",
+    "TurnLog",
+    "compact_export_shards",
+    "get_export_writer",
+    "iter_simulated_dialogues",
+    "read_manifest",
+    "recover_dialogues",
+    "run_simulations",
+    "select_export_files",
+]
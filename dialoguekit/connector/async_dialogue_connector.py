@@ -0,0 +1,172 @@
+"""Asynchronous broker for coordinating the communication between participants.
+
+The AsyncDialogueConnector has the same responsibilities as the
+DialogueConnector, but the utterances are dispatched to asynchronous
+participants: the `register_*()` methods are awaitable and await the
+`receive_utterance()` of the other party. A single event loop can thus serve
+many conversations with I/O-bound agents concurrently.
+
+Synchronous agents are wrapped in a SyncAgentAdapter, running them in an
+executor. Blocking I/O is also done in the executor: turn log records are
+written there, in order, before the turn is dispatched, and the dialogue
+history is exported or saved to the dialogue store there on close, unless it
+is handed to an export writer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Callable, List, Union
+
+from dialoguekit.connector.dialogue_connector import BaseDialogueConnector
+from dialoguekit.core.annotated_utterance import AnnotatedUtterance
+from dialoguekit.core.feedback import BinaryFeedback
+from dialoguekit.participant import DialogueParticipant
+from dialoguekit.participant.agent import Agent
+from dialoguekit.participant.async_agent import AsyncAgent, SyncAgentAdapter
+from dialoguekit.participant.async_user import AsyncUser
+
+if TYPE_CHECKING:
+    from dialoguekit.platforms.platform import Platform
+
+
+class AsyncDialogueConnector(BaseDialogueConnector):
+    _agent: AsyncAgent
+    _user: AsyncUser
+
+    def __init__(
+        self,
+        agent: Union[AsyncAgent, Agent],
+        user: AsyncUser,
+        platform: Platform,
+        executor: Executor = None,
+        **kwargs: Any,
+    ) -> None:
+        """Represents an asynchronous dialogue connector.
+
+        Args:
+            agent: An instance of AsyncAgent, or of Agent to be run in an
+              executor.
+            user: An instance of AsyncUser.
+            platform: An instance of Platform.
+            executor: Executor to run synchronous agents and exports in.
+              Defaults to None, i.e., the default executor of the event loop.
+            **kwargs: Keyword arguments of BaseDialogueConnector.
+        """
+        agent_class = type(agent).__name__
+        if not isinstance(agent, AsyncAgent):
+            agent = SyncAgentAdapter(agent, executor)
+        super().__init__(agent, user, platform, **kwargs)
+        self._agent_tags = {"agent_class": agent_class}
+        self._executor = executor
+        self._pending_turn_log: List[Callable[[], None]] = []
+        self._turn_log_lock = asyncio.Lock()
+
+    async def register_user_utterance(
+        self, annotated_utterance: AnnotatedUtterance
+    ) -> None:
+        """Registers an annotated utterance from the user.
+
+        Args:
+            annotated_utterance: User utterance.
+        """
+        turn = self._begin_turn(annotated_utterance, DialogueParticipant.USER)
+        await self._flush_turn_log()
+        await self._agent.receive_utterance(annotated_utterance)
+        self._record_turn(DialogueParticipant.USER, *turn)
+
+    async def register_agent_utterance(
+        self, annotated_utterance: AnnotatedUtterance
+    ) -> None:
+        """Registers an annotated utterance from the agent.
+
+        If the utterance has the agent's stop intent, the conversation is
+        closed; otherwise, it is sent to the user.
+
+        Args:
+            annotated_utterance: Agent utterance.
+        """
+        turn = self._begin_turn(annotated_utterance, DialogueParticipant.AGENT)
+        await self._flush_turn_log()
+        if self._agent.stop_intent in annotated_utterance.get_intents():
+            await self.close()
+        else:
+            await self._user.receive_utterance(annotated_utterance)
+        self._record_turn(DialogueParticipant.AGENT, *turn)
+
+    async def register_user_feedback(
+        self, feedback: BinaryFeedback, utterance_id: str
+    ) -> None:
+        """Registers user's feedback for a utterance from dialogue history.
+
+        Args:
+            feedback: User's feedback (BinaryFeedback.{NEGATIVE|POSITIVE}) for a
+              utterance.
+            utterance_id: Utterance ID.
+        """
+        self._add_user_feedback(feedback, utterance_id)
+        await self._flush_turn_log()
+
+    async def start(self) -> None:
+        """Starts the conversation."""
+        await self._agent.welcome()
+
+    async def close(self) -> None:
+        """Closes the conversation.
+
+        If '_save_dialogue_history' is set to True it will export the dialogue
+        history. The spill file of a bounded dialogue history is removed in
+        any case.
+        """
+        try:
+            if self._save_dialogue_history:
+                started = time.perf_counter_ns()
+                if (
+                    self._export_writer is None
+                    or self._dialogue_store is not None
+                ):
+                    await asyncio.get_running_loop().run_in_executor(
+                        self._executor, self._dump_dialogue_history
+                    )
+                else:
+                    # Only queued, the writer writes it in the background.
+                    self._dump_dialogue_history()
+                self._record_export(started)
+        finally:
+            self._discard_spilled()
+        self._end_turn_log()
+        await self._flush_turn_log()
+
+    def _write_turn_log(self, write: Callable[[], None]) -> None:
+        """Queues a record of the turn log, see `_flush_turn_log()`.
+
+        Args:
+            write: Function writing the record.
+        """
+        self._pending_turn_log.append(write)
+
+    async def _flush_turn_log(self) -> None:
+        """Writes the queued records of the turn log in the executor.
+
+        Records queued by concurrent tasks (e.g., feedback sent during a
+        turn) are written one batch at a time, in the order they were queued.
+        """
+        async with self._turn_log_lock:
+            while self._pending_turn_log:
+                writes = self._pending_turn_log
+                self._pending_turn_log = []
+                await asyncio.get_running_loop().run_in_executor(
+                    self._executor, _run_all, writes
+                )
+
+
+def _run_all(functions: List[Callable[[], None]]) -> None:
+    """Calls functions in order.
+
+    Args:
+        functions: Functions to call.
+    """
+    for function in functions:
+        function()
@@ -0,0 +1,291 @@
+"""Headless batch simulation of conversations.
+
+Conversations between agents and simulated users are run without a platform
+across a pool of worker processes. For each conversation seed, a worker seeds
+the `random` module, creates an agent and a user with the given factories and
+runs the conversation until the agent ends it, the user stops responding, or
+the number of utterances reaches a bound. Seeds are sent to the workers in
+chunks, and the resulting dialogues are streamed back in the export format,
+in the order of the seeds, to be saved to a dialogue store or export files.
+
+Factories are called with the seed of the conversation and must be picklable,
+e.g., module-level functions. Conversations are driven by nested calls
+between the participants and the connector, so the bound on the number of
+utterances also bounds the depth of the call stack.
+"""
+
+import itertools
+import logging
+import os
+import random
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List
+
+from dialoguekit.connector.dialogue_connector import DialogueConnector
+from dialoguekit.connector.dialogue_export import (
+    ExportFormat,
+    export_dialogues,
+    get_export_filepath,
+)
+from dialoguekit.connector.dialogue_store import DialogueStore
+from dialoguekit.core.annotated_utterance import AnnotatedUtterance
+from dialoguekit.core.utterance import Utterance
+from dialoguekit.participant import DialogueParticipant
+from dialoguekit.participant.agent import Agent
+from dialoguekit.participant.user import User
+
+logger = logging.getLogger(__name__)
+
+AgentFactory = Callable[[int], Agent]
+UserFactory = Callable[[int], User]
+
+# Key of the conversation seed in the metadata of simulated dialogues.
+SEED_METADATA_KEY = "seed"
+
+
+def iter_simulated_dialogues(
+    agent_factory: AgentFactory,
+    user_factory: UserFactory,
+    seeds: Iterable[int],
+    max_turns: int = 50,
+    processes: int = None,
+    chunk_size: int = 100,
+) -> Iterator[Dict[str, Any]]:
+    """Simulates conversations across a process pool.
+
+    At most two chunks per process are in flight at any time, so seeds are
+    consumed and dialogues held in memory as they are needed. Conversations
+    that fail are logged and skipped.
+
+    Args:
+        agent_factory: Function creating the agent of a conversation from its
+          seed.
+        user_factory: Function creating the user of a conversation from its
+          seed.
+        seeds: Conversation seeds, one conversation per seed.
+        max_turns: Maximum number of utterances per conversation. Defaults to
+          50.
+        processes: Number of worker processes. Defaults to None, i.e., the
+          number of CPUs.
+        chunk_size: Number of conversations sent to a worker at once.
+          Defaults to 100.
+
+    Raises:
+        ValueError: If max_turns or chunk_size is not positive.
+
+    Yields:
+        Dialogues in the export format (see `Dialogue.to_dict()`), with
+        generated conversation IDs and the seed in their metadata, under
+        `SEED_METADATA_KEY`.
+    """
+    if max_turns < 1 or chunk_size < 1:
+        raise ValueError("max_turns and chunk_size must be positive")
+    max_pending = 2 * (processes or os.cpu_count() or 1)
+    seed_iterator = iter(seeds)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending: Deque[Future] = deque()
+        while True:
+            chunk = list(itertools.islice(seed_iterator, chunk_size))
+            if chunk:
+                pending.append(
+                    executor.submit(
+                        _simulate_chunk,
+                        agent_factory,
+                        user_factory,
+                        chunk,
+                        max_turns,
+                    )
+                )
+            if pending and (len(pending) >= max_pending or not chunk):
+                yield from pending.popleft().result()
+            elif not chunk:
+                break
+
+
+def run_simulations(
+    agent_factory: AgentFactory,
+    user_factory: UserFactory,
+    seeds: Iterable[int],
+    max_turns: int = 50,
+    processes: int = None,
+    chunk_size: int = 100,
+    dialogue_store: DialogueStore = None,
+    export_dir: str = "dialogue_export",
+) -> int:
+    """Simulates conversations and saves the resulting dialogues.
+
+    Dialogues are saved in batches of `chunk_size`, to the dialogue store if
+    given, otherwise appended to the JSONL export files of their agent/user
+    pairs.
+
+    Args:
+        agent_factory: Function creating the agent of a conversation from its
+          seed.
+        user_factory: Function creating the user of a conversation from its
+          seed.
+        seeds: Conversation seeds, one conversation per seed.
+        max_turns: Maximum number of utterances per conversation. Defaults to
+          50.
+        processes: Number of worker processes. Defaults to None, i.e., the
+          number of CPUs.
+        chunk_size: Number of conversations sent to a worker at once.
+          Defaults to 100.
+        dialogue_store: Store to save the dialogues to. Defaults to None.
+        export_dir: Directory of the export files, if no store is given.
+          Defaults to 'dialogue_export'.
+
+    Returns:
+        Number of dialogues saved.
+    """
+    dialogues = iter_simulated_dialogues(
+        agent_factory, user_factory, seeds, max_turns, processes, chunk_size
+    )
+    num_saved = 0
+    while True:
+        batch = list(itertools.islice(dialogues, chunk_size))
+        if not batch:
+            return num_saved
+        if dialogue_store is not None:
+            dialogue_store.save_dialogues(batch)
+        else:
+            _export_batch(batch, export_dir)
+        num_saved += len(batch)
+
+
+def _export_batch(batch: List[Dict[str, Any]], export_dir: str) -> None:
+    """Appends dialogues to the JSONL export files of their agent/user pairs.
+
+    Args:
+        batch: Dialogues in the export format.
+        export_dir: Directory of the export files.
+    """
+    files: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for dialogue in batch:
+        filepath = get_export_filepath(
+            export_dir,
+            dialogue["agent"]["id"],
+            dialogue["user"]["id"],
+            ExportFormat.JSONL,
+        )
+        files[filepath].append(dialogue)
+    for filepath, dialogues in files.items():
+        export_dialogues(filepath, dialogues, ExportFormat.JSONL)
+
+
+def _simulate_chunk(
+    agent_factory: AgentFactory,
+    user_factory: UserFactory,
+    seeds: List[int],
+    max_turns: int,
+) -> List[Dict[str, Any]]:
+    """Simulates the conversations of a chunk of seeds in a worker process.
+
+    Args:
+        agent_factory: Function creating the agent of a conversation.
+        user_factory: Function creating the user of a conversation.
+        seeds: Conversation seeds.
+        max_turns: Maximum number of utterances per conversation.
+
+    Returns:
+        The non-empty dialogues, in the export format.
+    """
+    dialogues = []
+    for seed in seeds:
+        try:
+            random.seed(seed)
+            agent = agent_factory(seed)
+            user = user_factory(seed)
+            connector = _BoundedDialogueConnector(agent, user, max_turns)
+            connector.dialogue_history.metadata[SEED_METADATA_KEY] = seed
+            connector.start()
+        except Exception:
+            logger.exception(f"Failed to simulate conversation {seed}")
+            continue
+        if connector.dialogue_history.utterances:
+            dialogues.append(connector.get_dialogue_as_dict())
+    return dialogues
+
+
+class _NullPlatform:
+    """Stands in for a platform, displaying nothing."""
+
+    def display_agent_utterance(
+        self, utterance: Utterance, agent_id: str, user_id: str
+    ) -> None:
+        pass
+
+    def display_user_utterance(
+        self, utterance: Utterance, user_id: str
+    ) -> None:
+        pass
+
+
+class _BoundedDialogueConnector(DialogueConnector):
+    def __init__(
+        self,
+        agent: Agent,
+        user: User,
+        max_turns: int,
+    ) -> None:
+        """Represents a headless connector bounding the conversation length.
+
+        The conversation is closed once it holds `max_turns` utterances; any
+        later utterance is ignored. The dialogue history is kept, not
+        exported, on close.
+
+        Args:
+            agent: An instance of Agent.
+            user: An instance of User.
+            max_turns: Maximum number of utterances.
+        """
+        super().__init__(
+            agent,
+            user,
+            _NullPlatform(),  # type: ignore[arg-type]
+            save_dialogue_history=False,
+        )
+        self._max_turns = max_turns
+        self._closed = False
+
+    def register_user_utterance(
+        self, annotated_utterance: AnnotatedUtterance
+    ) -> None:
+        """Registers an annotated utterance from the user.
+
+        Args:
+            annotated_utterance: User utterance.
+        """
+        if self._closed:
+            return
+        turn = self._begin_turn(annotated_utterance, DialogueParticipant.USER)
+        if self._dialogue_history.current_turn_id >= self._max_turns:
+            self.close()
+        else:
+            self._agent.receive_utterance(annotated_utterance)
+        self._record_turn(DialogueParticipant.USER, *turn)
+
+    def register_agent_utterance(
+        self, annotated_utterance: AnnotatedUtterance
+    ) -> None:
+        """Registers an annotated utterance from the agent.
+
+        Args:
+            annotated_utterance: Agent utterance.
+        """
+        if self._closed:
+            return
+        turn = self._begin_turn(annotated_utterance, DialogueParticipant.AGENT)
+        if (
+            self._dialogue_history.current_turn_id >= self._max_turns
+            or self._agent.stop_intent in annotated_utterance.get_intents()
+        ):
+            self.close()
+        else:
+            self._user.receive_utterance(annotated_utterance)
+        self._record_turn(DialogueParticipant.AGENT, *turn)
+
+    def close(self) -> None:
+        """Closes the conversation, ignoring any later utterance."""
+        self._closed = True
+        super().close()
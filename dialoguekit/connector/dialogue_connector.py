@@ -16,57 +16,406 @@ the User, the DialogueConnector sends it to the other party by calling their
 
 from __future__ import annotations
 
-import json
-import os
-from typing import TYPE_CHECKING
-
+import functools
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from dialoguekit.connector.dialogue_export import (
+    ExportFormat,
+    RotationPolicy,
+    export_dialogues,
+    get_export_filepath,
+    get_worker_shard,
+)
 from dialoguekit.core.annotated_utterance import AnnotatedUtterance
+from dialoguekit.core.bounded_dialogue import BoundedDialogue
 from dialoguekit.core.dialogue import Dialogue
 from dialoguekit.core.feedback import BinaryFeedback, UtteranceFeedback
-from dialoguekit.participant.agent import Agent
-from dialoguekit.participant.user import User
+from dialoguekit.participant import DialogueParticipant
+from dialoguekit.participant.agent import Agent, BaseAgent
+from dialoguekit.participant.user import BaseUser, User
 
 if TYPE_CHECKING:
+    from dialoguekit.connector.dialogue_store import DialogueStore
+    from dialoguekit.connector.export_writer import ExportWriter
+    from dialoguekit.connector.metrics import MetricsSink
+    from dialoguekit.connector.turn_log import TurnLog
     from dialoguekit.platforms.platform import Platform
 
 _DIALOGUE_EXPORT_PATH = "dialogue_export"
 
 
-class DialogueConnector:
+class BaseDialogueConnector:
     def __init__(
         self,
-        agent: Agent,
-        user: User,
+        agent: BaseAgent,
+        user: BaseUser,
         platform: Platform,
         conversation_id: str = None,
         save_dialogue_history: bool = True,
+        export_format: ExportFormat = ExportFormat.JSON,
+        export_writer: ExportWriter = None,
+        dialogue_store: DialogueStore = None,
+        shard_exports: bool = False,
+        export_rotation: RotationPolicy = None,
+        turn_log: TurnLog = None,
+        metrics_sink: MetricsSink = None,
+        max_utterances_in_memory: int = None,
+        spill_dir: str = "dialogue_spill",
     ) -> None:
-        """Represents a dialogue connector.
+        """Represents the state shared by dialogue connectors.
+
+        It is the base of both DialogueConnector and AsyncDialogueConnector,
+        which differ in how utterances are dispatched to the participants.
 
         Args:
-            agent: An instance of Agent.
-            user: An instance of User.
+            agent: An instance of Agent, or AsyncAgent.
+            user: An instance of User, or AsyncUser.
             platform: An instance of Platform.
             conversation_id: Conversation ID. Defaults to None.
             save_dialogue_history: Flag to save the dialogue or not.
+            export_format: Format of the dialogue export. JSONL exports are
+              append-only, JSON exports are rewritten on every save. Defaults
+              to JSON.
+            export_writer: Background writer to hand the dialogue export to
+              on close. If None, the dialogue is exported synchronously.
+              Defaults to None.
+            dialogue_store: Store to save the dialogue to on close, instead of
+              the export files. Defaults to None.
+            shard_exports: Whether to export to a shard file of the current
+              worker process instead of the file shared by all workers. Only
+              supported with the JSONL format. Defaults to False.
+            export_rotation: When to rotate the export files. Only supported
+              with the JSONL format. Defaults to None, i.e., never.
+            turn_log: Log to append every turn to as it happens, so that the
+              dialogue can be recovered if the process crashes before it is
+              exported. Defaults to None.
+            metrics_sink: Sink to report the time spent in each stage of a
+              turn to, see `dialoguekit.connector.metrics`. Defaults to None.
+            max_utterances_in_memory: Number of utterances kept in the
+              dialogue history in memory. Older utterances are spilled to a
+              file and read back on export, see BoundedDialogue. Defaults to
+              None, i.e., all utterances are kept in memory.
+            spill_dir: Directory of the files of spilled utterances. Defaults
+              to 'dialogue_spill'.
+
+        Raises:
+            ValueError: If shard_exports or export_rotation is set with the
+              JSON format.
         """
+        if shard_exports and export_format != ExportFormat.JSONL:
+            raise ValueError("Sharded exports require the JSONL format.")
+        if export_rotation is not None and export_format != ExportFormat.JSONL:
+            raise ValueError("Export rotation requires the JSONL format.")
         self._platform = platform
         self._agent = agent
         self._agent.connect_dialogue_connector(self)
         self._user = user
         self._user.connect_dialogue_connector(self)
-        self._dialogue_history = Dialogue(agent.id, user.id, conversation_id)
+        if max_utterances_in_memory is None:
+            self._dialogue_history = Dialogue(
+                agent.id, user.id, conversation_id
+            )
+        else:
+            self._dialogue_history = BoundedDialogue(
+                agent.id,
+                user.id,
+                conversation_id,
+                max_utterances=max_utterances_in_memory,
+                spill_dir=spill_dir,
+            )
         self._save_dialogue_history = save_dialogue_history
+        self._export_format = export_format
+        self._export_writer = export_writer
+        self._dialogue_store = dialogue_store
+        self._shard_exports = shard_exports
+        self._export_rotation = export_rotation
+        self._turn_log = turn_log
+        self._turn_log_started = False
+        self._metrics_sink = metrics_sink
+        self._agent_tags = {"agent_class": type(agent).__name__}
+        # Time spent in turns and exports, excluding nested ones, used to tell
+        # apart the time a participant takes to receive an utterance from the
+        # time spent handling the turns it triggers.
+        self._handled_ns = 0
 
     @property
     def dialogue_history(self):
         """Return the dialogue history."""
         return self._dialogue_history
 
+    def get_dialogue_as_dict(self) -> Dict[str, Any]:
+        """Returns the dialogue history in the export format.
+
+        Returns:
+            The dialogue as a dictionary, with the agent and user represented
+            by their dictionaries.
+        """
+        return self._add_participants(self._dialogue_history.to_dict())
+
+    def _add_participants(
+        self, dialogue_as_dict: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Replaces the participant IDs of a dialogue by their dictionaries.
+
+        Args:
+            dialogue_as_dict: Dialogue as a dictionary.
+
+        Returns:
+            The dialogue as a dictionary, in the export format.
+        """
+        dialogue_as_dict["agent"] = self._agent.to_dict()
+        dialogue_as_dict["user"] = self._user.to_dict()
+        return dialogue_as_dict
+
     def get_platform(self) -> Platform:
         """Returns the platform."""
         return self._platform
 
+    def _add_user_feedback(
+        self, feedback: BinaryFeedback, utterance_id: str
+    ) -> None:
+        """Adds user feedback to the dialogue history and the turn log.
+
+        Args:
+            feedback: User's feedback for a utterance.
+            utterance_id: Utterance ID.
+        """
+        utterance_feedback = UtteranceFeedback(utterance_id, feedback)
+        self._dialogue_history.add_utterance_feedback(
+            utterance_feedback, utterance_id
+        )
+        if self._turn_log is not None:
+            self._ensure_turn_log_started()
+            self._write_turn_log(
+                functools.partial(
+                    self._turn_log.log_feedback,
+                    self._dialogue_history.conversation_id,
+                    utterance_id,
+                    feedback.value,
+                )
+            )
+
+    def _begin_turn(
+        self,
+        annotated_utterance: AnnotatedUtterance,
+        participant: DialogueParticipant,
+    ) -> Tuple[int, int, int, int]:
+        """Adds an utterance to the history and displays it on the platform.
+
+        Args:
+            annotated_utterance: Utterance.
+            participant: Participant the utterance is from.
+
+        Returns:
+            Time the turn started, time the utterance was added to the history
+            and time it was displayed, in nanoseconds, followed by the time
+            spent in turns and exports so far.
+        """
+        started = time.perf_counter_ns()
+        self._dialogue_history.add_utterance(annotated_utterance)
+        self._log_utterance(annotated_utterance)
+        appended = time.perf_counter_ns()
+        if participant == DialogueParticipant.USER:
+            self._platform.display_user_utterance(
+                annotated_utterance, self._user.id
+            )
+        else:
+            self._platform.display_agent_utterance(
+                annotated_utterance, self._agent.id, self._user.id
+            )
+        displayed = time.perf_counter_ns()
+        return started, appended, displayed, self._handled_ns
+
+    def _record_export(self, started: int) -> None:
+        """Reports the time spent exporting the dialogue history.
+
+        Args:
+            started: Time the export started, in nanoseconds.
+        """
+        elapsed = time.perf_counter_ns() - started
+        self._handled_ns += elapsed
+        if self._metrics_sink is not None:
+            self._metrics_sink.observe(
+                "export", elapsed / 1e9, self._agent_tags
+            )
+
+    def _discard_spilled(self) -> None:
+        """Removes the spill file of a bounded dialogue history, if any."""
+        if isinstance(self._dialogue_history, BoundedDialogue):
+            self._dialogue_history.discard_spilled()
+
+    def _end_turn_log(self) -> None:
+        """Logs the end of the conversation, if its start was logged."""
+        log_end = self._detach_turn_log()
+        if log_end is not None:
+            self._write_turn_log(log_end)
+
+    def _detach_turn_log(self) -> Optional[Callable[[], None]]:
+        """Hands over logging the end of the conversation.
+
+        Returns:
+            Function logging the end of the conversation, or None if its start
+            was not logged.
+        """
+        if not self._turn_log_started:
+            return None
+        self._turn_log_started = False
+        return functools.partial(
+            self._turn_log.log_end, self._dialogue_history.conversation_id
+        )
+
+    def _record_turn(
+        self,
+        participant: DialogueParticipant,
+        started: int,
+        appended: int,
+        displayed: int,
+        handled_ns: int,
+    ) -> None:
+        """Reports the time spent in each stage of a turn to the metrics sink.
+
+        Args:
+            participant: Participant whose utterance was handled.
+            started: Time the turn started, in nanoseconds.
+            appended: Time the utterance was added to the history.
+            displayed: Time the utterance was displayed on the platform.
+            handled_ns: Time spent in turns and exports before dispatching the
+              utterance.
+        """
+        ended = time.perf_counter_ns()
+        nested_ns = self._handled_ns - handled_ns
+        self._handled_ns += ended - started - nested_ns
+        if self._metrics_sink is None:
+            return
+
+        tags = {**self._agent_tags, "participant": participant.name}
+        self._metrics_sink.increment("turns", tags=tags)
+        self._metrics_sink.observe(
+            "history_append", (appended - started) / 1e9, tags
+        )
+        self._metrics_sink.observe(
+            "platform_display", (displayed - appended) / 1e9, tags
+        )
+        self._metrics_sink.observe(
+            "dispatch", (ended - displayed - nested_ns) / 1e9, tags
+        )
+
+    def _log_utterance(self, annotated_utterance: AnnotatedUtterance) -> None:
+        """Appends an utterance to the turn log, if any.
+
+        Args:
+            annotated_utterance: Utterance added to the dialogue history.
+        """
+        if self._turn_log is None:
+            return
+        self._ensure_turn_log_started()
+        # Serializing the utterance as it is appended caches it for exports.
+        self._write_turn_log(
+            functools.partial(
+                self._turn_log.log_utterance,
+                self._dialogue_history.conversation_id,
+                next(
+                    self._dialogue_history.iter_serialized(
+                        self._dialogue_history.current_turn_id - 1
+                    )
+                ),
+            )
+        )
+
+    def _ensure_turn_log_started(self) -> None:
+        """Logs the start of the conversation before its first turn."""
+        if not self._turn_log_started:
+            self._write_turn_log(
+                functools.partial(
+                    self._turn_log.log_start,
+                    self._dialogue_history.conversation_id,
+                    self._agent.to_dict(),
+                    self._user.to_dict(),
+                )
+            )
+            self._turn_log_started = True
+
+    def _write_turn_log(self, write: Callable[[], None]) -> None:
+        """Writes a record to the turn log.
+
+        The record is written right away; the AsyncDialogueConnector defers
+        it to be written off the event loop.
+
+        Args:
+            write: Function writing the record.
+        """
+        write()
+
+    def _dump_dialogue_history(self):
+        """Exports the dialogue history.
+
+        The exported files will be named as 'AgentID_UserID.json' or
+        'AgentID_UserID.jsonl', depending on the export format. Sharded exports
+        go to 'AgentID_UserID.shard-{worker}.jsonl' and are merged into the
+        latter by `compact_export_shards()`. If an export rotation policy is
+        set, export files are rotated into (compressed) shards listed in the
+        manifest of the export directory.
+
+        If the two participants have had a conversation previously, the new
+        conversation will be appended to the same export document. With the
+        JSONL format, this is a single append; with the JSON format, the
+        existing document is read back and rewritten. If an export writer is
+        set, the dialogue is queued and written in the background, and the end
+        of the conversation is only logged in the turn log once the dialogue
+        has been written. If a dialogue store is set, the dialogue is saved to
+        the store instead.
+
+        Per dialogue, the dialogue metadata will be added. Also per utterance
+        the utterance metadata, will be added to the same level as the utterance
+        text. Intent will also be exported if provided.
+        """
+        # If conversation is empty we do not save it.
+        if len(self._dialogue_history.utterances) == 0:
+            return
+
+        # The export is serialized as is, so it shares the cached utterances
+        # instead of copying them.
+        dialogue_as_dict = self._add_participants(
+            self._dialogue_history.to_dict(copy=False)
+        )
+        if self._dialogue_store is not None:
+            self._dialogue_store.save_dialogue(dialogue_as_dict)
+        else:
+            file_name = get_export_filepath(
+                _DIALOGUE_EXPORT_PATH,
+                self._agent.id,
+                self._user.id,
+                self._export_format,
+                shard=get_worker_shard() if self._shard_exports else None,
+            )
+            if self._export_writer is not None:
+                self._export_writer.submit(
+                    file_name,
+                    dialogue_as_dict,
+                    self._export_format,
+                    rotation=self._export_rotation,
+                    on_written=self._detach_turn_log(),
+                )
+            else:
+                export_dialogues(
+                    file_name,
+                    [dialogue_as_dict],
+                    self._export_format,
+                    rotation=self._export_rotation,
+                )
+
+        # Empty dialogue history to avoid duplicate save
+        self._dialogue_history.clear()
+        # TODO: save dialogue history, subject to config parameters
+
+
+class DialogueConnector(BaseDialogueConnector):
+    """Represents a dialogue connector."""
+
+    _agent: Agent
+    _user: User
+
     def register_user_utterance(
         self, annotated_utterance: AnnotatedUtterance
     ) -> None:
@@ -82,11 +431,9 @@ class DialogueConnector:
         Args:
             annotated_utterance: User utterance.
         """
-        self._dialogue_history.add_utterance(annotated_utterance)
-        self._platform.display_user_utterance(
-            annotated_utterance, self._user.id
-        )
+        turn = self._begin_turn(annotated_utterance, DialogueParticipant.USER)
         self._agent.receive_utterance(annotated_utterance)
+        self._record_turn(DialogueParticipant.USER, *turn)
 
     def register_agent_utterance(
         self, annotated_utterance: AnnotatedUtterance
@@ -106,14 +453,12 @@ class DialogueConnector:
         Args:
             annotated_utterance: Agent utterance.
         """
-        self._dialogue_history.add_utterance(annotated_utterance)
-        self._platform.display_agent_utterance(
-            annotated_utterance, self._agent.id, self._user.id
-        )
+        turn = self._begin_turn(annotated_utterance, DialogueParticipant.AGENT)
         if self._agent.stop_intent in annotated_utterance.get_intents():
             self.close()
         else:
             self._user.receive_utterance(annotated_utterance)
+        self._record_turn(DialogueParticipant.AGENT, *turn)
 
     def register_user_feedback(
         self, feedback: BinaryFeedback, utterance_id: str
@@ -125,10 +470,7 @@ class DialogueConnector:
               utterance.
             utterance_id: Utterance ID.
         """
-        utterance_feedback = UtteranceFeedback(utterance_id, feedback)
-        self._dialogue_history.add_utterance_feedback(
-            utterance_feedback, utterance_id
-        )
+        self._add_user_feedback(feedback, utterance_id)
 
     def start(self) -> None:
         """Starts the conversation."""
@@ -139,50 +481,14 @@ class DialogueConnector:
         """Closes the conversation.
 
         If '_save_dialogue_history' is set to True it will export the dialogue
-        history.
-        """
-        if self._save_dialogue_history:
-            self._dump_dialogue_history()
-
-    def _dump_dialogue_history(self):
-        """Exports the dialogue history.
-
-        The exported files will be named as 'AgentID_UserID.json'
-
-        If the two participants have had a conversation previously, the new
-        conversation will be appended to the same export document.
-
-        Per dialogue, the dialogue metadata will be added. Also per utterance
-        the utterance metadata, will be added to the same level as the utterance
-        text. Intent will also be exported if provided.
+        history. The spill file of a bounded dialogue history is removed in
+        any case.
         """
-        # If conversation is empty we do not save it.
-        if len(self._dialogue_history.utterances) == 0:
-            return
-
-        history = self._dialogue_history
-        file_name = (
-            f"{_DIALOGUE_EXPORT_PATH}/{self._agent.id}_{self._user.id}.json"
-        )
-        json_file = []
-
-        # Check directory and read if exists.
-        if not os.path.exists(_DIALOGUE_EXPORT_PATH):
-            os.makedirs(_DIALOGUE_EXPORT_PATH)
-        if os.path.exists(file_name):
-            with open(file_name, encoding="utf-8") as json_file_out:
-                json_file = json.load(json_file_out)
-
-        dialogue_as_dict = history.to_dict()
-        dialogue_as_dict["agent"] = self._agent.to_dict()
-        dialogue_as_dict["user"] = self._user.to_dict()
-
-        json_file.append(dialogue_as_dict)
-
-        with open(file_name, "w", encoding="utf-8") as outfile:
-            json.dump(json_file, outfile)
-
-        # Empty dialogue history to avoid duplicate save
-        for _ in range(len(self._dialogue_history.utterances)):
-            self._dialogue_history.utterances.pop()
-        # TODO: save dialogue history, subject to config parameters
+        try:
+            if self._save_dialogue_history:
+                started = time.perf_counter_ns()
+                self._dump_dialogue_history()
+                self._record_export(started)
+        finally:
+            self._discard_spilled()
+        self._end_turn_log()
@@ -0,0 +1,668 @@
+"""Writing of dialogue exports.
+
+Dialogues are exported per agent/user pair in one of two formats:
+
+- JSON: a single JSON array holding all the dialogues of the pair. New
+  dialogues are inserted before the closing bracket of the array.
+- JSONL: JSON Lines, one dialogue per line. Adding a dialogue is a single
+  append, independent of the size of the existing export.
+
+Exports are safe to write from several processes: each write holds an
+advisory lock on the export file it modifies, and only for the duration of the
+write itself (dialogues are serialized before the lock is taken). Processes
+writing to different files never wait for each other. Locking relies on
+`fcntl` and is skipped on platforms without it.
+
+To avoid contention on the files of busy agent/user pairs altogether, each
+worker process may write JSONL exports to its own shard file, named as
+'AgentID_UserID.shard-{worker}.jsonl'. The shards are merged into the main
+export files by `compact_export_shards()`.
+
+JSONL exports may be rotated according to a RotationPolicy: once an export
+file reaches a maximum size or age, it is closed as a rotated shard, named as
+'AgentID_UserID.{YYYYmmddTHHMMSS}.jsonl[.gz|.xz]', optionally compressed with
+gzip or lzma, and a new export file is started. A manifest file in the export
+directory, 'manifest.json', lists the rotated shards along with the time range
+of their writes, so that readers can pick the files relevant to a time range
+with `select_export_files()`.
+"""
+
+import gzip
+import json
+import lzma
+import os
+import socket
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+_SHARD_MARKER = ".shard-"
+_WHITESPACE = b" \t\r\n"
+_READ_BACK_SIZE = 4096
+_COPY_CHUNK_SIZE = 1 << 20
+_PART_SUFFIX = ".part"
+_ROTATION_TIME_FORMAT = "%Y%m%dT%H%M%S"
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+# Device, inode and start time of the active export files, keyed by path, so
+# that the manifest is only read when a process first writes to an export file.
+# There is one entry per path, replaced whenever the file at the path changes.
+_active_starts: Dict[str, Tuple[int, int, Optional[float]]] = {}
+
+
+class ExportFormat(Enum):
+    """Represents the supported dialogue export formats."""
+
+    JSON = "json"
+    JSONL = "jsonl"
+
+
+class Compression(Enum):
+    """Represents the compression of rotated export shards."""
+
+    NONE = ""
+    GZIP = ".gz"
+    LZMA = ".xz"
+
+
+@dataclass(frozen=True)
+class RotationPolicy:
+    """Represents when JSONL export files are rotated.
+
+    An export file is rotated before the next write once it holds at least
+    `max_bytes` bytes or its first write is at least `max_age` seconds old.
+
+    Attributes:
+        max_bytes: Maximum size of an export file. Defaults to None, i.e., no
+          size limit.
+        max_age: Maximum age of an export file in seconds. Defaults to None,
+          i.e., no age limit.
+        compression: Compression of rotated shards. Defaults to gzip.
+    """
+
+    max_bytes: Optional[int] = None
+    max_age: Optional[float] = None
+    compression: Compression = Compression.GZIP
+
+
+def get_export_filepath(
+    export_dir: str,
+    agent_id: str,
+    user_id: str,
+    export_format: ExportFormat = ExportFormat.JSON,
+    shard: Optional[str] = None,
+) -> str:
+    """Returns the path of the export file for an agent/user pair.
+
+    Args:
+        export_dir: Directory holding the exports.
+        agent_id: Agent ID.
+        user_id: User ID.
+        export_format: Export format. Defaults to JSON.
+        shard: Name of the shard to write to. Defaults to None, i.e., the main
+          export file.
+
+    Returns:
+        Path to the export file, named as 'AgentID_UserID.{json|jsonl}' or
+        'AgentID_UserID.shard-{shard}.{json|jsonl}'.
+    """
+    file_name = f"{agent_id}_{user_id}"
+    if shard is not None:
+        file_name += f"{_SHARD_MARKER}{shard}"
+    return os.path.join(export_dir, f"{file_name}.{export_format.value}")
+
+
+def get_worker_shard() -> str:
+    """Returns the shard name of the current worker process.
+
+    Returns:
+        Shard name made of the host name and process ID.
+    """
+    # Dots are reserved for separating the parts of export file names.
+    hostname = socket.gethostname().replace(".", "-")
+    return f"{hostname}-{os.getpid()}"
+
+
+def export_dialogues(
+    filepath: str,
+    dialogues: List[Dict[str, Any]],
+    export_format: ExportFormat = ExportFormat.JSON,
+    fsync: bool = False,
+    rotation: Optional[RotationPolicy] = None,
+) -> None:
+    """Adds dialogues to an export file.
+
+    The parent directory of the export file is created if it does not exist.
+
+    Args:
+        filepath: Path to the export file.
+        dialogues: Dialogues to export, as dictionaries.
+        export_format: Export format. Defaults to JSON.
+        fsync: Whether to force the written data to disk before returning.
+          Defaults to False.
+        rotation: When to rotate the export file. Only supported with the
+          JSONL format. Defaults to None, i.e., the file is never rotated.
+
+    Raises:
+        ValueError: If a rotation policy is given with the JSON format.
+    """
+    if rotation is not None and export_format != ExportFormat.JSONL:
+        raise ValueError("Export rotation requires the JSONL format.")
+    if not dialogues:
+        return
+    export_dir = os.path.dirname(filepath)
+    if export_dir:
+        os.makedirs(export_dir, exist_ok=True)
+
+    if export_format == ExportFormat.JSONL:
+        lines = "".join(json.dumps(dialogue) + "\n" for dialogue in dialogues)
+        _append_lines(filepath, lines.encode("utf-8"), fsync, rotation)
+    else:
+        _extend_json(filepath, dialogues, fsync)
+
+
+def compact_export_shards(
+    export_dir: str,
+    fsync: bool = False,
+    rotation: Optional[RotationPolicy] = None,
+) -> List[str]:
+    """Merges JSONL export shards into the main export files.
+
+    The dialogues of each shard are appended to the main JSONL export file of
+    its agent/user pair and the shard is removed. Workers may keep exporting
+    while shards are compacted; a dialogue written to a shard that is being
+    compacted is either merged or ends up in a new shard.
+
+    Args:
+        export_dir: Directory holding the exports.
+        fsync: Whether to force merged data to disk before removing shards.
+          Defaults to False.
+        rotation: When to rotate the main export files. Defaults to None.
+
+    Returns:
+        Paths of the main export files that received dialogues.
+    """
+    suffix = f".{ExportFormat.JSONL.value}"
+    compacted = []
+    for file_name in sorted(os.listdir(export_dir)):
+        if _SHARD_MARKER not in file_name or not file_name.endswith(suffix):
+            continue
+        file_stem, _, shard = file_name[: -len(suffix)].rpartition(
+            _SHARD_MARKER
+        )
+        if "." in shard:
+            # Rotated shard of a worker.
+            continue
+        shard_path = os.path.join(export_dir, file_name)
+        filepath = os.path.join(export_dir, file_stem + suffix)
+        try:
+            merged = _merge_shard(shard_path, filepath, fsync, rotation)
+        except FileNotFoundError:
+            # Compacted concurrently by another process.
+            continue
+        if merged and filepath not in compacted:
+            compacted.append(filepath)
+    return compacted
+
+
+def select_export_files(
+    export_dir: str, start: datetime = None, end: datetime = None
+) -> List[str]:
+    """Returns the export files that may hold dialogues of a time range.
+
+    Rotated shards are selected based on the time range of their writes, as
+    recorded in the manifest. Export files that are still being written to are
+    selected unless they were started after the time range. Shards that are
+    being rotated at the time of the call are not selected.
+
+    Args:
+        export_dir: Directory holding the exports.
+        start: Earliest export time (inclusive). Defaults to None.
+        end: Latest export time (exclusive). Defaults to None.
+
+    Returns:
+        Paths of the rotated shards, ordered by time, followed by the paths of
+        the other export files.
+    """
+    start_ts = start.timestamp() if start is not None else None
+    end_ts = end.timestamp() if end is not None else None
+    manifest = read_manifest(export_dir)
+
+    def in_range(first: Optional[float], last: Optional[float]) -> bool:
+        if start_ts is not None and last is not None and last < start_ts:
+            return False
+        if end_ts is not None and first is not None and first >= end_ts:
+            return False
+        return True
+
+    shards = sorted(manifest["shards"], key=lambda shard: shard["start"] or 0.0)
+    shard_names = {shard["file"] for shard in shards}
+    selected = [
+        os.path.join(export_dir, shard["file"])
+        for shard in shards
+        if in_range(shard["start"], shard["end"])
+        and os.path.exists(os.path.join(export_dir, shard["file"]))
+    ]
+
+    suffixes = tuple(
+        f".{export_format.value}" for export_format in ExportFormat
+    )
+    for file_name in sorted(os.listdir(export_dir)):
+        if (
+            file_name == MANIFEST_FILE_NAME
+            or file_name in shard_names
+            or not file_name.endswith(suffixes)
+        ):
+            continue
+        active = manifest["active"].get(file_name)
+        if active is None or in_range(active["start"], None):
+            selected.append(os.path.join(export_dir, file_name))
+    return selected
+
+
+def read_manifest(export_dir: str) -> Dict[str, Any]:
+    """Reads the manifest of an export directory.
+
+    The manifest holds the rotated shards under "shards", each with its file
+    name ("file"), the export file it was rotated from ("source"), the time
+    range of its writes as UNIX timestamps ("start" and "end"), and its number
+    of dialogues ("dialogues"). The start times of the export files that are
+    still being written to are held under "active". A start time is None if
+    it is unknown, i.e., if the export file existed before it was rotated.
+
+    Args:
+        export_dir: Directory holding the exports.
+
+    Returns:
+        The manifest, with no shards if the directory has no manifest.
+    """
+    try:
+        with open(
+            os.path.join(export_dir, MANIFEST_FILE_NAME), encoding="utf-8"
+        ) as manifest_file:
+            content = manifest_file.read()
+    except FileNotFoundError:
+        content = ""
+    return _parse_manifest(content)
+
+
+def _parse_manifest(content: str) -> Dict[str, Any]:
+    """Parses the content of a manifest file.
+
+    Args:
+        content: Content of the manifest file, possibly empty.
+
+    Returns:
+        The manifest.
+    """
+    manifest = json.loads(content) if content.strip() else {}
+    manifest.setdefault("active", {})
+    manifest.setdefault("shards", [])
+    return manifest
+
+
+@contextmanager
+def _update_manifest(export_dir: str) -> Iterator[Dict[str, Any]]:
+    """Holds the manifest of an export directory for modification.
+
+    The manifest is locked while held and replaced atomically afterwards, so
+    that it can be read without taking the lock.
+
+    Args:
+        export_dir: Directory holding the exports.
+
+    Yields:
+        The manifest, to be modified in place.
+    """
+    manifest_path = os.path.join(export_dir, MANIFEST_FILE_NAME)
+    with _locked_open(manifest_path, os.O_RDWR | os.O_CREAT) as manifest_file:
+        manifest = _parse_manifest(manifest_file.read().decode("utf-8"))
+        yield manifest
+        temp_path = manifest_path + _PART_SUFFIX
+        with open(temp_path, "w", encoding="utf-8") as temp_file:
+            json.dump(manifest, temp_file, indent=2)
+        os.replace(temp_path, manifest_path)
+
+
+def _merge_shard(
+    shard_path: str,
+    filepath: str,
+    fsync: bool,
+    rotation: Optional[RotationPolicy],
+) -> bool:
+    """Appends the content of a JSONL shard to an export file.
+
+    Args:
+        shard_path: Path to the shard.
+        filepath: Path to the export file.
+        fsync: Whether to force merged data to disk before removing the shard.
+        rotation: When to rotate the export file.
+
+    Returns:
+        Whether the shard held any dialogues.
+    """
+    with _locked_open(shard_path, os.O_RDWR) as shard:
+        lines = shard.read()
+        if lines:
+            if not lines.endswith(b"\n"):
+                lines += b"\n"
+            _append_lines(filepath, lines, fsync, rotation)
+        # Removed while still locked, so that writers waiting for the lock
+        # notice it and write to a new shard instead.
+        os.remove(shard_path)
+    return bool(lines)
+
+
+def _append_lines(
+    filepath: str,
+    lines: bytes,
+    fsync: bool,
+    rotation: Optional[RotationPolicy],
+) -> None:
+    """Appends lines to a JSON Lines file with a single write.
+
+    If the file is due for rotation, it is rotated before the write and
+    compressed after the write, once the lock on the new file is released.
+
+    Args:
+        filepath: Path to the export file.
+        lines: Newline-terminated lines to append.
+        fsync: Whether to force the written data to disk.
+        rotation: When to rotate the export file.
+    """
+    rotated_shards = []
+    while True:
+        with _locked_open(
+            filepath, os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        ) as outfile:
+            if rotation is not None:
+                rotated_shard = _rotate_if_due(filepath, outfile, rotation)
+                if rotated_shard is not None:
+                    # The locked file has been moved away, start a new one.
+                    rotated_shards.append(rotated_shard)
+                    continue
+            outfile.write(lines)
+            if fsync:
+                _fsync(outfile)
+        break
+
+    for rotated_shard in rotated_shards:
+        _close_rotated_shard(rotated_shard, rotation, fsync)
+
+
+def _rotate_if_due(
+    filepath: str, outfile: IO[bytes], rotation: RotationPolicy
+) -> Optional[Dict[str, Any]]:
+    """Moves a locked export file away if it is due for rotation.
+
+    Args:
+        filepath: Path to the export file.
+        outfile: The export file, locked.
+        rotation: When to rotate the export file.
+
+    Returns:
+        The manifest entry of the rotated shard, along with the path it was
+        moved to ("part") and the inode of the export file ("inode"), or None
+        if the file is not due for rotation.
+    """
+    stat = os.fstat(outfile.fileno())
+    start = _get_active_start(filepath, stat)
+    if stat.st_size == 0:
+        return None
+    now = time.time()
+    if not (
+        (rotation.max_bytes is not None and stat.st_size >= rotation.max_bytes)
+        or (
+            rotation.max_age is not None
+            and (start is None or now - start >= rotation.max_age)
+        )
+    ):
+        return None
+
+    shard_path = _get_rotated_shard_path(filepath, now)
+    part_path = shard_path + _PART_SUFFIX
+    os.rename(filepath, part_path)
+    return {
+        "file": os.path.basename(shard_path) + rotation.compression.value,
+        "source": os.path.basename(filepath),
+        "start": start,
+        "end": stat.st_mtime,
+        "part": part_path,
+        "inode": stat.st_ino,
+    }
+
+
+def _get_active_start(filepath: str, stat: os.stat_result) -> Optional[float]:
+    """Returns the start time of an export file, registering it if new.
+
+    An empty file is always looked up in the manifest, as it may reuse the
+    inode of a file that was rotated.
+
+    Args:
+        filepath: Path to the export file.
+        stat: Status of the export file.
+
+    Returns:
+        UNIX timestamp of the first write to the export file, or None if the
+        file was written before it was registered.
+    """
+    key = os.path.abspath(filepath)
+    cached = _active_starts.get(key)
+    if (
+        cached is not None
+        and stat.st_size > 0
+        and cached[:2] == (stat.st_dev, stat.st_ino)
+    ):
+        return cached[2]
+
+    file_name = os.path.basename(filepath)
+    with _update_manifest(os.path.dirname(filepath) or ".") as manifest:
+        active = manifest["active"].get(file_name)
+        if active is None or active["inode"] != stat.st_ino:
+            active = {
+                "inode": stat.st_ino,
+                "start": time.time() if stat.st_size == 0 else None,
+            }
+            manifest["active"][file_name] = active
+    _active_starts[key] = (stat.st_dev, stat.st_ino, active["start"])
+    return active["start"]
+
+
+def _get_rotated_shard_path(filepath: str, now: float) -> str:
+    """Returns an unused path for an export file being rotated.
+
+    Args:
+        filepath: Path to the export file.
+        now: UNIX timestamp of the rotation.
+
+    Returns:
+        Path of the uncompressed shard, named as
+        'AgentID_UserID.{YYYYmmddTHHMMSS}[-{n}].jsonl'.
+    """
+    file_stem, extension = os.path.splitext(filepath)
+    timestamp = time.strftime(_ROTATION_TIME_FORMAT, time.gmtime(now))
+    counter = 0
+    while True:
+        suffix = f"-{counter}" if counter else ""
+        shard_path = f"{file_stem}.{timestamp}{suffix}{extension}"
+        if not any(
+            os.path.exists(shard_path + file_suffix)
+            for file_suffix in [_PART_SUFFIX]
+            + [compression.value for compression in Compression]
+        ):
+            return shard_path
+        counter += 1
+
+
+def _close_rotated_shard(
+    rotated_shard: Dict[str, Any], rotation: RotationPolicy, fsync: bool
+) -> None:
+    """Compresses a rotated shard and adds it to the manifest.
+
+    Args:
+        rotated_shard: Rotated shard, as returned by `_rotate_if_due()`.
+        rotation: Rotation policy the shard was rotated with.
+        fsync: Whether to force the compressed shard to disk before removing
+          the uncompressed one.
+    """
+    part_path = rotated_shard.pop("part")
+    inode = rotated_shard.pop("inode")
+    export_dir = os.path.dirname(part_path)
+    shard_path = os.path.join(export_dir or ".", rotated_shard["file"])
+
+    dialogues = 0
+    with open(part_path, "rb") as infile, _open_shard(
+        shard_path, rotation.compression
+    ) as outfile:
+        for chunk in iter(lambda: infile.read(_COPY_CHUNK_SIZE), b""):
+            dialogues += chunk.count(b"\n")
+            outfile.write(chunk)
+    if fsync:
+        with open(shard_path, "rb") as shard_file:
+            os.fsync(shard_file.fileno())
+    os.remove(part_path)
+
+    rotated_shard["dialogues"] = dialogues
+    source_path = os.path.join(export_dir, rotated_shard["source"])
+    cached = _active_starts.get(os.path.abspath(source_path))
+    if cached is not None and cached[1] == inode:
+        del _active_starts[os.path.abspath(source_path)]
+    with _update_manifest(export_dir or ".") as manifest:
+        manifest["shards"].append(rotated_shard)
+        active = manifest["active"].get(rotated_shard["source"])
+        if active is not None and active["inode"] == inode:
+            del manifest["active"][rotated_shard["source"]]
+
+
+def _open_shard(shard_path: str, compression: Compression) -> IO[bytes]:
+    """Opens a rotated shard for writing.
+
+    Args:
+        shard_path: Path to the shard.
+        compression: Compression of the shard.
+
+    Returns:
+        The shard, opened in binary mode.
+    """
+    if compression == Compression.GZIP:
+        return gzip.open(shard_path, "wb")  # type: ignore[return-value]
+    if compression == Compression.LZMA:
+        return lzma.open(shard_path, "wb")  # type: ignore[return-value]
+    return open(shard_path, "wb")
+
+
+def _extend_json(
+    filepath: str, dialogues: List[Dict[str, Any]], fsync: bool
+) -> None:
+    """Adds dialogues to a JSON array file.
+
+    The dialogues are written in place of the closing bracket of the array,
+    followed by a new closing bracket, so the existing dialogues are neither
+    parsed nor rewritten.
+
+    Args:
+        filepath: Path to the export file.
+        dialogues: Dialogues to export, as dictionaries.
+        fsync: Whether to force the written data to disk.
+
+    Raises:
+        ValueError: If the existing file does not end with a JSON array.
+    """
+    items = ", ".join(json.dumps(dialogue) for dialogue in dialogues)
+    with _locked_open(filepath, os.O_RDWR | os.O_CREAT) as outfile:
+        end = _find_last_non_whitespace(outfile, outfile.seek(0, os.SEEK_END))
+        if end is None:
+            outfile.seek(0)
+            data = f"[{items}]"
+        else:
+            outfile.seek(end)
+            if outfile.read(1) != b"]":
+                raise ValueError(f"{filepath} does not hold a JSON array")
+            last_item_end = _find_last_non_whitespace(outfile, end)
+            if last_item_end is None:
+                raise ValueError(f"{filepath} does not hold a JSON array")
+            outfile.seek(last_item_end)
+            separator = "" if outfile.read(1) == b"[" else ", "
+            outfile.seek(end)
+            data = f"{separator}{items}]"
+        outfile.write(data.encode("utf-8"))
+        outfile.truncate()
+        if fsync:
+            _fsync(outfile)
+
+
+def _find_last_non_whitespace(file: IO[bytes], end: int) -> Optional[int]:
+    """Returns the position of the last non-whitespace byte before a position.
+
+    Args:
+        file: File opened for reading in binary mode.
+        end: Position to search back from (exclusive).
+
+    Returns:
+        Position of the byte, or None if there are only whitespaces.
+    """
+    while end > 0:
+        start = max(0, end - _READ_BACK_SIZE)
+        file.seek(start)
+        chunk = file.read(end - start).rstrip(_WHITESPACE)
+        if chunk:
+            return start + len(chunk) - 1
+        end = start
+    return None
+
+
+@contextmanager
+def _locked_open(filepath: str, flags: int) -> Iterator[IO[bytes]]:
+    """Opens a file in binary mode and holds an exclusive lock on it.
+
+    If the file is removed or replaced while waiting for the lock, e.g., by
+    shard compaction, it is opened again.
+
+    Args:
+        filepath: Path to the file.
+        flags: Flags passed to `os.open()`.
+
+    Yields:
+        The locked file.
+    """
+    mode = "ab" if flags & os.O_APPEND else "r+b"
+    while True:
+        file = os.fdopen(os.open(filepath, flags, 0o644), mode)
+        try:
+            if fcntl is None:
+                break
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                if os.stat(filepath).st_ino == os.fstat(file.fileno()).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+        except BaseException:
+            file.close()
+            raise
+        file.close()
+
+    try:
+        yield file
+    finally:
+        # Closing the file releases the lock after the buffer is flushed.
+        file.close()
+
+
+def _fsync(outfile: IO[bytes]) -> None:
+    """Flushes an open file and forces its content to disk.
+
+    Args:
+        outfile: File opened for writing.
+    """
+    outfile.flush()
+    os.fsync(outfile.fileno())
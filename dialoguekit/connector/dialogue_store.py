@@ -0,0 +1,80 @@
+"""Interface for persisting exported dialogues.
+
+A dialogue store receives dialogues in the export format, i.e., the output of
+`Dialogue.to_dict()` with the agent and user replaced by their dictionary
+representations, and allows for reading them back as Dialogue objects.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from dialoguekit.core.dialogue import Dialogue
+
+
+class DialogueStore(ABC):
+    @abstractmethod
+    def save_dialogues(self, dialogues: List[Dict[str, Any]]) -> None:
+        """Saves dialogues.
+
+        Args:
+            dialogues: Dialogues in the export format.
+
+        Raises:
+            NotImplementedError: If not implemented in derived class.
+        """
+        raise NotImplementedError
+
+    def save_dialogue(self, dialogue: Dict[str, Any]) -> None:
+        """Saves a single dialogue.
+
+        Args:
+            dialogue: Dialogue in the export format.
+        """
+        self.save_dialogues([dialogue])
+
+    @abstractmethod
+    def get_dialogue(self, conversation_id: str) -> Optional[Dialogue]:
+        """Returns the dialogue with a given conversation ID.
+
+        Args:
+            conversation_id: Conversation ID.
+
+        Raises:
+            NotImplementedError: If not implemented in derived class.
+
+        Returns:
+            The most recently saved dialogue with the conversation ID, or None
+            if there is no such dialogue.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_dialogues(
+        self,
+        agent_id: str = None,
+        user_id: str = None,
+        start: datetime = None,
+        end: datetime = None,
+    ) -> List[Dialogue]:
+        """Returns the dialogues matching all the given criteria.
+
+        Args:
+            agent_id: Agent ID. Defaults to None.
+            user_id: User ID. Defaults to None.
+            start: Earliest time the dialogue was saved (inclusive). Defaults
+              to None.
+            end: Latest time the dialogue was saved (exclusive). Defaults to
+              None.
+
+        Raises:
+            NotImplementedError: If not implemented in derived class.
+
+        Returns:
+            List of dialogues in the order they were saved.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Releases the resources held by the store."""
+        pass
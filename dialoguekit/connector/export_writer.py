@@ -0,0 +1,286 @@
+"""Background writer for dialogue exports.
+
+Exporting a dialogue synchronously blocks the thread that closes the
+conversation (e.g., the one handling a user's disconnect) on disk I/O. The
+ExportWriter takes over that work: connectors hand it the dialogues to export,
+and a background thread writes them in batches. A batch is written once it
+holds `max_batch_size` dialogues or once its oldest dialogue has waited
+`max_delay` seconds, whichever comes first. Dialogues going to the same file
+are written with a single call. Connectors that need to know when their
+dialogue is persisted, e.g., to log its end in a `TurnLog`, pass a callback
+that is run once the dialogue has been written.
+
+A process-wide writer is available via `get_export_writer()`. It is drained
+when the interpreter exits.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dialoguekit.connector.dialogue_export import (
+    ExportFormat,
+    RotationPolicy,
+    export_dialogues,
+)
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+_QueuedDialogue = Tuple[
+    str,
+    ExportFormat,
+    Optional[RotationPolicy],
+    Dict[str, Any],
+    Optional[Callable[[], None]],
+]
+
+
+class FsyncPolicy(Enum):
+    """Represents when written exports are forced to disk."""
+
+    # Leave it to the operating system.
+    NEVER = 0
+    # Force every file written in a batch to disk before the next batch.
+    BATCH = 1
+
+
+class _FlushRequest:
+    def __init__(self) -> None:
+        """Represents a request to write all pending dialogues."""
+        self.done = threading.Event()
+
+
+class ExportWriter:
+    def __init__(
+        self,
+        max_batch_size: int = 100,
+        max_delay: float = 1.0,
+        fsync_policy: FsyncPolicy = FsyncPolicy.NEVER,
+    ) -> None:
+        """Represents a background writer for dialogue exports.
+
+        The writer thread is started on the first submitted dialogue.
+
+        Args:
+            max_batch_size: Maximum number of dialogues written per batch.
+              Defaults to 100.
+            max_delay: Maximum number of seconds a dialogue waits before its
+              batch is written. Defaults to 1 second.
+            fsync_policy: When written exports are forced to disk. Defaults
+              to NEVER.
+
+        Raises:
+            ValueError: If the batch size is not positive or the delay is
+              negative.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._fsync_policy = fsync_policy
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """Returns whether the writer has been shut down."""
+        return self._closed
+
+    def submit(
+        self,
+        filepath: str,
+        dialogue: Dict[str, Any],
+        export_format: ExportFormat = ExportFormat.JSONL,
+        rotation: Optional[RotationPolicy] = None,
+        on_written: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Queues a dialogue for export.
+
+        Args:
+            filepath: Path to the export file.
+            dialogue: Dialogue to export, as a dictionary.
+            export_format: Export format. Defaults to JSONL.
+            rotation: When to rotate the export file. Defaults to None.
+            on_written: Function called from the writer thread once the
+              dialogue has been written. It is not called if writing the
+              dialogue fails. Defaults to None.
+
+        Raises:
+            RuntimeError: If the writer has been shut down.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The export writer has been shut down.")
+            self._ensure_started()
+            self._queue.put(
+                (filepath, export_format, rotation, dialogue, on_written)
+            )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Writes all the dialogues submitted so far.
+
+        Args:
+            timeout: Maximum number of seconds to wait. Defaults to None, i.e.,
+              wait until the dialogues are written.
+
+        Returns:
+            True if the dialogues were written before the timeout.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                return True
+            request = _FlushRequest()
+            self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Writes all pending dialogues and stops the writer thread.
+
+        Args:
+            timeout: Maximum number of seconds to wait for the writer thread.
+              Defaults to None, i.e., wait until pending dialogues are written.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _ensure_started(self) -> None:
+        """Starts the writer thread if it is not running."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="dialoguekit-export-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Collects queued dialogues into batches and writes them."""
+        stop = False
+        while not stop:
+            batch: List[_QueuedDialogue] = []
+            flush_requests: List[_FlushRequest] = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self._max_delay
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, _FlushRequest):
+                    flush_requests.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self._max_batch_size:
+                    break
+                try:
+                    item = self._queue.get(
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    break
+
+            self._write_batch(batch)
+            for request in flush_requests:
+                request.done.set()
+
+    def _write_batch(self, batch: List[_QueuedDialogue]) -> None:
+        """Writes a batch of dialogues, grouped per export file.
+
+        Failing to write a file is logged and does not affect the other files
+        of the batch. The callbacks of the dialogues of a file are called once
+        the file has been written.
+
+        Args:
+            batch: Queued export file paths, formats, rotation policies,
+              dialogues and callbacks.
+        """
+        files: Dict[
+            Tuple[str, ExportFormat, Optional[RotationPolicy]],
+            List[Dict[str, Any]],
+        ] = defaultdict(list)
+        callbacks: Dict[
+            Tuple[str, ExportFormat, Optional[RotationPolicy]],
+            List[Callable[[], None]],
+        ] = defaultdict(list)
+        for filepath, export_format, rotation, dialogue, on_written in batch:
+            files[(filepath, export_format, rotation)].append(dialogue)
+            if on_written is not None:
+                callbacks[(filepath, export_format, rotation)].append(
+                    on_written
+                )
+
+        for key, dialogues in files.items():
+            filepath, export_format, rotation = key
+            try:
+                export_dialogues(
+                    filepath,
+                    dialogues,
+                    export_format,
+                    fsync=self._fsync_policy == FsyncPolicy.BATCH,
+                    rotation=rotation,
+                )
+            except Exception:
+                logger.exception(
+                    f"Failed to export {len(dialogues)} dialogue(s) to "
+                    f"{filepath}"
+                )
+                continue
+            for on_written in callbacks.pop(key, []):
+                try:
+                    on_written()
+                except Exception:
+                    logger.exception("Export callback failed")
+
+
+_export_writer: Optional[ExportWriter] = None
+_export_writer_lock = threading.Lock()
+
+
+def get_export_writer() -> ExportWriter:
+    """Returns the process-wide export writer.
+
+    The writer is created with default settings on first use and shut down,
+    writing all pending dialogues, when the interpreter exits.
+
+    Returns:
+        The process-wide ExportWriter.
+    """
+    global _export_writer
+    with _export_writer_lock:
+        if _export_writer is None or _export_writer.closed:
+            _export_writer = ExportWriter()
+            atexit.register(_export_writer.shutdown)
+        return _export_writer
+
+
+def _reset_after_fork() -> None:
+    """Discards the inherited process-wide writer in a forked child.
+
+    The writer thread does not survive a fork, so the child starts with a
+    fresh writer on first use.
+    """
+    global _export_writer, _export_writer_lock
+    _export_writer = None
+    _export_writer_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,206 @@
+"""Metrics sinks for timings recorded by the DialogueConnector.
+
+A DialogueConnector with a metrics sink reports, for every turn, the time
+spent in each stage of its handling as a histogram observation:
+
+- 'history_append': adding the utterance to the dialogue history (and turn
+  log, if any).
+- 'platform_display': displaying the utterance on the platform.
+- 'dispatch': the other participant's `receive_utterance()`, e.g., the NLU,
+  dialogue management and NLG of the agent when the user speaks. Turns and
+  exports triggered from within are not included.
+- 'export': exporting the dialogue history on close.
+
+Observations are in seconds and tagged with the class of the agent
+('agent_class') and, except for exports, with the participant whose utterance
+is handled ('participant'). Each turn also increments the 'turns' counter.
+"""
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Sequence, Tuple
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class MetricsSink(ABC):
+    @abstractmethod
+    def increment(
+        self, name: str, value: int = 1, tags: Dict[str, str] = None
+    ) -> None:
+        """Increments a counter.
+
+        Args:
+            name: Name of the counter.
+            value: Value to add. Defaults to 1.
+            tags: Tags of the counter. Defaults to None.
+
+        Raises:
+            NotImplementedError: If not implemented in derived class.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def observe(
+        self, name: str, value: float, tags: Dict[str, str] = None
+    ) -> None:
+        """Records an observation in a histogram.
+
+        Args:
+            name: Name of the histogram.
+            value: Observed value.
+            tags: Tags of the histogram. Defaults to None.
+
+        Raises:
+            NotImplementedError: If not implemented in derived class.
+        """
+        raise NotImplementedError
+
+
+class InMemoryMetricsSink(MetricsSink):
+    def __init__(self, max_samples: int = 10000) -> None:
+        """Represents a metrics sink keeping metrics in memory.
+
+        Histograms keep their most recent observations only, so percentiles
+        describe recent turns.
+
+        Args:
+            max_samples: Maximum number of observations kept per histogram.
+              Defaults to 10000.
+        """
+        self._max_samples = max_samples
+        self._lock = threading.Lock()
+        self._counters: Dict[_Key, int] = defaultdict(int)
+        self._histograms: Dict[_Key, Deque[float]] = {}
+
+    def increment(
+        self, name: str, value: int = 1, tags: Dict[str, str] = None
+    ) -> None:
+        """Increments a counter.
+
+        Args:
+            name: Name of the counter.
+            value: Value to add. Defaults to 1.
+            tags: Tags of the counter. Defaults to None.
+        """
+        with self._lock:
+            self._counters[_get_key(name, tags)] += value
+
+    def observe(
+        self, name: str, value: float, tags: Dict[str, str] = None
+    ) -> None:
+        """Records an observation in a histogram.
+
+        Args:
+            name: Name of the histogram.
+            value: Observed value.
+            tags: Tags of the histogram. Defaults to None.
+        """
+        key = _get_key(name, tags)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = deque(
+                    maxlen=self._max_samples
+                )
+            histogram.append(value)
+
+    def get_counter(self, name: str, tags: Dict[str, str] = None) -> int:
+        """Returns the value of a counter.
+
+        Args:
+            name: Name of the counter.
+            tags: Tags of the counter. Defaults to None.
+
+        Returns:
+            Value of the counter, 0 if never incremented.
+        """
+        with self._lock:
+            return self._counters.get(_get_key(name, tags), 0)
+
+    def get_observations(
+        self, name: str, tags: Dict[str, str] = None
+    ) -> List[float]:
+        """Returns the observations kept in a histogram.
+
+        Args:
+            name: Name of the histogram.
+            tags: Tags of the histogram. Defaults to None.
+
+        Returns:
+            Observations, oldest first.
+        """
+        with self._lock:
+            return list(self._histograms.get(_get_key(name, tags), []))
+
+    def get_latency_report(
+        self, percentiles: Sequence[float] = (50, 95, 99)
+    ) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Returns latency percentiles per agent class.
+
+        Observations are grouped by the 'agent_class' tag and histogram name,
+        regardless of the other tags.
+
+        Args:
+            percentiles: Percentiles to report. Defaults to (50, 95, 99).
+
+        Returns:
+            For each agent class and histogram, the number of observations
+            ('count') and the requested percentiles (e.g., 'p95').
+        """
+        grouped: Dict[str, Dict[str, List[float]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        with self._lock:
+            for (name, tags), histogram in self._histograms.items():
+                agent_class = dict(tags).get("agent_class", "")
+                grouped[agent_class][name].extend(histogram)
+
+        report: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for agent_class, histograms in grouped.items():
+            report[agent_class] = {}
+            for name, values in histograms.items():
+                values.sort()
+                summary = {"count": float(len(values))}
+                for percentile in percentiles:
+                    summary[f"p{percentile:g}"] = _get_percentile(
+                        values, percentile
+                    )
+                report[agent_class][name] = summary
+        return report
+
+    def reset(self) -> None:
+        """Discards all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _get_key(name: str, tags: Dict[str, str] = None) -> _Key:
+    """Returns the key of a metric.
+
+    Args:
+        name: Name of the metric.
+        tags: Tags of the metric. Defaults to None.
+
+    Returns:
+        The name along with the tags sorted by name.
+    """
+    return name, tuple(sorted(tags.items())) if tags else ()
+
+
+def _get_percentile(values: List[float], percentile: float) -> float:
+    """Returns a percentile using the nearest-rank method.
+
+    Args:
+        values: Sorted values, not empty.
+        percentile: Percentile between 0 and 100.
+
+    Returns:
+        The smallest value such that at least the given percentage of the
+        values are less than or equal to it.
+    """
+    rank = math.ceil(percentile / 100 * len(values))
+    return values[max(rank, 1) - 1]
@@ -0,0 +1,474 @@
+"""Dialogue store backed by SQLite.
+
+Dialogues, utterances, dialogue acts (with their slot-value annotations) and
+utterance feedback are kept in normalized tables. Dialogues are indexed by
+conversation ID, agent ID, user ID and the time they were saved, so that a
+single conversation or a time range can be retrieved without reading the rest
+of the store. Utterance annotations and metadata are stored as JSON.
+
+Dialogues are saved in batches: each call to `save_dialogues()` inserts all
+rows with prepared statements inside a single transaction.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from dialoguekit.connector.dialogue_store import DialogueStore
+from dialoguekit.core.annotated_utterance import AnnotatedUtterance
+from dialoguekit.core.annotation import Annotation
+from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.core.dialogue_act import DialogueAct
+from dialoguekit.core.feedback import BinaryFeedback, UtteranceFeedback
+from dialoguekit.core.intent_registry import intern_intent
+from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
+from dialoguekit.participant.participant import DialogueParticipant
+
+_FIELD_CONVERSATION = "conversation"
+_FIELD_CONVERSATION_ID = "conversation ID"
+_FIELD_AGENT = "agent"
+_FIELD_USER = "user"
+_FIELD_METADATA = "metadata"
+_FIELD_PARTICIPANT = "participant"
+_FIELD_UTTERANCE = "utterance"
+_FIELD_UTTERANCE_ID = "utterance ID"
+_FIELD_UTTERANCE_FEEDBACK = "utterance_feedback"
+_FIELD_DIALOGUE_ACTS = "dialogue_acts"
+_FIELD_INTENT = "intent"
+_FIELD_SLOT_VALUES = "slot_values"
+_FIELD_ANNOTATIONS = "annotations"
+_UTTERANCE_FIELDS = {
+    _FIELD_PARTICIPANT,
+    _FIELD_UTTERANCE,
+    _FIELD_UTTERANCE_ID,
+    _FIELD_UTTERANCE_FEEDBACK,
+    _FIELD_DIALOGUE_ACTS,
+    _FIELD_ANNOTATIONS,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dialogue (
+    pk INTEGER PRIMARY KEY,
+    conversation_id TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    agent_type TEXT,
+    user_id TEXT NOT NULL,
+    user_type TEXT,
+    timestamp REAL NOT NULL,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS dialogue_conversation_id
+    ON dialogue (conversation_id);
+CREATE INDEX IF NOT EXISTS dialogue_agent_id ON dialogue (agent_id, timestamp);
+CREATE INDEX IF NOT EXISTS dialogue_user_id ON dialogue (user_id, timestamp);
+CREATE INDEX IF NOT EXISTS dialogue_timestamp ON dialogue (timestamp);
+
+CREATE TABLE IF NOT EXISTS utterance (
+    pk INTEGER PRIMARY KEY,
+    dialogue_pk INTEGER NOT NULL REFERENCES dialogue (pk) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    utterance_id TEXT,
+    participant TEXT NOT NULL,
+    text TEXT,
+    annotations TEXT,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS utterance_dialogue ON utterance (dialogue_pk);
+
+CREATE TABLE IF NOT EXISTS dialogue_act (
+    pk INTEGER PRIMARY KEY,
+    utterance_pk INTEGER NOT NULL REFERENCES utterance (pk) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    intent TEXT
+);
+CREATE INDEX IF NOT EXISTS dialogue_act_utterance
+    ON dialogue_act (utterance_pk);
+CREATE INDEX IF NOT EXISTS dialogue_act_intent ON dialogue_act (intent);
+
+CREATE TABLE IF NOT EXISTS slot_value (
+    dialogue_act_pk INTEGER NOT NULL
+        REFERENCES dialogue_act (pk) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    slot TEXT,
+    value,
+    start INTEGER,
+    "end" INTEGER,
+    PRIMARY KEY (dialogue_act_pk, position)
+);
+
+CREATE TABLE IF NOT EXISTS feedback (
+    utterance_pk INTEGER PRIMARY KEY
+        REFERENCES utterance (pk) ON DELETE CASCADE,
+    value INTEGER NOT NULL
+);
+"""
+
+_INSERT_DIALOGUE = (
+    "INSERT INTO dialogue (pk, conversation_id, agent_id, agent_type, "
+    "user_id, user_type, timestamp, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_UTTERANCE = (
+    "INSERT INTO utterance (pk, dialogue_pk, position, utterance_id, "
+    "participant, text, annotations, metadata) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_DIALOGUE_ACT = (
+    "INSERT INTO dialogue_act (pk, utterance_pk, position, intent) "
+    "VALUES (?, ?, ?, ?)"
+)
+_INSERT_SLOT_VALUE = (
+    "INSERT INTO slot_value (dialogue_act_pk, position, slot, value, start, "
+    '"end") VALUES (?, ?, ?, ?, ?, ?)'
+)
+_INSERT_FEEDBACK = "INSERT INTO feedback (utterance_pk, value) VALUES (?, ?)"
+
+
+class SQLiteDialogueStore(DialogueStore):
+    def __init__(self, database: str = ":memory:") -> None:
+        """Represents a dialogue store backed by an SQLite database.
+
+        The store can be shared between threads. Several processes may write
+        to the same database file; their transactions are serialized by
+        SQLite.
+
+        Args:
+            database: Path to the database file. Defaults to an in-memory
+              database.
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            database, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        if database != ":memory:":
+            self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def save_dialogues(self, dialogues: List[Dict[str, Any]]) -> None:
+        """Saves dialogues in a single transaction.
+
+        Args:
+            dialogues: Dialogues in the export format.
+        """
+        timestamp = time.time()
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._to_rows(cursor, dialogues, timestamp)
+                for statement, statement_rows in zip(
+                    (
+                        _INSERT_DIALOGUE,
+                        _INSERT_UTTERANCE,
+                        _INSERT_DIALOGUE_ACT,
+                        _INSERT_SLOT_VALUE,
+                        _INSERT_FEEDBACK,
+                    ),
+                    rows,
+                ):
+                    cursor.executemany(statement, statement_rows)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+
+    def get_dialogue(self, conversation_id: str) -> Optional[Dialogue]:
+        """Returns the dialogue with a given conversation ID.
+
+        Args:
+            conversation_id: Conversation ID.
+
+        Returns:
+            The most recently saved dialogue with the conversation ID, or None
+            if there is no such dialogue.
+        """
+        dialogues = self._load(
+            "d.pk = (SELECT MAX(pk) FROM dialogue WHERE conversation_id = ?)",
+            [conversation_id],
+        )
+        return dialogues[0] if dialogues else None
+
+    def find_dialogues(
+        self,
+        agent_id: str = None,
+        user_id: str = None,
+        start: datetime = None,
+        end: datetime = None,
+    ) -> List[Dialogue]:
+        """Returns the dialogues matching all the given criteria.
+
+        Args:
+            agent_id: Agent ID. Defaults to None.
+            user_id: User ID. Defaults to None.
+            start: Earliest time the dialogue was saved (inclusive). Defaults
+              to None.
+            end: Latest time the dialogue was saved (exclusive). Defaults to
+              None.
+
+        Returns:
+            List of dialogues in the order they were saved.
+        """
+        conditions = []
+        params: List[Any] = []
+        if agent_id is not None:
+            conditions.append("d.agent_id = ?")
+            params.append(agent_id)
+        if user_id is not None:
+            conditions.append("d.user_id = ?")
+            params.append(user_id)
+        if start is not None:
+            conditions.append("d.timestamp >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            conditions.append("d.timestamp < ?")
+            params.append(end.timestamp())
+        return self._load(" AND ".join(conditions) or "1", params)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _to_rows(
+        self,
+        cursor: sqlite3.Cursor,
+        dialogues: List[Dict[str, Any]],
+        timestamp: float,
+    ) -> Tuple[List[Tuple[Any, ...]], ...]:
+        """Converts dialogues in the export format to table rows.
+
+        Primary keys are assigned here, so that all rows can be inserted with
+        `executemany()`. This must be called within the write transaction.
+
+        Args:
+            cursor: Cursor of the write transaction.
+            dialogues: Dialogues in the export format.
+            timestamp: Time the dialogues are saved, in seconds since epoch.
+
+        Returns:
+            Rows of the dialogue, utterance, dialogue act, slot value and
+            feedback tables.
+        """
+        dialogue_pk, utterance_pk, dialogue_act_pk = (
+            cursor.execute(
+                f"SELECT COALESCE(MAX(pk), 0) FROM {table}"
+            ).fetchone()[0]
+            for table in ("dialogue", "utterance", "dialogue_act")
+        )
+        dialogue_rows: List[Tuple[Any, ...]] = []
+        utterance_rows: List[Tuple[Any, ...]] = []
+        dialogue_act_rows: List[Tuple[Any, ...]] = []
+        slot_value_rows: List[Tuple[Any, ...]] = []
+        feedback_rows: List[Tuple[Any, ...]] = []
+
+        for dialogue in dialogues:
+            dialogue_pk += 1
+            agent_id, agent_type = _participant(dialogue.get(_FIELD_AGENT))
+            user_id, user_type = _participant(dialogue.get(_FIELD_USER))
+            dialogue_rows.append(
+                (
+                    dialogue_pk,
+                    dialogue.get(
+                        _FIELD_CONVERSATION_ID, dialogue.get("conversation_id")
+                    ),
+                    agent_id,
+                    agent_type,
+                    user_id,
+                    user_type,
+                    timestamp,
+                    _dumps(dialogue.get(_FIELD_METADATA)),
+                )
+            )
+
+            for position, utterance in enumerate(
+                dialogue.get(_FIELD_CONVERSATION, [])
+            ):
+                utterance_pk += 1
+                metadata = {
+                    k: v
+                    for k, v in utterance.items()
+                    if k not in _UTTERANCE_FIELDS
+                }
+                utterance_rows.append(
+                    (
+                        utterance_pk,
+                        dialogue_pk,
+                        position,
+                        utterance.get(_FIELD_UTTERANCE_ID),
+                        utterance[_FIELD_PARTICIPANT],
+                        utterance.get(_FIELD_UTTERANCE),
+                        _dumps(utterance.get(_FIELD_ANNOTATIONS)),
+                        _dumps(metadata),
+                    )
+                )
+                feedback = utterance.get(_FIELD_UTTERANCE_FEEDBACK)
+                if feedback is not None:
+                    feedback_rows.append((utterance_pk, feedback))
+
+                for da_position, da in enumerate(
+                    utterance.get(_FIELD_DIALOGUE_ACTS, [])
+                ):
+                    dialogue_act_pk += 1
+                    dialogue_act_rows.append(
+                        (
+                            dialogue_act_pk,
+                            utterance_pk,
+                            da_position,
+                            da.get(_FIELD_INTENT) or None,
+                        )
+                    )
+                    slot_value_rows.extend(
+                        (dialogue_act_pk, sv_position, *slot_value)
+                        for sv_position, slot_value in enumerate(
+                            da.get(_FIELD_SLOT_VALUES, [])
+                        )
+                    )
+
+        return (
+            dialogue_rows,
+            utterance_rows,
+            dialogue_act_rows,
+            slot_value_rows,
+            feedback_rows,
+        )
+
+    def _load(self, condition: str, params: List[Any]) -> List[Dialogue]:
+        """Loads the dialogues matching a condition on the dialogue table.
+
+        Args:
+            condition: SQL condition on the dialogue table, aliased as 'd'.
+            params: Parameters of the condition.
+
+        Returns:
+            List of dialogues in the order they were saved.
+        """
+        with self._lock:
+            dialogue_rows = self._connection.execute(
+                "SELECT d.pk, d.conversation_id, d.agent_id, d.user_id, "
+                f"d.metadata FROM dialogue d WHERE {condition} ORDER BY d.pk",
+                params,
+            ).fetchall()
+            utterance_rows = self._connection.execute(
+                "SELECT u.pk, u.dialogue_pk, u.utterance_id, u.participant, "
+                "u.text, u.annotations, u.metadata FROM utterance u "
+                "JOIN dialogue d ON d.pk = u.dialogue_pk "
+                f"WHERE {condition} ORDER BY u.pk",
+                params,
+            ).fetchall()
+            dialogue_act_rows = self._connection.execute(
+                "SELECT a.pk, a.utterance_pk, a.intent FROM dialogue_act a "
+                "JOIN utterance u ON u.pk = a.utterance_pk "
+                "JOIN dialogue d ON d.pk = u.dialogue_pk "
+                f"WHERE {condition} ORDER BY a.pk",
+                params,
+            ).fetchall()
+            slot_value_rows = self._connection.execute(
+                "SELECT s.dialogue_act_pk, s.slot, s.value, s.start, "
+                's."end" FROM slot_value s '
+                "JOIN dialogue_act a ON a.pk = s.dialogue_act_pk "
+                "JOIN utterance u ON u.pk = a.utterance_pk "
+                "JOIN dialogue d ON d.pk = u.dialogue_pk "
+                f"WHERE {condition} ORDER BY s.dialogue_act_pk, s.position",
+                params,
+            ).fetchall()
+            feedback_rows = self._connection.execute(
+                "SELECT f.utterance_pk, f.value FROM feedback f "
+                "JOIN utterance u ON u.pk = f.utterance_pk "
+                "JOIN dialogue d ON d.pk = u.dialogue_pk "
+                f"WHERE {condition}",
+                params,
+            ).fetchall()
+
+        slot_values: Dict[int, List[SlotValueAnnotation]] = {}
+        for dialogue_act_pk, slot, value, start, end in slot_value_rows:
+            slot_values.setdefault(dialogue_act_pk, []).append(
+                SlotValueAnnotation(slot, value, start, end)
+            )
+
+        dialogue_acts: Dict[int, List[DialogueAct]] = {}
+        for dialogue_act_pk, utterance_pk, intent in dialogue_act_rows:
+            dialogue_acts.setdefault(utterance_pk, []).append(
+                DialogueAct(
+                    intern_intent(intent) if intent else None,
+                    slot_values.get(dialogue_act_pk, []),
+                )
+            )
+
+        feedbacks = dict(feedback_rows)
+        dialogues: Dict[int, Dialogue] = {}
+        for (
+            dialogue_pk,
+            conversation_id,
+            agent_id,
+            user_id,
+            metadata,
+        ) in dialogue_rows:
+            dialogue = Dialogue(agent_id, user_id, conversation_id)
+            if metadata is not None:
+                dialogue.metadata.update(json.loads(metadata))
+            dialogues[dialogue_pk] = dialogue
+
+        for (
+            utterance_pk,
+            dialogue_pk,
+            utterance_id,
+            participant,
+            text,
+            annotations,
+            metadata,
+        ) in utterance_rows:
+            dialogue = dialogues[dialogue_pk]
+            utterance = AnnotatedUtterance(
+                text=text,
+                participant=DialogueParticipant[participant],
+                utterance_id=utterance_id,
+                dialogue_acts=dialogue_acts.get(utterance_pk, []),
+                annotations=[
+                    Annotation(key, value)
+                    for key, value in json.loads(annotations or "[]")
+                ],
+                metadata=json.loads(metadata or "{}"),
+            )
+            dialogue.add_utterance(utterance)
+            if utterance_pk in feedbacks:
+                dialogue.add_utterance_feedback(
+                    UtteranceFeedback(
+                        utterance.utterance_id,
+                        BinaryFeedback(feedbacks[utterance_pk]),
+                    ),
+                    utterance.utterance_id,
+                )
+
+        return list(dialogues.values())
+
+
+def _participant(participant: Any) -> Tuple[str, Optional[str]]:
+    """Returns the ID and type of a participant in the export format.
+
+    Args:
+        participant: Either the dictionary representation of the participant
+          or its ID.
+
+    Returns:
+        Participant ID and type (None if unknown).
+    """
+    if isinstance(participant, dict):
+        return participant.get("id"), participant.get("type")
+    return participant, None
+
+
+def _dumps(value: Any) -> Optional[str]:
+    """Serializes a value to JSON, keeping None and empty values as None.
+
+    Args:
+        value: Value to serialize.
+
+    Returns:
+        JSON string or None.
+    """
+    if not value:
+        return None
+    return json.dumps(value)
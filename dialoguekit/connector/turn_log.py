@@ -0,0 +1,388 @@
+"""Write-ahead log of dialogue turns.
+
+A dialogue is only exported when its DialogueConnector is closed. To not lose
+the conversations in progress when a worker process crashes, connectors may
+additionally append every turn to a TurnLog as it happens: the start of a
+conversation, each utterance, each piece of user feedback and, once the
+dialogue has been exported, its end. Each record is a single line of JSON
+written with a single system call, so the cost of persistence is spread over
+the turns of a conversation.
+
+Each process writes to its own log file, 'turns.{worker}.jsonl', and holds a
+lock on it for as long as the log is open. Once the log file reaches a size
+limit, it is rolled over to a new segment holding only the records of the
+conversations in progress, which replaces it; the log thus grows with the
+conversations in progress, not with every conversation since the process
+started. On startup, `recover_dialogues()` reads the logs of processes that
+are no longer running and returns the dialogues that were not ended, in the
+export format.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from dialoguekit.connector.dialogue_export import get_worker_shard
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+_LOG_FILE_PREFIX = "turns."
+_LOG_FILE_SUFFIX = ".jsonl"
+_SEGMENT_SUFFIX = ".next"
+
+_FIELD_EVENT = "event"
+_FIELD_CONVERSATION_ID = "conversation ID"
+_FIELD_DATA = "data"
+
+_EVENT_START = "start"
+_EVENT_UTTERANCE = "utterance"
+_EVENT_FEEDBACK = "feedback"
+_EVENT_END = "end"
+
+
+class TurnLog:
+    def __init__(
+        self,
+        log_dir: str = "dialogue_turn_log",
+        fsync: bool = False,
+        max_bytes: int = 16 * 1024 * 1024,
+    ) -> None:
+        """Represents the turn log of the current process.
+
+        The log file is opened on the first record. Records are written to the
+        operating system immediately, so they survive a crash of the process.
+
+        Args:
+            log_dir: Directory holding the turn logs. Defaults to
+              'dialogue_turn_log'.
+            fsync: Whether to force every record to disk, so that it also
+              survives a crash of the operating system. Defaults to False.
+            max_bytes: Size from which the log file is rolled over to a new
+              segment, dropping the records of ended conversations. Defaults
+              to 16 MiB.
+        """
+        self._log_dir = log_dir
+        self._fsync = fsync
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+        self._filepath: Optional[str] = None
+        self._size = 0
+        self._roll_size = max_bytes
+        # Offsets and lengths of the records of each conversation in progress.
+        self._open_conversations: Dict[str, List[Tuple[int, int]]] = {}
+
+    @property
+    def filepath(self) -> Optional[str]:
+        """Returns the path of the log file, if opened."""
+        return self._filepath
+
+    def log_start(
+        self,
+        conversation_id: str,
+        agent: Dict[str, Any],
+        user: Dict[str, Any],
+    ) -> None:
+        """Logs the start of a conversation.
+
+        Args:
+            conversation_id: Conversation ID.
+            agent: Agent, as a dictionary.
+            user: User, as a dictionary.
+        """
+        self._write(
+            _EVENT_START, conversation_id, {"agent": agent, "user": user}
+        )
+
+    def log_utterance(
+        self, conversation_id: str, utterance: Dict[str, Any]
+    ) -> None:
+        """Logs an utterance.
+
+        Args:
+            conversation_id: Conversation ID.
+            utterance: Utterance in the export format, see
+              `Dialogue.utterance_to_dict()`.
+        """
+        self._write(_EVENT_UTTERANCE, conversation_id, utterance)
+
+    def log_feedback(
+        self, conversation_id: str, utterance_id: str, feedback: int
+    ) -> None:
+        """Logs user feedback on an utterance.
+
+        Args:
+            conversation_id: Conversation ID.
+            utterance_id: Utterance ID.
+            feedback: Value of the feedback.
+        """
+        self._write(
+            _EVENT_FEEDBACK,
+            conversation_id,
+            {"utterance ID": utterance_id, "feedback": feedback},
+        )
+
+    def log_end(self, conversation_id: str) -> None:
+        """Logs the end of a conversation, i.e., that it has been persisted.
+
+        Args:
+            conversation_id: Conversation ID.
+        """
+        self._write(_EVENT_END, conversation_id)
+
+    def close(self) -> None:
+        """Closes the log file, releasing its lock."""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _write(
+        self,
+        event: str,
+        conversation_id: str,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Appends a record to the log file.
+
+        Args:
+            event: Type of the record.
+            conversation_id: Conversation ID.
+            data: Content of the record. Defaults to None.
+        """
+        record: Dict[str, Any] = {
+            _FIELD_EVENT: event,
+            _FIELD_CONVERSATION_ID: conversation_id,
+        }
+        if data is not None:
+            record[_FIELD_DATA] = data
+        line = (json.dumps(record) + "\n").encode("utf-8")
+
+        with self._lock:
+            fd = self._get_fd()
+            if event == _EVENT_END:
+                self._open_conversations.pop(conversation_id, None)
+            else:
+                self._open_conversations.setdefault(conversation_id, []).append(
+                    (self._size, len(line))
+                )
+            os.write(fd, line)
+            if self._fsync:
+                os.fsync(fd)
+            self._size += len(line)
+            if not self._open_conversations:
+                if self._size >= self._max_bytes:
+                    # Every logged conversation has been persisted.
+                    os.remove(self._filepath)
+                    os.close(fd)
+                    self._fd = None
+            elif self._size >= self._roll_size:
+                self._roll()
+
+    def _roll(self) -> None:
+        """Replaces the log file with the records of open conversations.
+
+        The records are copied to a new segment, which is locked and written
+        before it replaces the log file. Conversations that stay open for
+        long (e.g., whose export failed) thus only keep their own records.
+        """
+        segment_path = self._filepath + _SEGMENT_SUFFIX
+        fd = os.open(
+            segment_path,
+            os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_TRUNC,
+            0o644,
+        )
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        chunks = []
+        size = 0
+        for records in self._open_conversations.values():
+            for index, (offset, length) in enumerate(records):
+                chunks.append(os.pread(self._fd, length, offset))
+                records[index] = (size, length)
+                size += length
+        os.write(fd, b"".join(chunks))
+        if self._fsync:
+            os.fsync(fd)
+        os.replace(segment_path, self._filepath)
+        os.close(self._fd)
+        self._fd = fd
+        self._size = size
+        # Large open conversations are not copied on every record.
+        self._roll_size = max(self._max_bytes, 2 * size)
+
+    def _get_fd(self) -> int:
+        """Returns the descriptor of the log file, opening it if needed.
+
+        A log file inherited from a parent process is not written to, as the
+        lock on it belongs to the parent.
+
+        Returns:
+            File descriptor of the log file, locked.
+        """
+        if self._fd is not None:
+            if self._pid == os.getpid():
+                return self._fd
+            os.close(self._fd)
+            self._open_conversations = {}
+
+        os.makedirs(self._log_dir, exist_ok=True)
+        self._filepath = os.path.join(
+            self._log_dir,
+            f"{_LOG_FILE_PREFIX}{get_worker_shard()}{_LOG_FILE_SUFFIX}",
+        )
+        fd = os.open(
+            self._filepath, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644
+        )
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        self._fd = fd
+        self._pid = os.getpid()
+        self._size = os.fstat(fd).st_size
+        self._roll_size = self._max_bytes
+        return fd
+
+
+def recover_dialogues(
+    log_dir: str = "dialogue_turn_log", remove: bool = False
+) -> List[Dict[str, Any]]:
+    """Recovers the dialogues in progress from the logs of ended processes.
+
+    The logs of running processes are locked and skipped. A dialogue that was
+    persisted right before its process crashed, but whose end was not logged,
+    is recovered as well.
+
+    Args:
+        log_dir: Directory holding the turn logs. Defaults to
+          'dialogue_turn_log'.
+        remove: Whether to remove the logs that were read. Defaults to False,
+          i.e., the logs are kept until the recovered dialogues are persisted
+          and the function is called again with remove set.
+
+    Returns:
+        The dialogues that were not ended, with at least one utterance, in the
+        export format (see `Dialogue.to_dict()`) and in the order they were
+        started.
+    """
+    if not os.path.isdir(log_dir):
+        return []
+
+    dialogues: List[Dict[str, Any]] = []
+    for file_name in sorted(os.listdir(log_dir)):
+        if not (
+            file_name.startswith(_LOG_FILE_PREFIX)
+            and file_name.endswith(_LOG_FILE_SUFFIX)
+        ):
+            continue
+        dialogues.extend(_recover_log(os.path.join(log_dir, file_name), remove))
+    return dialogues
+
+
+def _recover_log(filepath: str, remove: bool) -> List[Dict[str, Any]]:
+    """Recovers the dialogues in progress from a log file, if not in use.
+
+    Args:
+        filepath: Path of the log file.
+        remove: Whether to remove the log file once read.
+
+    Returns:
+        The dialogues that were not ended, with at least one utterance, in the
+        export format.
+    """
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except FileNotFoundError:
+        return []
+    with os.fdopen(fd, "rb") as log_file:
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # The process writing the log is still running.
+                return []
+        if not _is_current(fd, filepath):
+            # Rolled over or removed while it was being locked.
+            return []
+        dialogues = _replay(log_file.read().decode("utf-8"))
+        if remove:
+            os.remove(filepath)
+    return dialogues
+
+
+def _is_current(fd: int, filepath: str) -> bool:
+    """Checks whether an open file is still the file at a path.
+
+    Args:
+        fd: Descriptor of the open file.
+        filepath: Path the file was opened at.
+
+    Returns:
+        True if the path still leads to the open file.
+    """
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(fd)
+    return (stat.st_dev, stat.st_ino) == (opened.st_dev, opened.st_ino)
+
+
+def _replay(content: str) -> List[Dict[str, Any]]:
+    """Rebuilds the dialogues that were not ended from a turn log.
+
+    A partially written last record, left by a crash, is ignored.
+
+    Args:
+        content: Content of the log file.
+
+    Returns:
+        The dialogues that were not ended, with at least one utterance, in the
+        export format.
+    """
+    dialogues: Dict[str, Dict[str, Any]] = {}
+    for line in content.splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        _apply_record(dialogues, record)
+
+    return [
+        dialogue for dialogue in dialogues.values() if dialogue["conversation"]
+    ]
+
+
+def _apply_record(
+    dialogues: Dict[str, Dict[str, Any]], record: Dict[str, Any]
+) -> None:
+    """Applies a turn log record to the dialogues being rebuilt.
+
+    Args:
+        dialogues: Dialogues not ended so far, keyed by conversation ID.
+        record: Turn log record.
+    """
+    conversation_id = record[_FIELD_CONVERSATION_ID]
+    event = record[_FIELD_EVENT]
+    data = record.get(_FIELD_DATA, {})
+    if event == _EVENT_START:
+        dialogues[conversation_id] = {
+            "conversation ID": conversation_id,
+            "conversation": [],
+            "agent": data["agent"],
+            "user": data["user"],
+        }
+    elif event == _EVENT_END:
+        dialogues.pop(conversation_id, None)
+    elif conversation_id not in dialogues:
+        return
+    elif event == _EVENT_UTTERANCE:
+        dialogues[conversation_id]["conversation"].append(data)
+    elif event == _EVENT_FEEDBACK:
+        for utterance in dialogues[conversation_id]["conversation"]:
+            if utterance["utterance ID"] == data["utterance ID"]:
+                utterance["utterance_feedback"] = data["feedback"]
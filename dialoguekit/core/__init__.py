@@ -1,18 +1,24 @@
 """Module level init for the core classes."""
 from dialoguekit.core.annotated_utterance import AnnotatedUtterance
 from dialoguekit.core.annotation import Annotation
+from dialoguekit.core.bounded_dialogue import BoundedDialogue
 from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.core.dialogue_view import DialogueView
 from dialoguekit.core.domain import Domain
 from dialoguekit.core.intent import Intent
+from dialoguekit.core.intent_registry import IntentRegistry
 from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
 from dialoguekit.core.utterance import Utterance
 
 __all__ = [
     "AnnotatedUtterance",
     "Annotation",
+    "BoundedDialogue",
     "Dialogue",
+    "DialogueView",
     "Domain",
     "Intent",
+    "IntentRegistry",
     "SlotValueAnnotation",
     "Utterance",
 ]
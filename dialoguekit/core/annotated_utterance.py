@@ -1,32 +1,71 @@
 """Interface extending utterances with annotations."""
 
 from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from dialoguekit.core.annotation import Annotation
-from dialoguekit.core.dialogue_act import DialogueAct
+from dialoguekit.core.dialogue_act import (
+    DialogueAct,
+    get_raw_annotations as _get_raw_da_annotations,
+)
 from dialoguekit.core.intent import Intent
+from dialoguekit.core.lazy_container import install_lazy_container
 from dialoguekit.core.utterance import Utterance
 
 
-@dataclass(eq=True, unsafe_hash=True)
+@dataclass(eq=True, unsafe_hash=True, slots=True)
 class AnnotatedUtterance(Utterance):
     """Represents an utterance, with annotations.
 
     The AnnotatedUtterance is a Utterance with additional information. In some
     cases we want to send an utterance with dialogue acts and/or Annotations.
     Dialogue acts are a specific type of annotation.
+
+    The lists of dialogue acts and annotations, and the metadata dictionary,
+    are created on first access, so utterances without them do not hold empty
+    containers. Accessing them increments the revision of the utterance, as
+    they may be modified in place; see `revision`.
     """
 
+    # Declared first, as it is incremented when the containers are set.
+    _revision: int = field(
+        default=0, init=False, repr=False, compare=False, hash=False
+    )
     dialogue_acts: List[DialogueAct] = field(
-        default_factory=list, compare=True, hash=False
+        default=None, compare=True, hash=False
     )
     annotations: List[Annotation] = field(
-        default_factory=list, compare=True, hash=False
-    )
-    metadata: Dict[str, Any] = field(
-        default_factory=dict, compare=True, hash=False
+        default=None, compare=True, hash=False
     )
+    metadata: Dict[str, Any] = field(default=None, compare=True, hash=False)
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the utterance with annotated utterances of any kind.
+
+        The annotation containers are compared without being created, a
+        missing container being equal to an empty one, and without changing
+        the revision of either utterance.
+        """
+        if not isinstance(other, AnnotatedUtterance):
+            return NotImplemented
+        return (
+            self.text == other.text
+            and self.participant == other.participant
+            and self.utterance_id == other.utterance_id
+            and self.timestamp == other.timestamp
+            and _get_annotation_content(self) == _get_annotation_content(other)
+        )
+
+    @property
+    def revision(self) -> int:
+        """Returns a counter of the accesses to the annotation containers.
+
+        A change of revision means that the dialogue acts, annotations or
+        metadata may have been modified since, e.g., to invalidate a cached
+        serialization of the utterance. Dialogue acts modified through
+        references obtained before are not accounted for.
+        """
+        return self._revision
 
     def get_utterance(self) -> Utterance:
         """Returns the annotated utterance as a utterance."""
@@ -41,6 +80,7 @@ class AnnotatedUtterance(Utterance):
     def from_utterance(cls, utterance: Utterance):
         """Creates an instance of AnnotatedUtterance from an utterance."""
         args = asdict(utterance)
+        args.pop("_revision", None)
         return cls(**args)
 
     def add_dialogue_acts(self, dialogue_acts: List[DialogueAct]) -> None:
@@ -53,16 +93,13 @@ class AnnotatedUtterance(Utterance):
 
     def get_intents(self) -> List[Intent]:
         """Returns utterance's intents."""
-        return [da.intent for da in self.dialogue_acts]
+        return [da.intent for da in get_raw_dialogue_acts(self) or []]
 
     def num_dialogue_act_annotations(self) -> int:
         """Returns the number of slot-value annotations in dialogue acts."""
-        return len(
-            [
-                annotation
-                for da in self.dialogue_acts
-                for annotation in da.annotations
-            ]
+        return sum(
+            len(_get_raw_da_annotations(da) or [])
+            for da in get_raw_dialogue_acts(self) or []
         )
 
     def add_annotations(self, annotations: List[Annotation]) -> None:
@@ -81,3 +118,68 @@ class AnnotatedUtterance(Utterance):
         """
         # TODO See: https://github.com/iai-group/dialoguekit/issues/35
         return ""
+
+    def _load_container(self, name: str) -> Any:
+        """Loads an empty annotation container on first read.
+
+        Utterances backed by raw records override this method to decode the
+        container from the record.
+
+        Args:
+            name: Name of the field.
+
+        Returns:
+            Container, or None if there is nothing to load.
+        """
+        return None
+
+
+def _get_annotation_content(utterance: AnnotatedUtterance) -> Tuple[Any, ...]:
+    """Returns the annotations of an utterance, for comparison.
+
+    Args:
+        utterance: Annotated utterance.
+
+    Returns:
+        Intents and slot-value annotations of the dialogue acts, annotations
+        and metadata, read without creating the containers.
+    """
+    return (
+        [
+            (da.intent, _get_raw_da_annotations(da) or [])
+            for da in get_raw_dialogue_acts(utterance) or []
+        ],
+        get_raw_annotations(utterance) or [],
+        get_raw_metadata(utterance) or {},
+    )
+
+
+def _increment_revision(utterance: AnnotatedUtterance) -> None:
+    utterance._revision += 1
+
+
+def _load_container(utterance: AnnotatedUtterance, name: str) -> Any:
+    return utterance._load_container(name)
+
+
+get_raw_dialogue_acts = install_lazy_container(
+    AnnotatedUtterance,
+    "dialogue_acts",
+    list,
+    _increment_revision,
+    _load_container,
+)
+get_raw_annotations = install_lazy_container(
+    AnnotatedUtterance,
+    "annotations",
+    list,
+    _increment_revision,
+    _load_container,
+)
+get_raw_metadata = install_lazy_container(
+    AnnotatedUtterance,
+    "metadata",
+    dict,
+    _increment_revision,
+    _load_container,
+)
@@ -0,0 +1,162 @@
+"""Dialogue keeping a bounded number of utterances in memory.
+
+For long-running sessions, a BoundedDialogue keeps only the last utterances in
+memory. Older utterances are spilled, in the export format, to an append-only
+file, which is read back when the dialogue is serialized. The memory used by a
+session thus stays flat, while the exported dialogue stays complete. Spilling
+an utterance takes constant time, and the spill file is only open while it is
+written or read, so that many sessions do not hold as many file descriptors.
+
+Participants see the utterances kept in memory through `utterances`, whereas
+`current_turn_id`, `to_dict()`, `iter_serialized()`, `fingerprint` and
+`clear()` cover the whole dialogue. Feedback on spilled utterances is applied
+when they are read back.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, Optional
+
+from dialoguekit.core.dialogue import Dialogue, _update_fingerprint_digest
+
+if TYPE_CHECKING:
+    from dialoguekit.core.utterance import Utterance
+
+_SPILL_DIR = "dialogue_spill"
+
+
+class BoundedDialogue(Dialogue):
+    def __init__(
+        self,
+        agent_id: str,
+        user_id: str,
+        conversation_id: str = None,
+        max_utterances: int = 100,
+        spill_dir: str = _SPILL_DIR,
+    ) -> None:
+        """Represents a dialogue with a bounded number of utterances in memory.
+
+        Args:
+            agent_id: Agent ID.
+            user_id: User ID.
+            conversation_id: Conversation ID. Defaults to None.
+            max_utterances: Number of utterances kept in memory. Defaults to
+              100.
+            spill_dir: Directory of the spill files. Defaults to
+              'dialogue_spill'.
+
+        Raises:
+            ValueError: If max_utterances is not positive.
+        """
+        if max_utterances < 1:
+            raise ValueError("max_utterances must be positive")
+        super().__init__(agent_id, user_id, conversation_id)
+        self._utterances: Deque[Utterance] = deque()
+        self._max_utterances = max_utterances
+        self._spill_dir = spill_dir
+        self._spill_filepath: Optional[str] = None
+        self._num_spilled = 0
+        self._spilled_digest = super()._get_fingerprint_digest()
+
+    @property
+    def num_spilled(self) -> int:
+        """Returns the number of utterances spilled to disk."""
+        return self._num_spilled
+
+    @property
+    def spill_filepath(self) -> Optional[str]:
+        """Returns the path of the spill file, None if nothing was spilled."""
+        return self._spill_filepath
+
+    @property
+    def current_turn_id(self) -> int:
+        """Returns the ID of the current utterance."""
+        return self._num_spilled + len(self._utterances)
+
+    def add_utterance(self, utterance: Utterance) -> None:
+        """Adds an utterance to the history, spilling the oldest if needed.
+
+        Args:
+            utterance: An instance of Utterance.
+        """
+        super().add_utterance(utterance)
+        while len(self._utterances) > self._max_utterances:
+            self._spill_oldest()
+
+    def iter_serialized(self, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """Iterates over the utterances converted to dictionaries.
+
+        Spilled utterances are read back from the spill file.
+
+        Args:
+            start: Position of the first utterance in the whole dialogue.
+              Defaults to 0.
+
+        Yields:
+            Utterances as dictionaries, see `utterance_to_dict()`.
+        """
+        if start < self._num_spilled:
+            yield from self._read_spilled(start)
+        yield from super().iter_serialized(max(start - self._num_spilled, 0))
+
+    def clear(self) -> None:
+        """Removes all utterances, including the spilled ones."""
+        self.discard_spilled()
+        super().clear()
+
+    def discard_spilled(self) -> None:
+        """Removes the spill file and forgets the spilled utterances."""
+        if self._spill_filepath is not None:
+            os.remove(self._spill_filepath)
+            self._spill_filepath = None
+        self._num_spilled = 0
+        # The cache of serialized utterances is by position in the dialogue.
+        self._records = {}
+        self._spilled_digest = super()._get_fingerprint_digest()
+        self._fingerprint_digest = None
+
+    def _get_fingerprint_digest(self) -> Any:
+        """Returns the fingerprint hash, updated with the spilled utterances."""
+        return self._spilled_digest.copy()
+
+    def _spill_oldest(self) -> None:
+        """Moves the oldest utterance in memory to the spill file."""
+        record = next(super().iter_serialized())
+        if self._spill_filepath is None:
+            os.makedirs(self._spill_dir, exist_ok=True)
+            fd, self._spill_filepath = tempfile.mkstemp(
+                suffix=".jsonl", dir=self._spill_dir
+            )
+            os.close(fd)
+        with open(self._spill_filepath, "a", encoding="utf-8") as spill_file:
+            spill_file.write(json.dumps(record) + "\n")
+        utterance = self._utterances.popleft()
+        self._records.pop(self._num_spilled, None)
+        _update_fingerprint_digest(self._spilled_digest, utterance)
+        self._num_spilled += 1
+
+    def _read_spilled(self, start: int) -> Iterator[Dict[str, Any]]:
+        """Reads back spilled utterances.
+
+        Args:
+            start: Position of the first utterance.
+
+        Yields:
+            Utterances as dictionaries, with their current feedback.
+        """
+        num_spilled = self._num_spilled
+        with open(self._spill_filepath, encoding="utf-8") as spill_file:
+            for index, line in enumerate(spill_file):
+                if index >= num_spilled:
+                    break
+                if index < start:
+                    continue
+                record = json.loads(line)
+                feedback = self._utterance_feedbacks.get(record["utterance ID"])
+                if feedback is not None:
+                    record["utterance_feedback"] = feedback.feedback.value
+                yield record
@@ -2,17 +2,46 @@
 
 from __future__ import annotations
 
-import calendar
+import dataclasses
 import datetime
-from typing import TYPE_CHECKING, Any, Dict, List, Text
+import hashlib
+import json
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    Text,
+    Tuple,
+)
 
-from dialoguekit.core.annotated_utterance import AnnotatedUtterance
-from dialoguekit.core.feedback import UtteranceFeedback
+from dialoguekit.core.annotated_utterance import (
+    AnnotatedUtterance,
+    get_raw_annotations,
+    get_raw_dialogue_acts,
+    get_raw_metadata,
+)
+from dialoguekit.core.dialogue_act import (
+    get_raw_annotations as get_raw_da_annotations,
+)
+from dialoguekit.core.dialogue_view import DialogueView
+from dialoguekit.core.feedback import BinaryFeedback, UtteranceFeedback
+from dialoguekit.core.id_generator import generate_id
 from dialoguekit.participant import DialogueParticipant
 
 if TYPE_CHECKING:
     from dialoguekit.core.utterance import Utterance
 
+# Fields of the export format that end up in the metadata of utterances read
+# back from an export, and are not part of their content.
+_UNFINGERPRINTED_METADATA = frozenset(
+    ["utterance ID", "utterance_id", "utterance_feedback"]
+)
+
 
 class Dialogue:
     def __init__(
@@ -23,21 +52,60 @@ class Dialogue:
         Args:
             agent_id: Agent ID.
             user_id: User ID.
-            conversation_id: Conversation ID. Defaults to None.
+            conversation_id: Conversation ID. Defaults to None, i.e., a new
+              unique, time-sortable ID (see `dialoguekit.core.id_generator`).
         """
         self._agent_id = agent_id
         self._user_id = user_id
-        if conversation_id is None:
-            date = datetime.datetime.utcnow()
-            utc_time = calendar.timegm(date.utctimetuple())
-            self._conversation_id = (
-                f"{self._agent_id}-{self._user_id}-{str(utc_time)}"
-            )
-        else:
-            self._conversation_id = conversation_id
-        self._utterances: List[Utterance] = []
+        self._conversation_id = conversation_id or generate_id()
+        self._utterances: MutableSequence[Utterance] = []
         self._utterance_feedbacks: Dict[str, UtteranceFeedback] = {}
         self._metadata: Dict[str, Any] = {}
+        # Fingerprint hash of the participants and utterances.
+        self._fingerprint_digest: Optional[Any] = None
+        # Serialized utterances by position in the whole dialogue, with the
+        # utterance and the state they were serialized in.
+        self._records: Dict[int, Tuple[Utterance, Tuple, Dict[str, Any]]] = {}
+        # Set by from_records() until utterance IDs are first needed, with
+        # the feedback by utterance position.
+        self._pending_feedbacks: Optional[Dict[int, BinaryFeedback]] = None
+
+    @classmethod
+    def from_records(
+        cls,
+        agent_id: str,
+        user_id: str,
+        utterances: List[Utterance],
+        conversation_id: str = None,
+        feedbacks: Dict[int, BinaryFeedback] = None,
+        metadata: Dict[str, Any] = None,
+    ) -> Dialogue:
+        """Creates a dialogue from a list of utterances in one call.
+
+        This is the bulk alternative to calling `add_utterance()` and
+        `add_utterance_feedback()` for each utterance, e.g., when loading
+        exports. The list is taken over by the dialogue, not copied. Missing
+        utterance IDs are generated, and feedback is assigned to them, only
+        when utterance IDs are first needed: on access to `utterances`,
+        feedback or serialized utterances, or when an utterance is added.
+
+        Args:
+            agent_id: Agent ID.
+            user_id: User ID.
+            utterances: Utterances, in order.
+            conversation_id: Conversation ID. Defaults to None.
+            feedbacks: Feedback by utterance position. Defaults to None.
+            metadata: Metadata of the dialogue. Defaults to None.
+
+        Returns:
+            Dialogue.
+        """
+        dialogue = cls(agent_id, user_id, conversation_id)
+        dialogue._utterances = utterances
+        dialogue._pending_feedbacks = feedbacks or {}
+        if metadata:
+            dialogue._metadata = metadata
+        return dialogue
 
     def __str__(self) -> Text:
         return f"Dialogue(agent_id={self._agent_id}, user_id={self._user_id})"
@@ -46,19 +114,19 @@ class Dialogue:
         return f"Dialogue(agent_id={self._agent_id}, user_id={self._user_id})"
 
     def __eq__(self, _o: object) -> bool:
+        """Compares the participants and the utterances, in order."""
         if not isinstance(_o, Dialogue):
             return False
         if self._agent_id != _o._agent_id:
             return False
         if self._user_id != _o._user_id:
             return False
-        if len(self._utterances) != len(_o._utterances):
-            return False
-        for annotation in self._utterances:
-            if annotation not in _o._utterances:
-                return False
-
-        return True
+        self._assign_pending_ids()
+        _o._assign_pending_ids()
+        return len(self._utterances) == len(_o._utterances) and all(
+            utterance == other
+            for utterance, other in zip(self._utterances, _o._utterances)
+        )
 
     @property
     def conversation_id(self) -> str:
@@ -76,12 +144,56 @@ class Dialogue:
         return self._user_id
 
     @property
-    def utterances(self) -> List[Utterance]:
+    def utterances(self) -> MutableSequence[Utterance]:
         """Returns the utterances in the dialogue."""
+        self._assign_pending_ids()
         return self._utterances
 
+    def get_view(self, start: int = 0, stop: int = None) -> DialogueView:
+        """Returns a view of a range of the utterances, without copying them.
+
+        Args:
+            start: Position of the first utterance. Defaults to 0.
+            stop: Position after the last utterance. Defaults to None, i.e.,
+              the end of the dialogue.
+
+        Returns:
+            View of the utterances between start and stop, as in a slice.
+        """
+        return DialogueView(self, start, stop)
+
+    def get_last_n(self, last_n: int = None) -> DialogueView:
+        """Returns a view of the last utterances.
+
+        Args:
+            last_n: Number of utterances. Defaults to None, i.e., all.
+
+        Returns:
+            View of the last utterances.
+        """
+        if last_n is None:
+            return DialogueView(self)
+        return DialogueView(self, max(len(self._utterances) - last_n, 0))
+
+    def iter_windows(self, last_n: int) -> Iterator[DialogueView]:
+        """Iterates over the windows of the last utterances at every turn.
+
+        Creating a window takes constant time, so per-turn analysis over a
+        dialogue is linear in its length for a given window size.
+
+        Args:
+            last_n: Number of utterances per window.
+
+        Yields:
+            View of the last_n utterances up to and including each utterance,
+            in order.
+        """
+        for stop in range(1, len(self._utterances) + 1):
+            yield DialogueView(self, max(stop - last_n, 0), stop)
+
     def get_utterance_feedback(self, utterance_id: str) -> UtteranceFeedback:
         """Returns feedback on given utterance."""
+        self._assign_pending_ids()
         return self._utterance_feedbacks[utterance_id]
 
     @property
@@ -89,6 +201,41 @@ class Dialogue:
         """Returns the metadata of the dialogue."""
         return self._metadata
 
+    @property
+    def fingerprint(self) -> str:
+        """Returns a hash of the content of the dialogue.
+
+        The fingerprint covers the agent and user IDs, the metadata of the
+        dialogue and, for each utterance in order, the participant, text,
+        dialogue acts, annotations and metadata. Conversation and utterance
+        IDs, timestamps and feedback are left out, including the utterance IDs
+        and feedback read back into the metadata of exported utterances, so
+        copies of a dialogue saved under different conversation IDs have the
+        same fingerprint.
+
+        Metadata values that are not JSON types are encoded by content (see
+        `_encode_fingerprint_value()`), so fingerprints are the same across
+        runs. The hash of the utterances is cached until an utterance is
+        added; utterances modified in place after being added are not
+        accounted for.
+        """
+        if self._fingerprint_digest is None:
+            digest = self._get_fingerprint_digest()
+            for utterance in self._utterances:
+                _update_fingerprint_digest(digest, utterance)
+            self._fingerprint_digest = digest
+        digest = self._fingerprint_digest.copy()
+        digest.update(_dumps_fingerprint_content(self._metadata).encode())
+        return digest.hexdigest()
+
+    def _get_fingerprint_digest(self) -> Any:
+        """Returns the fingerprint hash, updated with the participant IDs."""
+        digest = hashlib.blake2b(digest_size=16)
+        for participant_id in [self._agent_id, self._user_id]:
+            digest.update(participant_id.encode())
+            digest.update(b"\n")
+        return digest
+
     @property
     def current_turn_id(self) -> int:
         """Returns the ID of the current utterance."""
@@ -100,17 +247,13 @@ class Dialogue:
         Args:
             utterance: An instance of Utterance.
         """
+        self._assign_pending_ids()
         if utterance.utterance_id is None:
-            utterance.utterance_id = "{}_{}_{}".format(
-                self.conversation_id,
-                (
-                    self.agent_id
-                    if utterance.participant is DialogueParticipant.AGENT
-                    else self.user_id
-                ),
-                self.current_turn_id,
+            utterance.utterance_id = self._get_utterance_id(
+                utterance, self.current_turn_id
             )
         self._utterances.append(utterance)
+        self._fingerprint_digest = None
 
     def add_utterance_feedback(
         self, utterance_feedback: UtteranceFeedback, utterance_id: str
@@ -123,11 +266,31 @@ class Dialogue:
             utterance_feedback: User's feedback.
             utterance_id: Utterance ID.
         """
+        self._assign_pending_ids()
         self._utterance_feedbacks[utterance_id] = utterance_feedback
 
-    def to_dict(self) -> Dict[str, Any]:
+    def clear(self) -> None:
+        """Removes all utterances and the feedback on them.
+
+        The conversation ID and the metadata of the dialogue are kept, and
+        utterances added afterwards start again from the first turn.
+        """
+        self._utterances.clear()
+        self._utterance_feedbacks.clear()
+        self._pending_feedbacks = None
+        self._records.clear()
+        self._fingerprint_digest = None
+
+    def to_dict(self, copy: bool = True) -> Dict[str, Any]:
         """Converts the dialogue to a dictionary.
 
+        Args:
+            copy: Whether the utterances are copies of the cached ones (see
+              `iter_serialized()`), so the dictionary may be modified freely.
+              Defaults to True. Otherwise, they are shared with the cache,
+              e.g., for dictionaries that are serialized and then discarded
+              such as exports, and must not be modified.
+
         Returns:
             Dialogue as dictionary.
         """
@@ -140,47 +303,270 @@ class Dialogue:
         if self._metadata:
             dialogue_as_dict["metadata"] = self._metadata
 
-        for utterance in self.utterances:
-            utterance_info: Dict[str, Any] = {
-                "participant": utterance.participant.name,
-                "utterance": utterance.text,
-                "utterance ID": utterance.utterance_id,
+        if copy:
+            dialogue_as_dict["conversation"].extend(
+                _copy_record(record) for record in self.iter_serialized()
+            )
+        else:
+            dialogue_as_dict["conversation"].extend(self.iter_serialized())
+        return dialogue_as_dict
+
+    def iter_serialized(self, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """Iterates over the utterances converted to dictionaries.
+
+        Converted utterances are cached, so only the utterances added since
+        the last call are converted, along with those that may have changed:
+        utterances whose text, participant or ID were reassigned, whose
+        feedback was added, or whose dialogue acts, annotations or metadata
+        were accessed (see `AnnotatedUtterance.revision`). The dictionaries
+        are shared with the cache and must not be modified; `to_dict()`
+        returns copies.
+
+        Args:
+            start: Position of the first utterance. Defaults to 0.
+
+        Yields:
+            Utterances as dictionaries, see `utterance_to_dict()`.
+        """
+        self._assign_pending_ids()
+        # Utterances no longer in memory (see BoundedDialogue) come first.
+        offset = self.current_turn_id - len(self._utterances)
+        for index in range(start, len(self._utterances)):
+            utterance = self._utterances[index]
+            state = (
+                utterance.text,
+                utterance.participant,
+                utterance.utterance_id,
+                (
+                    utterance.revision
+                    if isinstance(utterance, AnnotatedUtterance)
+                    else None
+                ),
+                self._utterance_feedbacks.get(utterance.utterance_id),
+            )
+            cached = self._records.get(offset + index)
+            if (
+                cached is None
+                or cached[0] is not utterance
+                or cached[1] != state
+            ):
+                cached = (utterance, state, self.utterance_to_dict(utterance))
+                self._records[offset + index] = cached
+            yield cached[2]
+
+    def utterance_to_dict(self, utterance: Utterance) -> Dict[str, Any]:
+        """Converts an utterance of the dialogue to a dictionary.
+
+        Args:
+            utterance: Utterance of the dialogue.
+
+        Returns:
+            Utterance as dictionary, including the feedback on it.
+        """
+        self._assign_pending_ids()
+        utterance_info: Dict[str, Any] = {
+            "participant": utterance.participant.name,
+            "utterance": utterance.text,
+            "utterance ID": utterance.utterance_id,
+        }
+
+        feedback = self._utterance_feedbacks.get(utterance.utterance_id)
+        if feedback is not None:
+            utterance_info["utterance_feedback"] = feedback.feedback.value
+
+        if isinstance(utterance, AnnotatedUtterance):
+            # The containers are read without creating them or changing the
+            # revision of the utterance.
+            dialogue_acts = list()
+            for da in get_raw_dialogue_acts(utterance) or []:
+                dialogue_acts.append(
+                    {
+                        "intent": (
+                            da.intent.label if da.intent is not None else ""
+                        ),
+                        "slot_values": [
+                            [
+                                annotation.slot,
+                                annotation.value,
+                                annotation.start,
+                                annotation.end,
+                            ]
+                            for annotation in get_raw_da_annotations(da) or []
+                        ],
+                    }
+                )
+            utterance_info["dialogue_acts"] = dialogue_acts
+
+            for k, v in (get_raw_metadata(utterance) or {}).items():
+                utterance_info[k] = v
+
+            annotations = get_raw_annotations(utterance)
+            if annotations:
+                key_values = []
+                for annotation in annotations:
+                    key_values.append([annotation.key, annotation.value])
+                utterance_info["annotations"] = key_values
+
+        return utterance_info
+
+    def _get_utterance_id(self, utterance: Utterance, turn_id: int) -> str:
+        """Returns the ID of an utterance without one.
+
+        IDs are unique as the conversation ID is, and grouped with the IDs of
+        the other utterances of the conversation.
+
+        Args:
+            utterance: Utterance.
+            turn_id: Position of the utterance in the dialogue.
+
+        Returns:
+            Utterance ID.
+        """
+        participant_id = (
+            self._agent_id
+            if utterance.participant is DialogueParticipant.AGENT
+            else self._user_id
+        )
+        return f"{self._conversation_id}_{participant_id}_{turn_id}"
+
+    def _assign_pending_ids(self) -> None:
+        """Generates the IDs and feedback left pending by from_records()."""
+        if self._pending_feedbacks is None:
+            return
+        feedbacks = self._pending_feedbacks
+        self._pending_feedbacks = None
+        for turn_id, utterance in enumerate(self._utterances):
+            if utterance.utterance_id is None:
+                utterance.utterance_id = self._get_utterance_id(
+                    utterance, turn_id
+                )
+        for position, feedback in feedbacks.items():
+            utterance_id = self._utterances[position].utterance_id
+            self._utterance_feedbacks[utterance_id] = UtteranceFeedback(
+                utterance_id=utterance_id, feedback=feedback
+            )
+
+
+def _copy_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Copies a cached utterance dictionary.
+
+    The dialogue acts, slot values and annotations are copied along with the
+    dictionary, as they are created when converting the utterance; metadata
+    values are the utterance's own and are not copied.
+
+    Args:
+        record: Utterance as dictionary, see `Dialogue.utterance_to_dict()`.
+
+    Returns:
+        Copy of the dictionary.
+    """
+    copied = dict(record)
+    dialogue_acts = copied.get("dialogue_acts")
+    if isinstance(dialogue_acts, list):
+        copied["dialogue_acts"] = [
+            {**da, "slot_values": [list(sv) for sv in da["slot_values"]]}
+            for da in dialogue_acts
+        ]
+    annotations = copied.get("annotations")
+    if isinstance(annotations, list):
+        copied["annotations"] = [list(annotation) for annotation in annotations]
+    return copied
+
+
+def _update_fingerprint_digest(digest: Any, utterance: Utterance) -> None:
+    """Updates a fingerprint hash with the content of an utterance.
+
+    Args:
+        digest: Fingerprint hash.
+        utterance: Utterance.
+    """
+    digest.update(_get_utterance_content(utterance).encode())
+    digest.update(b"\n")
+
+
+def _get_utterance_content(utterance: Utterance) -> str:
+    """Serializes the content of an utterance for fingerprinting.
+
+    Args:
+        utterance: Utterance.
+
+    Returns:
+        Single-line JSON string with the participant, text, dialogue acts,
+        annotations and metadata of the utterance, without the metadata
+        fields holding its ID or feedback.
+    """
+    content: List[Any] = [utterance.participant.name, utterance.text]
+    if isinstance(utterance, AnnotatedUtterance):
+        content.append(
+            [
+                [
+                    da.intent.label if da.intent is not None else None,
+                    [
+                        [a.slot, a.value, a.start, a.end]
+                        for a in get_raw_da_annotations(da) or []
+                    ],
+                ]
+                for da in get_raw_dialogue_acts(utterance) or []
+            ]
+        )
+        content.append(
+            [[a.key, a.value] for a in get_raw_annotations(utterance) or []]
+        )
+        content.append(
+            {
+                key: value
+                for key, value in (get_raw_metadata(utterance) or {}).items()
+                if key not in _UNFINGERPRINTED_METADATA
             }
+        )
+    return _dumps_fingerprint_content(content)
 
-            feedback = self._utterance_feedbacks.get(utterance.utterance_id)
-            if feedback is not None:
-                utterance_info["utterance_feedback"] = feedback.feedback.value
-
-            if isinstance(utterance, AnnotatedUtterance):
-                dialogue_acts = list()
-                for da in utterance.dialogue_acts:
-                    dialogue_acts.append(
-                        {
-                            "intent": (
-                                da.intent.label if da.intent is not None else ""
-                            ),
-                            "slot_values": [
-                                [
-                                    annotation.slot,
-                                    annotation.value,
-                                    annotation.start,
-                                    annotation.end,
-                                ]
-                                for annotation in da.annotations
-                            ],
-                        }
-                    )
-                utterance_info["dialogue_acts"] = dialogue_acts
-
-                for k, v in utterance.metadata.items():
-                    utterance_info[k] = v
-
-                annotations = utterance.annotations
-                if annotations:
-                    key_values = []
-                    for annotation in annotations:
-                        key_values.append([annotation.key, annotation.value])
-                    utterance_info["annotations"] = key_values
-
-            dialogue_as_dict["conversation"].append(utterance_info)
-        return dialogue_as_dict
+
+def _dumps_fingerprint_content(content: Any) -> str:
+    """Serializes content for fingerprinting.
+
+    Args:
+        content: Content, with values of any type.
+
+    Returns:
+        Single-line JSON string, with sorted keys.
+    """
+    return json.dumps(
+        content, sort_keys=True, default=_encode_fingerprint_value
+    )
+
+
+def _encode_fingerprint_value(value: Any) -> Any:
+    """Encodes a value that is not a JSON type for fingerprinting.
+
+    Unlike `str()`, which may include the address of an object, the encoding
+    only depends on the content of the value, so it is the same across runs.
+
+    Args:
+        value: Value that JSON cannot encode.
+
+    Returns:
+        Dates and times in ISO format, sets as sorted lists, arrays as lists,
+        and enumeration members, dataclasses and other objects as
+        dictionaries of their type name and their name or attributes.
+    """
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(_dumps_fingerprint_content(item) for item in value)
+    type_name = f"{type(value).__module__}.{type(value).__qualname__}"
+    if isinstance(value, Enum):
+        return {"__type__": type_name, "name": value.name}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            "__type__": type_name,
+            **{
+                field.name: getattr(value, field.name)
+                for field in dataclasses.fields(value)
+            },
+        }
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "__dict__"):
+        return {"__type__": type_name, **vars(value)}
+    return {"__type__": type_name}
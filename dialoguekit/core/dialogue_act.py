@@ -24,14 +24,22 @@ from dataclasses import dataclass, field
 from typing import List
 
 from dialoguekit.core.intent import Intent
+from dialoguekit.core.lazy_container import install_lazy_container
 from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
 
 
-@dataclass(eq=True, unsafe_hash=True)
+@dataclass(eq=True, unsafe_hash=True, slots=True)
 class DialogueAct:
-    """Represents a dialogue act that is an intent and its annotations."""
+    """Represents a dialogue act that is an intent and its annotations.
+
+    The list of annotations is created on first access, so dialogue acts
+    without annotations do not hold an empty list.
+    """
 
     intent: Intent = field(default=None, hash=True)
     annotations: List[SlotValueAnnotation] = field(
-        default_factory=list, compare=True, hash=False
+        default=None, compare=True, hash=False
     )
+
+
+get_raw_annotations = install_lazy_container(DialogueAct, "annotations", list)
@@ -0,0 +1,125 @@
+"""Interface representing a range of the utterances in a dialogue.
+
+A DialogueView refers to the utterances of a dialogue between two positions
+without copying them, so that windows over a dialogue (e.g., the last n
+utterances at every turn) can be created in constant time.
+"""
+
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Iterator,
+    List,
+    Sequence,
+    Text,
+    Union,
+    overload,
+)
+
+if TYPE_CHECKING:
+    from dialoguekit.core.dialogue import Dialogue
+    from dialoguekit.core.utterance import Utterance
+
+
+class DialogueView(Sequence["Utterance"]):
+    def __init__(
+        self, dialogue: Dialogue, start: int = 0, stop: int = None
+    ) -> None:
+        """Represents a range of the utterances in a dialogue.
+
+        Positions are interpreted as slice indices of the dialogue's
+        utterances when the view is created; utterances added to the dialogue
+        afterwards are not part of the view.
+
+        Args:
+            dialogue: Dialogue.
+            start: Position of the first utterance. Defaults to 0.
+            stop: Position after the last utterance. Defaults to None, i.e.,
+              the end of the dialogue.
+        """
+        self._dialogue = dialogue
+        self._start, self._stop, _ = slice(start, stop).indices(
+            len(dialogue.utterances)
+        )
+        self._stop = max(self._start, self._stop)
+
+    def __repr__(self) -> Text:
+        return (
+            f"DialogueView(conversation_id={self._dialogue.conversation_id}, "
+            f"start={self._start}, stop={self._stop})"
+        )
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> Utterance:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> DialogueView:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Utterance, DialogueView]:
+        """Returns an utterance, or a view of a range of the view.
+
+        Args:
+            index: Position in the view, or slice with a step of 1.
+
+        Raises:
+            IndexError: If the position is out of the view.
+            ValueError: If the slice has a step other than 1.
+
+        Returns:
+            Utterance, or view.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Dialogue views do not support steps")
+            return DialogueView(
+                self._dialogue, self._start + start, self._start + stop
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Dialogue view index out of range")
+        return self._dialogue.utterances[self._start + index]
+
+    def __iter__(self) -> Iterator[Utterance]:
+        utterances = self._dialogue.utterances
+        for index in range(self._start, self._stop):
+            yield utterances[index]
+
+    @property
+    def dialogue(self) -> Dialogue:
+        """Returns the dialogue."""
+        return self._dialogue
+
+    @property
+    def start(self) -> int:
+        """Returns the position of the first utterance in the dialogue."""
+        return self._start
+
+    @property
+    def stop(self) -> int:
+        """Returns the position after the last utterance in the dialogue."""
+        return self._stop
+
+    def get_texts(self) -> List[str]:
+        """Returns the texts of the utterances."""
+        return [utterance.text for utterance in self]
+
+    def get_text(self, separator: str = " .") -> str:
+        """Returns the texts of the utterances joined together.
+
+        Args:
+            separator: Separator between the texts. Defaults to ' .'.
+
+        Returns:
+            Concatenated text.
+        """
+        return separator.join(utterance.text for utterance in self)
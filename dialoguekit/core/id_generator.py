@@ -0,0 +1,123 @@
+"""Generation of unique, time-sortable IDs.
+
+IDs are 128-bit values made of a 48-bit timestamp in milliseconds followed by
+80 random bits, encoded as 26 characters in Crockford's base32 (as ULIDs).
+Their lexicographic order is thus their chronological order, so that recent
+IDs are adjacent in indexed stores and time ranges can be scanned with
+`get_min_id()`.
+
+Within a process, IDs are strictly increasing: IDs generated in the same
+millisecond increment the random bits of the previous one. The generator is
+thread-safe, and reseeded in child processes after a fork, so that processes
+draw independent random bits.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+_ENCODING = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODING = {char: value for value, char in enumerate(_ENCODING)}
+_ID_LENGTH = 26
+_RANDOM_BITS = 80
+_MAX_RANDOM = (1 << _RANDOM_BITS) - 1
+
+
+class IdGenerator:
+    def __init__(self) -> None:
+        """Generates unique, time-sortable IDs."""
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._random = 0
+
+    def generate(self) -> str:
+        """Returns a new ID, greater than the IDs generated before."""
+        now_ms = time.time_ns() // 1_000_000
+        with self._lock:
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._random = int.from_bytes(os.urandom(10), "big")
+            elif self._random < _MAX_RANDOM:
+                # Same millisecond, or the clock went back.
+                self._random += 1
+            else:
+                self._last_ms += 1
+                self._random = int.from_bytes(os.urandom(10), "big")
+            value = (self._last_ms << _RANDOM_BITS) | self._random
+        return _encode(value)
+
+    def _reset(self) -> None:
+        """Forgets the last ID, e.g., in a child process after a fork."""
+        self._lock = threading.Lock()
+        self._last_ms = -1
+
+
+_generator = IdGenerator()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_generator._reset)
+
+
+def generate_id() -> str:
+    """Returns a new unique, time-sortable ID.
+
+    Returns:
+        26-character ID.
+    """
+    return _generator.generate()
+
+
+def get_id_timestamp(id: str) -> datetime:
+    """Returns the time an ID was generated at.
+
+    Args:
+        id: ID returned by `generate_id()`.
+
+    Raises:
+        ValueError: If the ID is not a valid ID.
+
+    Returns:
+        Generation time, in UTC, with millisecond precision.
+    """
+    if len(id) != _ID_LENGTH:
+        raise ValueError(f"Invalid ID: {id}")
+    try:
+        value = 0
+        for char in id.upper():
+            value = (value << 5) | _DECODING[char]
+    except KeyError:
+        raise ValueError(f"Invalid ID: {id}")
+    return datetime.fromtimestamp(
+        (value >> _RANDOM_BITS) / 1000, tz=timezone.utc
+    )
+
+
+def get_min_id(timestamp: datetime) -> str:
+    """Returns the smallest ID that can be generated at a given time.
+
+    IDs generated at or after the given time are greater than or equal to it,
+    e.g., for range scans over IDs in an indexed store.
+
+    Args:
+        timestamp: Time. Naive datetimes are taken as local time.
+
+    Returns:
+        26-character ID.
+    """
+    return _encode(int(timestamp.timestamp() * 1000) << _RANDOM_BITS)
+
+
+def _encode(value: int) -> str:
+    """Encodes a 128-bit value in base32.
+
+    Args:
+        value: Value.
+
+    Returns:
+        26-character encoding.
+    """
+    chars = []
+    for _ in range(_ID_LENGTH):
+        chars.append(_ENCODING[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
@@ -1,7 +1,7 @@
 """Interface representing an intent."""
 
-
-from typing import Any, List, Optional, Text, Union
+import copy
+from typing import Any, Dict, List, Optional, Text, Tuple, Union
 
 
 class Intent:
@@ -20,6 +20,9 @@ class Intent:
             self._main_intent._add_sub_intent(sub_intent=self)
 
         self._sub_intents: List[Any] = []
+        # Set for canonical intents, see IntentRegistry.
+        self._registry: Any = None
+        self._id: Optional[int] = None
 
     def __str__(self) -> Text:
         return self._label
@@ -30,10 +33,30 @@ class Intent:
     def __hash__(self) -> int:
         return hash(self._label)
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Intent":
+        """Copies the intent; canonical intents are not copied."""
+        if self._registry is not None:
+            return self
+        intent = Intent.__new__(Intent)
+        memo[id(self)] = intent
+        intent.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return intent
+
+    def __reduce__(self) -> Union[str, Tuple[Any, ...]]:
+        """Pickles canonical intents as a lookup in their registry."""
+        if self._registry is not None:
+            return self._registry.get_intent, (self._label, self._main_intent)
+        return super().__reduce__()
+
     def __eq__(self, __o: object) -> bool:
         """Comparison function."""
+        if self is __o:
+            return True
         if not isinstance(__o, Intent):
             return False
+        if self._registry is not None and self._registry is __o._registry:
+            # Canonical intents of a registry are unique per label.
+            return False
         if self._label != __o._label:
             return False
         if self._main_intent != __o._main_intent:
@@ -49,6 +72,11 @@ class Intent:
         """Returns the Intent label."""
         return self._label
 
+    @property
+    def id(self) -> Optional[int]:
+        """Returns the ID of a canonical intent, None for other intents."""
+        return self._id
+
     @property
     def main_intent(self) -> Union[Any, None]:
         """Returns the main intent."""
@@ -0,0 +1,203 @@
+"""Registry of canonical intents.
+
+The registry interns intents: it holds one canonical Intent per label, which
+is returned every time the label is requested. Canonical intents are
+identified by small integers, assigned in order of registration, and the
+registry keeps the IDs of the ancestors and descendants of each intent, as
+given by their main intents. Comparing canonical intents and testing their
+hierarchy thus take constant time, and sequences of intents can be processed
+as arrays of IDs.
+
+Intents read from dialogues are interned in the default registry, see
+`get_default_registry()`.
+"""
+
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+from dialoguekit.core.intent import Intent
+
+
+class IntentRegistry:
+    def __init__(self) -> None:
+        """Initializes an empty intent registry."""
+        self._intents: List[Intent] = []
+        self._ids: Dict[str, int] = {}
+        self._ancestor_ids: List[FrozenSet[int]] = []
+        self._descendant_ids: List[FrozenSet[int]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._intents)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._ids
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickles the default registry as a reference to it.
+
+        Raises:
+            TypeError: If the registry is not the default one.
+        """
+        if self is not _default_registry:
+            raise TypeError("Only the default intent registry can be pickled")
+        return get_default_registry, ()
+
+    def get_intent(self, label: str, main_intent: Intent = None) -> Intent:
+        """Returns the canonical intent of a label, registering it if needed.
+
+        Args:
+            label: Intent label.
+            main_intent: Main intent, for registering a sub-intent. It is
+              replaced by its canonical intent. Defaults to None.
+
+        Raises:
+            ValueError: If the label is registered with a different main
+              intent.
+
+        Returns:
+            Canonical intent.
+        """
+        intent_id = self._ids.get(label)
+        if intent_id is None:
+            if main_intent is not None:
+                main_intent = self.get_intent(
+                    main_intent.label, main_intent.main_intent
+                )
+            with self._lock:
+                intent_id = self._ids.get(label)
+                if intent_id is None:
+                    intent_id = self._register(label, main_intent)
+        intent = self._intents[intent_id]
+        if main_intent is not None and (
+            intent.main_intent is None
+            or intent.main_intent.label != main_intent.label
+        ):
+            raise ValueError(
+                f"Intent {label} is registered with main intent "
+                f"{intent.main_intent}, not {main_intent}"
+            )
+        return intent
+
+    def get_intent_by_id(self, intent_id: int) -> Intent:
+        """Returns a canonical intent given its ID.
+
+        Args:
+            intent_id: Intent ID.
+
+        Returns:
+            Canonical intent.
+        """
+        return self._intents[intent_id]
+
+    def get_id(self, intent: Intent) -> int:
+        """Returns the ID of an intent, registering it if needed.
+
+        Args:
+            intent: Intent, canonical or not.
+
+        Returns:
+            Intent ID.
+        """
+        if intent._registry is self:
+            return intent._id
+        return self.get_intent(intent.label, intent.main_intent)._id
+
+    def get_ids(self, intents: Iterable[Intent]) -> List[int]:
+        """Returns the IDs of intents, registering them if needed.
+
+        Args:
+            intents: Intents, canonical or not.
+
+        Returns:
+            Intent IDs, e.g., to be processed as an array.
+        """
+        return [self.get_id(intent) for intent in intents]
+
+    def get_ancestor_ids(self, intent: Intent) -> FrozenSet[int]:
+        """Returns the IDs of the main intents above an intent.
+
+        Args:
+            intent: Intent, canonical or not.
+
+        Returns:
+            IDs of the intent's main intent, its main intent, and so on.
+        """
+        return self._ancestor_ids[self.get_id(intent)]
+
+    def get_descendant_ids(self, intent: Intent) -> FrozenSet[int]:
+        """Returns the IDs of the sub-intents below an intent.
+
+        Args:
+            intent: Intent, canonical or not.
+
+        Returns:
+            IDs of the intent's sub-intents, their sub-intents, and so on.
+        """
+        return self._descendant_ids[self.get_id(intent)]
+
+    def is_sub_intent(self, intent: Intent, main_intent: Intent) -> bool:
+        """Checks whether an intent is below another in the hierarchy.
+
+        Args:
+            intent: Intent, canonical or not.
+            main_intent: Intent, canonical or not.
+
+        Returns:
+            True if main_intent is an ancestor of intent.
+        """
+        return self.get_id(main_intent) in self.get_ancestor_ids(intent)
+
+    def _register(self, label: str, main_intent: Intent = None) -> int:
+        """Registers a new canonical intent.
+
+        Must be called holding the lock, with a canonical main intent.
+
+        Args:
+            label: Intent label.
+            main_intent: Canonical main intent. Defaults to None.
+
+        Returns:
+            ID of the new intent.
+        """
+        intent_id = len(self._intents)
+        intent = Intent(label, main_intent)
+        intent._registry = self
+        intent._id = intent_id
+        ancestor_ids: FrozenSet[int] = frozenset()
+        if main_intent is not None:
+            ancestor_ids = self._ancestor_ids[main_intent._id] | {
+                main_intent._id
+            }
+            # Rebuilt on registration, so that lookups return stored sets.
+            for ancestor_id in ancestor_ids:
+                self._descendant_ids[ancestor_id] = self._descendant_ids[
+                    ancestor_id
+                ] | {intent_id}
+        self._ancestor_ids.append(ancestor_ids)
+        self._descendant_ids.append(frozenset())
+        # The intent is published last, so that lookups without the lock see
+        # complete entries.
+        self._intents.append(intent)
+        self._ids[label] = intent_id
+        return intent_id
+
+
+_default_registry = IntentRegistry()
+
+
+def get_default_registry() -> IntentRegistry:
+    """Returns the default intent registry."""
+    return _default_registry
+
+
+def intern_intent(label: str) -> Intent:
+    """Returns the canonical intent of a label in the default registry.
+
+    Args:
+        label: Intent label.
+
+    Returns:
+        Canonical intent.
+    """
+    return _default_registry.get_intent(label)
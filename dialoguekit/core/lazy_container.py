@@ -0,0 +1,70 @@
+"""Lazily created containers for slotted dataclasses.
+
+Container fields (lists and dictionaries) of the core dataclasses are empty for
+most instances, e.g., dialogue acts without slot-value annotations. Such fields
+default to None and the container is only created, and stored, the first time
+the field is read. Readers thus always get a container they can modify in
+place, while instances whose fields are never read hold no container at all.
+
+An empty field may also be loaded from elsewhere on first read, e.g., decoded
+from the raw record an instance was created from.
+"""
+
+from typing import Any, Callable, Type
+
+
+def install_lazy_container(
+    cls: Type,
+    name: str,
+    factory: Callable[[], Any],
+    on_access: Callable[[Any], None] = None,
+    load: Callable[[Any, str], Any] = None,
+) -> Callable[[Any], Any]:
+    """Makes a slot of a dataclass create its container on first read.
+
+    The slot is wrapped in a property of the same name, so the dataclass
+    generated methods (e.g., `__init__()`) keep working.
+
+    Args:
+        cls: Slotted dataclass.
+        name: Name of the field.
+        factory: Function creating an empty container, e.g., list.
+        on_access: Function called with the instance whenever the field is
+          read or assigned, i.e., whenever the container may be modified.
+          Defaults to None.
+        load: Function called with the instance and the name of the field
+          when the slot is empty, returning the container to store in it, or
+          None if there is nothing to load. Defaults to None.
+
+    Returns:
+        Function returning the value stored in the slot of an instance, loaded
+        if needed, None if the container has not been created yet.
+    """
+    slot = cls.__dict__[name]
+
+    def get_raw(self: Any) -> Any:
+        container = slot.__get__(self, cls)
+        if container is None and load is not None:
+            container = load(self, name)
+            if container is not None:
+                slot.__set__(self, container)
+        return container
+
+    def get_container(self: Any) -> Any:
+        if on_access is not None:
+            on_access(self)
+        container = get_raw(self)
+        if container is None:
+            container = factory()
+            slot.__set__(self, container)
+        return container
+
+    def set_container(self: Any, container: Any) -> None:
+        if on_access is not None:
+            on_access(self)
+        slot.__set__(self, container)
+
+    setattr(cls, name, property(get_container, set_container))
+    if load is None:
+        return lambda instance: slot.__get__(instance, cls)
+    return get_raw
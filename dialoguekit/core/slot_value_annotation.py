@@ -6,7 +6,7 @@ from typing import Optional
 from dialoguekit.core.annotation import Annotation
 
 
-@dataclass(eq=True, unsafe_hash=True)
+@dataclass(eq=True, unsafe_hash=True, slots=True)
 class SlotValueAnnotation(Annotation):
     """Represents slot-value annotation."""
 
@@ -30,7 +30,8 @@ class SlotValueAnnotation(Annotation):
               None.
             end: End index of the slot value in the utterance. Defaults to None.
         """
-        super().__init__(key=slot, value=value)
+        # The slotted class replaces the one super() would refer to.
+        Annotation.__init__(self, key=slot, value=value)
         self.slot = slot
         self.start = start
         self.end = end
@@ -10,7 +10,7 @@ if TYPE_CHECKING:
     from dialoguekit.participant import DialogueParticipant
 
 
-@dataclass(eq=True, unsafe_hash=True)
+@dataclass(eq=True, unsafe_hash=True, slots=True)
 class Utterance:
     """Represents an utterance."""
 
@@ -9,7 +9,7 @@ from typing import DefaultDict, Dict, List, Optional, Set, Union
 from dialoguekit.core.annotated_utterance import AnnotatedUtterance
 from dialoguekit.core.annotation import Annotation
 from dialoguekit.core.dialogue_act import DialogueAct
-from dialoguekit.core.intent import Intent
+from dialoguekit.core.intent_registry import intern_intent
 from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
 from dialoguekit.nlu.models.satisfaction_classifier import (
     SatisfactionClassifier,
@@ -138,7 +138,7 @@ def extract_utterance_template(  # noqa: C901
                 dialogue_acts = []
                 for da in utterance_record.get(_FIELD_DIALOGUE_ACTS, []):
                     intent = (
-                        Intent(da.get(_FIELD_INTENT, None))
+                        intern_intent(da.get(_FIELD_INTENT))
                         if da.get(_FIELD_INTENT, None)
                         else None
                     )
@@ -11,6 +11,7 @@ from typing import List, Optional, Union
 from joblib import load
 
 from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.core.dialogue_view import DialogueView
 
 _SATISFACTION_CLASSIFIER_MODEL_PATH = "LinearSVC_2_0.joblib"
 _SATISFACTION_TOKENIZER_PATH = "vectorizer_2_0.joblib"
@@ -136,13 +137,34 @@ class SatisfactionClassifierSVM(SatisfactionClassifier):
         Returns:
             Classification score.
         """
-        if last_n is None:
-            last_n = len(dialogue.utterances)
-
-        complete_dialogue_text = " .".join(
-            [
-                annotated_utterance.text
-                for annotated_utterance in dialogue.utterances[-last_n:]
-            ]
-        )
-        return int(self._tokenize_predict([complete_dialogue_text])[0])
+        return self.classify_view(dialogue.get_last_n(last_n or None))
+
+    def classify_view(self, view: DialogueView) -> int:
+        """Classifies a range of the utterances of a dialogue.
+
+        Args:
+            view: View of the utterances to use for classification, e.g., a
+              window from `Dialogue.iter_windows()`.
+
+        Returns:
+            Classification score.
+        """
+        return int(self._tokenize_predict([view.get_text(" .")])[0])
+
+    def classify_windows(self, dialogue: Dialogue, last_n: int) -> List[int]:
+        """Classifies the last n utterances at every turn of a dialogue.
+
+        The windows are classified in a single batch.
+
+        Args:
+            dialogue: Dialogue object to classify.
+            last_n: Number of the last utterances to use for each
+              classification.
+
+        Returns:
+            Classification score after each utterance.
+        """
+        texts = [view.get_text(" .") for view in dialogue.iter_windows(last_n)]
+        if not texts:
+            return []
+        return [int(score) for score in self._tokenize_predict(texts)]
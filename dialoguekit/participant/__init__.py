@@ -1,13 +1,18 @@
 """Participant init."""
 from dialoguekit.participant.agent import Agent
+from dialoguekit.participant.async_agent import AsyncAgent, SyncAgentAdapter
+from dialoguekit.participant.async_user import AsyncUser
 from dialoguekit.participant.participant import DialogueParticipant, Participant
 from dialoguekit.participant.user import User
 from dialoguekit.participant.user_preferences import UserPreferences
 
 __all__ = [
     "Agent",
+    "AsyncAgent",
+    "AsyncUser",
     "DialogueParticipant",
     "Participant",
+    "SyncAgentAdapter",
     "User",
     "UserPreferences",
 ]
@@ -12,7 +12,11 @@ from abc import abstractmethod
 from enum import Enum
 
 from dialoguekit.core.intent import Intent
-from dialoguekit.participant.participant import DialogueParticipant, Participant
+from dialoguekit.participant.participant import (
+    BaseParticipant,
+    DialogueParticipant,
+    Participant,
+)
 
 
 class AgentType(Enum):
@@ -22,14 +26,14 @@ class AgentType(Enum):
     WOZ = 1
 
 
-class Agent(Participant):
+class BaseAgent(BaseParticipant):
     def __init__(
         self,
         id: str,
         agent_type: AgentType = AgentType.BOT,
         stop_intent: Intent = Intent("EXIT"),
     ) -> None:
-        """Represents an agent.
+        """Represents the state shared by agents and asynchronous agents.
 
         Args:
             id: Agent ID.
@@ -45,6 +49,10 @@ class Agent(Participant):
         """Returns the agent's stop intent."""
         return self._stop_intent
 
+
+class Agent(BaseAgent, Participant):
+    """Represents an agent."""
+
     @abstractmethod
     def welcome(self) -> None:
         """Sends the agent's welcome message.
@@ -0,0 +1,156 @@
+"""Interface defining asynchronous agent functionality.
+
+Asynchronous agents are connected with an AsyncDialogueConnector and await its
+`register_agent_utterance()`, so that agents waiting on I/O (e.g., HTTP
+requests to a remote service) do not block the event loop serving other
+conversations.
+
+Synchronous agents are used with an AsyncDialogueConnector through the
+SyncAgentAdapter, which runs them in an executor.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+from abc import abstractmethod
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+from dialoguekit.participant.agent import Agent, BaseAgent
+
+if TYPE_CHECKING:
+    from dialoguekit.connector.async_dialogue_connector import (
+        AsyncDialogueConnector,
+    )
+    from dialoguekit.core.utterance import Utterance
+
+
+class AsyncAgent(BaseAgent):
+    """Represents an agent, connected with an AsyncDialogueConnector."""
+
+    _dialogue_connector: AsyncDialogueConnector
+
+    @abstractmethod
+    async def welcome(self) -> None:
+        """Sends the agent's welcome message.
+
+        Raises:
+            NotImplementedError: If not implemented in derived class.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def goodbye(self) -> None:
+        """Sends the agent's goodbye message.
+
+        Raises:
+            NotImplementedError: If not implemented in derived class.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def receive_utterance(self, utterance: Utterance) -> None:
+        """Responds to the user with an utterance.
+
+        Args:
+            utterance: The user's utterance.
+
+        Raises:
+            NotImplementedError: If not implemented in derived class.
+        """
+        raise NotImplementedError
+
+
+class SyncAgentAdapter(AsyncAgent):
+    def __init__(self, agent: Agent, executor: Executor = None) -> None:
+        """Represents a synchronous agent adapted to the asynchronous API.
+
+        The methods of the agent are run in an executor. The utterances it
+        registers, and any other coroutine method of the connector it calls
+        (e.g., `close()`), are collected while doing so and awaited on the
+        asynchronous connector, in order, once the method returns.
+
+        Args:
+            agent: Synchronous agent.
+            executor: Executor to run the agent in. Defaults to None, i.e., the
+              default executor of the event loop.
+        """
+        super().__init__(
+            id=agent.id,
+            agent_type=agent._agent_type,
+            stop_intent=agent.stop_intent,
+        )
+        self._agent = agent
+        self._executor = executor
+
+    @property
+    def agent(self) -> Agent:
+        """Returns the adapted agent."""
+        return self._agent
+
+    def to_dict(self) -> Dict[str, str]:
+        """Returns the adapted agent as a dictionary.
+
+        Returns:
+            A dictionary representation of the adapted agent.
+        """
+        return self._agent.to_dict()
+
+    async def welcome(self) -> None:
+        """Sends the agent's welcome message."""
+        await self._run(self._agent.welcome)
+
+    async def goodbye(self) -> None:
+        """Sends the agent's goodbye message."""
+        await self._run(self._agent.goodbye)
+
+    async def receive_utterance(self, utterance: Utterance) -> None:
+        """Responds to the user with an utterance.
+
+        Args:
+            utterance: The user's utterance.
+        """
+        await self._run(self._agent.receive_utterance, utterance)
+
+    async def _run(self, method: Callable[..., None], *args: Any) -> None:
+        """Runs a method of the agent and awaits the calls it made.
+
+        Args:
+            method: Method of the adapted agent.
+            *args: Arguments of the method.
+        """
+        collector = _UtteranceCollector(self._dialogue_connector)
+        self._agent.connect_dialogue_connector(collector)  # type: ignore
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(method, *args)
+        )
+        for name, call_args, call_kwargs in collector.calls:
+            await getattr(self._dialogue_connector, name)(
+                *call_args, **call_kwargs
+            )
+
+
+class _UtteranceCollector:
+    def __init__(self, dialogue_connector: AsyncDialogueConnector) -> None:
+        """Stands in for the connector of a synchronous agent.
+
+        Calls to the coroutine methods of the connector, e.g., registering an
+        utterance, are collected instead of being handled right away, so that
+        they are awaited by the adapter; any other attribute is looked up on
+        the connector.
+
+        Args:
+            dialogue_connector: The asynchronous connector.
+        """
+        self._dialogue_connector = dialogue_connector
+        self.calls: List[Tuple[str, Tuple[Any, ...], Dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._dialogue_connector, name)
+        if not asyncio.iscoroutinefunction(attribute):
+            return attribute
+
+        def collect(*args: Any, **kwargs: Any) -> None:
+            self.calls.append((name, args, kwargs))
+
+        return collect
@@ -0,0 +1,40 @@
+"""Asynchronous representation of a user.
+
+For communicating with an asynchronous agent, the user needs to be connected
+with an AsyncDialogueConnector.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from dialoguekit.participant.user import BaseUser
+
+if TYPE_CHECKING:
+    from dialoguekit.connector.async_dialogue_connector import (
+        AsyncDialogueConnector,
+    )
+    from dialoguekit.core.utterance import Utterance
+
+
+class AsyncUser(BaseUser):
+    """Represents a user, connected with an AsyncDialogueConnector."""
+
+    _dialogue_connector: AsyncDialogueConnector
+
+    async def handle_input(self, text: str) -> None:
+        """Gets called every time there is a new user input.
+
+        Args:
+            text: User input.
+        """
+        utterance = self._take_input(text)
+        if utterance is not None:
+            await self._dialogue_connector.register_user_utterance(utterance)
+
+    async def receive_utterance(self, utterance: Utterance) -> None:
+        """Gets called every time there is a new agent utterance.
+
+        Args:
+            utterance: Agent utterance.
+        """
+        self._ready_for_input = True
@@ -6,7 +6,10 @@ from enum import Enum
 from typing import TYPE_CHECKING, Dict
 
 if TYPE_CHECKING:
-    from dialoguekit.connector.dialogue_connector import DialogueConnector
+    from dialoguekit.connector.dialogue_connector import (
+        BaseDialogueConnector,
+        DialogueConnector,
+    )
     from dialoguekit.core import Utterance
 
 
@@ -17,11 +20,13 @@ class DialogueParticipant(Enum):
     USER = 1
 
 
-class Participant(ABC):
+class BaseParticipant(ABC):
     def __init__(self, id: str, type: DialogueParticipant) -> None:
-        """Represents a participant.
+        """Represents the state shared by participants.
 
-        Both agents and users are participants.
+        It is the base of both the synchronous participants and their
+        asynchronous counterparts, which differ in how they receive
+        utterances.
 
         Args:
             id: Participant's ID.
@@ -29,7 +34,7 @@ class Participant(ABC):
         """
         self._id = id
         self._type = type
-        self._dialogue_connector: DialogueConnector = None
+        self._dialogue_connector: BaseDialogueConnector = None
 
     @property
     def id(self):
@@ -37,11 +42,11 @@ class Participant(ABC):
         return self._id
 
     @property
-    def dialogue_connector(self) -> DialogueConnector:
+    def dialogue_connector(self) -> BaseDialogueConnector:
         """Returns the DialogueConnector instance for the participant.
 
         Returns:
-            A DialogueConnector instance.
+            A DialogueConnector, or AsyncDialogueConnector, instance.
         """
         return self._dialogue_connector
 
@@ -54,15 +59,34 @@ class Participant(ABC):
         return {"id": str(self._id), "type": str(self._type.name)}
 
     def connect_dialogue_connector(
-        self, dialogue_connector: DialogueConnector
+        self, dialogue_connector: BaseDialogueConnector
     ) -> None:
         """Connects the DialogueConnector instance for the participant.
 
         Args:
-            dialogue_connector: A DialogueConnector instance.
+            dialogue_connector: A DialogueConnector, or AsyncDialogueConnector,
+              instance.
         """
         self._dialogue_connector = dialogue_connector
 
+
+class Participant(BaseParticipant):
+    """Represents a participant.
+
+    Both agents and users are participants.
+    """
+
+    _dialogue_connector: DialogueConnector
+
+    @property
+    def dialogue_connector(self) -> DialogueConnector:
+        """Returns the DialogueConnector instance for the participant.
+
+        Returns:
+            A DialogueConnector instance.
+        """
+        return self._dialogue_connector
+
     @abstractmethod
     def receive_utterance(self, utterance: Utterance) -> None:
         """Responds to the other participant with an utterance.
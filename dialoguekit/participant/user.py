@@ -6,10 +6,14 @@ connected with a DialogueConnector by invoking `register_dialogue_connector()`.
 from __future__ import annotations
 
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from dialoguekit.core.annotated_utterance import AnnotatedUtterance
-from dialoguekit.participant.participant import DialogueParticipant, Participant
+from dialoguekit.participant.participant import (
+    BaseParticipant,
+    DialogueParticipant,
+    Participant,
+)
 
 if TYPE_CHECKING:
     from dialoguekit.core.utterance import Utterance
@@ -22,9 +26,9 @@ class UserType(Enum):
     SIMULATOR = 1
 
 
-class User(Participant):
+class BaseUser(BaseParticipant):
     def __init__(self, id: str, user_type: UserType = UserType.HUMAN) -> None:
-        """Represents a user.
+        """Represents the state shared by users and asynchronous users.
 
         Args:
             id: User ID.
@@ -39,17 +43,32 @@ class User(Participant):
         """Returns whether the user is ready to listen for input."""
         return self._ready_for_input
 
+    def _take_input(self, text: str) -> Optional[AnnotatedUtterance]:
+        """Turns a user input into an utterance, if the user is ready for it.
+
+        Args:
+            text: User input.
+
+        Returns:
+            The user utterance, or None if the user is not ready for input.
+        """
+        if not self._ready_for_input:
+            return None
+        self._ready_for_input = False
+        return AnnotatedUtterance(text, participant=DialogueParticipant.USER)
+
+
+class User(BaseUser, Participant):
+    """Represents a user."""
+
     def handle_input(self, text: str) -> None:
         """Gets called every time there is a new user input.
 
         Args:
             text: User input.
         """
-        if self._ready_for_input:
-            self._ready_for_input = False
-            utterance = AnnotatedUtterance(
-                text, participant=DialogueParticipant.USER
-            )
+        utterance = self._take_input(text)
+        if utterance is not None:
             self._dialogue_connector.register_user_utterance(utterance)
 
     def receive_utterance(self, utterance: Utterance) -> None:
@@ -63,13 +63,20 @@ class Response:
 
 
 class FlaskSocketPlatform(Platform):
-    def __init__(self, agent_class: Type[Agent]) -> None:
+    def __init__(
+        self,
+        agent_class: Type[Agent],
+        dialogue_connector_kwargs: Dict[str, Any] = None,
+    ) -> None:
         """Represents a platform that uses Flask-SocketIO.
 
         Args:
             agent_class: The class of the agent.
+            dialogue_connector_kwargs: Additional arguments for the dialogue
+              connectors created for new users, e.g., an export writer to
+              keep disk I/O out of the disconnect handler. Defaults to None.
         """
-        super().__init__(agent_class)
+        super().__init__(agent_class, dialogue_connector_kwargs)
         self.app = Flask(__name__)
         self.socketio = SocketIO(self.app, cors_allowed_origins="*")
 
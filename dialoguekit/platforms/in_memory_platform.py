@@ -0,0 +1,106 @@
+"""In-memory platform.
+
+This platform runs conversations with scripted user inputs and records the
+agent utterances in memory, without any I/O. It is meant for testing agents
+and measuring the overhead of the turn loop.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Type
+
+from dialoguekit.core import Utterance
+from dialoguekit.participant import Agent
+from dialoguekit.platforms.platform import Platform
+
+
+class InMemoryPlatform(Platform):
+    def __init__(
+        self,
+        agent_class: Type[Agent],
+        dialogue_connector_kwargs: Dict[str, Any] = None,
+    ) -> None:
+        """Represents an in-memory platform. It handles multiple users.
+
+        Args:
+            agent_class: The class of the agent.
+            dialogue_connector_kwargs: Additional arguments for the dialogue
+              connectors. Defaults to None.
+        """
+        super().__init__(agent_class, dialogue_connector_kwargs)
+        self._agent_utterances: Dict[str, List[Utterance]] = defaultdict(list)
+
+    def start(self) -> None:
+        """Starts the platform.
+
+        Conversations are driven by `run_script()`, or by `connect()`,
+        `message()` and `disconnect()`, so there is nothing to start.
+        """
+        pass
+
+    def run_script(self, user_id: str, texts: Iterable[str]) -> List[Utterance]:
+        """Runs a conversation with scripted user inputs.
+
+        The user is connected, sends the inputs one by one and is
+        disconnected. Inputs left once the conversation is ended by the agent
+        are not sent.
+
+        Args:
+            user_id: User ID.
+            texts: User inputs.
+
+        Returns:
+            The agent utterances of the conversation.
+        """
+        self.connect(user_id)
+        user = self._active_users[user_id]
+        for text in texts:
+            if not user.ready_for_input:
+                break
+            self.message(user_id, text)
+        self.disconnect(user_id)
+        return self.pop_agent_utterances(user_id)
+
+    def get_agent_utterances(self, user_id: str) -> List[Utterance]:
+        """Returns the agent utterances displayed to a user so far.
+
+        Args:
+            user_id: User ID.
+
+        Returns:
+            Agent utterances, in the order they were displayed.
+        """
+        return self._agent_utterances.get(user_id, [])
+
+    def pop_agent_utterances(self, user_id: str) -> List[Utterance]:
+        """Returns and forgets the agent utterances displayed to a user.
+
+        Args:
+            user_id: User ID.
+
+        Returns:
+            Agent utterances, in the order they were displayed.
+        """
+        return self._agent_utterances.pop(user_id, [])
+
+    def display_agent_utterance(
+        self, utterance: Utterance, agent_id: str, user_id: str
+    ) -> None:
+        """Records an agent utterance.
+
+        Args:
+            utterance: An instance of Utterance.
+            agent_id: Agent ID.
+            user_id: User ID of the recipient.
+        """
+        self._agent_utterances[user_id].append(utterance)
+
+    def display_user_utterance(
+        self, utterance: Utterance, user_id: str
+    ) -> None:
+        """Displays a user utterance.
+
+        Args:
+            utterance: An instance of Utterance.
+            user_id: User ID.
+        """
+        pass
@@ -1,7 +1,7 @@
 """The Platform facilitates displaying of the conversation."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Type
+from typing import Any, Dict, Type
 
 from dialoguekit.connector import DialogueConnector
 from dialoguekit.core import Utterance
@@ -9,15 +9,23 @@ from dialoguekit.participant import Agent, User
 
 
 class Platform(ABC):
-    def __init__(self, agent_class: Type[Agent]) -> None:
+    def __init__(
+        self,
+        agent_class: Type[Agent],
+        dialogue_connector_kwargs: Dict[str, Any] = None,
+    ) -> None:
         """Represents a platform.
 
         Args:
             agent_class: The class of the agent.
+            dialogue_connector_kwargs: Additional arguments for the dialogue
+              connectors created for new users, e.g., the export writer.
+              Defaults to None.
         """
         if not issubclass(agent_class, Agent):
             raise ValueError("agent_class must be a subclass of Agent")
         self._agent_class = agent_class
+        self._dialogue_connector_kwargs = dialogue_connector_kwargs or {}
         self._active_users: Dict[str, User] = {}
 
     @abstractmethod
@@ -93,6 +101,7 @@ class Platform(ABC):
             agent=self.get_new_agent(),
             user=self._active_users[user_id],
             platform=self,
+            **self._dialogue_connector_kwargs,
         )
         dialogue_connector.start()
 
@@ -4,7 +4,7 @@ This platform is used for getting user input and displaying agent responses in
 the terminal.
 """
 
-from typing import Type
+from typing import Any, Dict, Type
 
 from dialoguekit.core import Utterance
 from dialoguekit.participant import Agent
@@ -14,15 +14,20 @@ from dialoguekit.platforms import Platform
 
 class TerminalPlatform(Platform):
     def __init__(
-        self, agent_class: Type[Agent], user_id: str = "terminal_user"
+        self,
+        agent_class: Type[Agent],
+        user_id: str = "terminal_user",
+        dialogue_connector_kwargs: Dict[str, Any] = None,
     ) -> None:
         """Represents a terminal platform. It handles a single user.
 
         Args:
             agent_class: The class of the agent.
             user_id: User ID. Defaults to "terminal_user".
+            dialogue_connector_kwargs: Additional arguments for the dialogue
+              connector. Defaults to None.
         """
-        super().__init__(agent_class)
+        super().__init__(agent_class, dialogue_connector_kwargs)
         self._user_id = user_id
 
     def start(self) -> None:
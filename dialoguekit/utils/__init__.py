@@ -1,6 +1,15 @@
 """Module level init for utilities."""
 
 from dialoguekit.utils.annotation_converter import AnnotationConverter
+from dialoguekit.utils.dialogue_corpus import DialogueCorpus
 from dialoguekit.utils.dialogue_evaluation import Evaluator
+from dialoguekit.utils.export_index import ExportIndex
+from dialoguekit.utils.record_filter import RecordFilter
 
-__all__ = ["AnnotationConverter", "Evaluator"]
+__all__ = [
+    "AnnotationConverter",
+    "DialogueCorpus",
+    "Evaluator",
+    "ExportIndex",
+    "RecordFilter",
+]
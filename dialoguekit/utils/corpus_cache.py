@@ -0,0 +1,327 @@
+"""Binary cache of the corpora of export files.
+
+Parsing a JSON export is by far the slowest part of loading it. The corpus of
+an export file (see `DialogueCorpus`) can instead be cached in a binary
+sidecar file next to it, 'EXPORT.corpus', which later loads memory-map rather
+than parse. A sidecar records the size and modification time of the export
+file it was built from, and is rebuilt if either has changed since.
+
+A sidecar holds, after a magic number and the length of its header:
+
+- a JSON header with the size and modification time of the export file, the
+  conversation, agent and user IDs of the dialogues, the labels of the
+  intents by ID, and the dtype, offset and length of each array,
+- the arrays of the corpus, aligned to 8 bytes, with the texts encoded in
+  UTF-8 and their offsets in bytes.
+
+The arrays are memory-mapped read-only, and texts are decoded one utterance
+at a time. The labels of the header are registered in the intent registry of
+the corpus when the sidecar is loaded; intent IDs are only mapped, in memory,
+if the registry gives them other IDs. A sidecar that cannot be read is
+rebuilt.
+"""
+
+import json
+import logging
+import os
+import struct
+import tempfile
+from typing import Any, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from dialoguekit.core.intent_registry import (
+    IntentRegistry,
+    get_default_registry,
+)
+from dialoguekit.utils.dialogue_corpus import DialogueCorpus
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"DKCORPUS"
+_VERSION = 2
+_PREFIX = struct.Struct("<8sIQ")
+_ALIGNMENT = 8
+_SIDECAR_SUFFIX = ".corpus"
+_ARRAYS = [
+    "dialogue_offsets",
+    "participants",
+    "intent_offsets",
+    "intent_ids",
+    "text_offsets",
+    "timestamps",
+    "feedback",
+]
+
+
+def get_cache_filepath(filepath: str) -> str:
+    """Returns the path of the sidecar of an export file.
+
+    Args:
+        filepath: Path to the export file.
+
+    Returns:
+        Path to the sidecar.
+    """
+    return filepath + _SIDECAR_SUFFIX
+
+
+def load_cached_corpus(
+    filepaths: Union[str, Iterable[str]],
+    intent_registry: IntentRegistry = None,
+) -> DialogueCorpus:
+    """Loads the corpus of export files, using their sidecars.
+
+    Export files without a valid sidecar are parsed and their sidecar is
+    written; sidecars that cannot be written are skipped. The corpus of a
+    single export file is memory-mapped, while the corpora of several export
+    files are concatenated in memory.
+
+    Args:
+        filepaths: Path, or paths, to JSON or JSON Lines export files,
+          possibly compressed.
+        intent_registry: Registry for the intent IDs. Defaults to None,
+          i.e., the default registry.
+
+    Returns:
+        Corpus of the dialogues of the export files, in order.
+    """
+    if isinstance(filepaths, str):
+        filepaths = [filepaths]
+    registry = intent_registry or get_default_registry()
+    corpora = []
+    for filepath in filepaths:
+        stat = os.stat(filepath)
+        sidecar_path = get_cache_filepath(filepath)
+        corpus = read_sidecar(sidecar_path, registry, stat)
+        if corpus is None:
+            corpus = DialogueCorpus.from_export_files([filepath], registry)
+            try:
+                write_sidecar(corpus, sidecar_path, stat)
+            except OSError:
+                logger.warning(f"Failed to write corpus cache {sidecar_path}")
+        corpora.append(corpus)
+    if len(corpora) == 1:
+        return corpora[0]
+    return DialogueCorpus.concatenate(corpora, registry)
+
+
+def write_sidecar(
+    corpus: DialogueCorpus, sidecar_path: str, stat: os.stat_result
+) -> None:
+    """Writes the sidecar of an export file.
+
+    The sidecar is written to a temporary file, then moved in place, so that
+    readers never see a partial sidecar.
+
+    Args:
+        corpus: Corpus of the export file.
+        sidecar_path: Path to the sidecar.
+        stat: Status of the export file before it was parsed.
+    """
+    arrays: Dict[str, np.ndarray] = {
+        name: np.ascontiguousarray(getattr(corpus, name)) for name in _ARRAYS
+    }
+    arrays["intent_ids"] = arrays["intent_ids"].astype(np.int32, copy=False)
+    texts, text_offsets = corpus.get_encoded_texts()
+    arrays["text_offsets"] = np.ascontiguousarray(text_offsets)
+    arrays["texts"] = np.ascontiguousarray(texts)
+    num_intents = (
+        int(arrays["intent_ids"].max()) + 1 if len(arrays["intent_ids"]) else 0
+    )
+
+    descriptors = {}
+    offset = 0
+    for name, array in arrays.items():
+        descriptors[name] = {
+            "dtype": array.dtype.str,
+            "offset": offset,
+            "length": len(array),
+        }
+        offset = _align(offset + array.nbytes)
+    header = json.dumps(
+        {
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "conversation_ids": corpus.conversation_ids,
+            "agent_ids": corpus.agent_ids,
+            "user_ids": corpus.user_ids,
+            "intents": [
+                corpus.intent_registry.get_intent_by_id(i).label
+                for i in range(num_intents)
+            ],
+            "arrays": descriptors,
+        }
+    ).encode("utf-8")
+    header += b" " * (
+        _align(_PREFIX.size + len(header)) - _PREFIX.size - len(header)
+    )
+
+    fd, tmp_path = tempfile.mkstemp(
+        suffix=".tmp", dir=os.path.dirname(sidecar_path) or "."
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREFIX.pack(_MAGIC, _VERSION, len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.write(array.tobytes())
+                f.write(b"\0" * (_align(array.nbytes) - array.nbytes))
+        os.replace(tmp_path, sidecar_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read_sidecar(
+    sidecar_path: str,
+    intent_registry: IntentRegistry = None,
+    stat: os.stat_result = None,
+) -> Optional[DialogueCorpus]:
+    """Reads the sidecar of an export file.
+
+    Args:
+        sidecar_path: Path to the sidecar.
+        intent_registry: Registry for the intent IDs. Defaults to None, i.e.,
+          the default registry.
+        stat: Current status of the export file, to check that the sidecar
+          is up to date. Defaults to None, i.e., not checked.
+
+    Returns:
+        Corpus, with memory-mapped arrays, or None if the sidecar is missing,
+        invalid or out of date.
+    """
+    header = _read_header(sidecar_path)
+    if header is None or (
+        stat is not None
+        and (
+            header["source_size"] != stat.st_size
+            or header["source_mtime_ns"] != stat.st_mtime_ns
+        )
+    ):
+        return None
+    try:
+        return _map_sidecar(
+            sidecar_path, header, intent_registry or get_default_registry()
+        )
+    except (ValueError, KeyError, TypeError, IndexError):
+        logger.warning(f"Invalid corpus cache {sidecar_path}")
+        return None
+
+
+def _map_sidecar(
+    sidecar_path: str, header: Dict[str, Any], registry: IntentRegistry
+) -> DialogueCorpus:
+    """Memory-maps the arrays of a sidecar.
+
+    Args:
+        sidecar_path: Path to the sidecar.
+        header: Header of the sidecar.
+        registry: Registry for the intent IDs.
+
+    Raises:
+        ValueError: If the sidecar is truncated or its arrays are
+          inconsistent.
+
+    Returns:
+        Corpus, with memory-mapped arrays.
+    """
+    data = np.memmap(sidecar_path, dtype=np.uint8, mode="r")
+    start = _align(_PREFIX.size + header["length"])
+    arrays = {}
+    for name, descriptor in header["arrays"].items():
+        dtype = np.dtype(descriptor["dtype"])
+        offset = start + descriptor["offset"]
+        end = offset + descriptor["length"] * dtype.itemsize
+        if end > len(data):
+            raise ValueError("Truncated sidecar")
+        arrays[name] = data[offset:end].view(dtype)
+    _check_lengths(header, arrays)
+
+    intent_ids = arrays["intent_ids"]
+    registry_ids = np.array(
+        [registry.get_intent(label).id for label in header["intents"]],
+        dtype=np.int32,
+    )
+    if not np.array_equal(registry_ids, np.arange(len(registry_ids))):
+        # The registry gives other IDs to the intents.
+        intent_ids = np.append(registry_ids, -1)[intent_ids]
+    return DialogueCorpus(
+        conversation_ids=header["conversation_ids"],
+        agent_ids=header["agent_ids"],
+        user_ids=header["user_ids"],
+        dialogue_offsets=arrays["dialogue_offsets"],
+        participants=arrays["participants"],
+        intent_offsets=arrays["intent_offsets"],
+        intent_ids=intent_ids,
+        texts=arrays["texts"],
+        text_offsets=arrays["text_offsets"],
+        timestamps=arrays["timestamps"],
+        feedback=arrays["feedback"],
+        intent_registry=registry,
+    )
+
+
+def _check_lengths(
+    header: Dict[str, Any], arrays: Dict[str, np.ndarray]
+) -> None:
+    """Checks that the arrays of a sidecar have consistent lengths.
+
+    Args:
+        header: Header of the sidecar.
+        arrays: Arrays of the sidecar.
+
+    Raises:
+        ValueError: If the lengths are inconsistent.
+    """
+    num_dialogues = len(header["conversation_ids"])
+    num_utterances = len(arrays["participants"])
+    expected = {
+        "dialogue_offsets": (num_dialogues + 1, num_utterances),
+        "intent_offsets": (num_utterances + 1, len(arrays["intent_ids"])),
+        "text_offsets": (num_utterances + 1, len(arrays["texts"])),
+    }
+    for name, (length, last_offset) in expected.items():
+        offsets = arrays[name]
+        if len(offsets) != length or offsets[-1] != last_offset:
+            raise ValueError(f"Inconsistent sidecar array {name}")
+    for name in ["timestamps", "feedback"]:
+        if len(arrays[name]) != num_utterances:
+            raise ValueError(f"Inconsistent sidecar array {name}")
+
+
+def _read_header(sidecar_path: str) -> Optional[Dict[str, Any]]:
+    """Reads the header of a sidecar.
+
+    Args:
+        sidecar_path: Path to the sidecar.
+
+    Returns:
+        Header, with its length under "length", or None if the sidecar is
+        missing or is not a sidecar of this version.
+    """
+    try:
+        with open(sidecar_path, "rb") as f:
+            prefix = f.read(_PREFIX.size)
+            if len(prefix) < _PREFIX.size:
+                return None
+            magic, version, length = _PREFIX.unpack(prefix)
+            if magic != _MAGIC or version != _VERSION:
+                return None
+            header = json.loads(f.read(length))
+    except (OSError, ValueError):
+        return None
+    header["length"] = length
+    return header
+
+
+def _align(offset: int) -> int:
+    """Rounds an offset up to the alignment of the arrays.
+
+    Args:
+        offset: Offset.
+
+    Returns:
+        Aligned offset.
+    """
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
@@ -0,0 +1,208 @@
+"""Loading of dialogue corpora spread across many export files.
+
+Export files are parsed in parallel by a pool of worker processes, one file
+per task. Dialogues are returned in the order of the files, and of the
+dialogues within each file, regardless of the order in which the files are
+parsed. `iter_corpus()` submits files in that order, keeping at most two
+files per worker in flight, so that only those are held in memory.
+`load_corpus()`, which holds every dialogue anyway, submits files from the
+largest to the smallest instead, so that the longest tasks start first and
+the workers finish at about the same time.
+
+Dialogues are sent back from the workers pickled, and unpickling them in the
+calling process takes about as long as building them. Parallel loading thus
+pays off most when many dialogues are filtered out in the workers, e.g., with
+a `RecordFilter`.
+"""
+
+import glob
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Union
+
+from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.utils.dialogue_reader import iter_dialogues, json_to_dialogues
+
+_EXPORT_SUFFIXES = (
+    ".json",
+    ".jsonl",
+    ".json.gz",
+    ".jsonl.gz",
+    ".json.xz",
+    ".jsonl.xz",
+)
+_MANIFEST_FILE_NAME = "manifest.json"
+
+
+def get_corpus_files(paths: Union[str, Iterable[str]]) -> List[str]:
+    """Returns the export files of a corpus.
+
+    Args:
+        paths: Directory holding the export files, glob pattern, or list of
+          paths of export files, e.g., returned by `select_export_files()`.
+
+    Returns:
+        Paths of the export files. Files of a directory or matching a pattern
+        are sorted by path, and only export files are kept: export manifests
+        and other files, e.g., corpus caches and indexes, are left out.
+    """
+    if not isinstance(paths, str):
+        return list(paths)
+    if os.path.isdir(paths):
+        filepaths = [
+            os.path.join(paths, file_name) for file_name in os.listdir(paths)
+        ]
+    else:
+        filepaths = glob.glob(paths)
+    return sorted(
+        filepath
+        for filepath in filepaths
+        if filepath.endswith(_EXPORT_SUFFIXES)
+        and os.path.basename(filepath) != _MANIFEST_FILE_NAME
+    )
+
+
+def iter_corpus(
+    paths: Union[str, Iterable[str]],
+    agent_ids: List[str] = None,
+    user_ids: List[str] = None,
+    lazy: bool = False,
+    max_workers: int = None,
+    record_filter: Callable[[Dict[str, Any]], bool] = None,
+) -> Iterator[Dialogue]:
+    """Iterates over the dialogues of export files parsed in parallel.
+
+    Files are submitted in order, at most two per worker at any time, and the
+    dialogues of a file are yielded once all the files before it have been.
+    With a single worker, files are parsed one dialogue at a time in the
+    calling process.
+
+    Args:
+        paths: Directory holding the export files, glob pattern, or list of
+          paths of export files.
+        agent_ids: List of agents' id to filter loaded dialogues. Defaults to
+          None.
+        user_ids: List of users' id to filter loaded dialogues. Defaults to
+          None.
+        lazy: Whether the annotations of the utterances are decoded on first
+          access, see `json_to_dialogues()`; workers return the utterances
+          undecoded. Defaults to False.
+        max_workers: Number of worker processes. Defaults to None, i.e., the
+          number of CPUs, or of files if fewer.
+        record_filter: Picklable predicate on dialogues in JSON format,
+          checked in the workers, e.g., a `RecordFilter`. Defaults to None.
+
+    Raises:
+        ValueError: If max_workers is not positive.
+
+    Yields:
+        Dialogue objects, in the order of the files.
+    """
+    filepaths = get_corpus_files(paths)
+    num_workers = _get_num_workers(max_workers, len(filepaths))
+    if num_workers <= 1:
+        for filepath in filepaths:
+            yield from iter_dialogues(
+                filepath, agent_ids, user_ids, lazy, record_filter
+            )
+        return
+
+    max_pending = 2 * num_workers
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        pending: Deque[Future] = deque()
+        for filepath in filepaths:
+            pending.append(
+                executor.submit(
+                    json_to_dialogues,
+                    filepath,
+                    agent_ids,
+                    user_ids,
+                    lazy,
+                    record_filter,
+                )
+            )
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def load_corpus(
+    paths: Union[str, Iterable[str]],
+    agent_ids: List[str] = None,
+    user_ids: List[str] = None,
+    lazy: bool = False,
+    max_workers: int = None,
+    record_filter: Callable[[Dict[str, Any]], bool] = None,
+) -> List[Dialogue]:
+    """Loads the dialogues of export files parsed in parallel.
+
+    Args:
+        paths: Directory holding the export files, glob pattern, or list of
+          paths of export files.
+        agent_ids: List of agents' id to filter loaded dialogues. Defaults to
+          None.
+        user_ids: List of users' id to filter loaded dialogues. Defaults to
+          None.
+        lazy: Whether the annotations of the utterances are decoded on first
+          access, see `json_to_dialogues()`. Defaults to False.
+        max_workers: Number of worker processes. Defaults to None, i.e., the
+          number of CPUs, or of files if fewer.
+        record_filter: Picklable predicate on dialogues in JSON format,
+          checked in the workers, e.g., a `RecordFilter`. Defaults to None.
+
+    Raises:
+        ValueError: If max_workers is not positive.
+
+    Returns:
+        A list of Dialogue objects, in the order of the files.
+    """
+    filepaths = get_corpus_files(paths)
+    num_workers = _get_num_workers(max_workers, len(filepaths))
+    if num_workers <= 1:
+        return list(
+            iter_corpus(filepaths, agent_ids, user_ids, lazy, 1, record_filter)
+        )
+
+    # Largest files first, so that no long task is left to run alone.
+    schedule = sorted(
+        range(len(filepaths)),
+        key=lambda index: os.path.getsize(filepaths[index]),
+        reverse=True,
+    )
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures: Dict[int, Future] = {
+            index: executor.submit(
+                json_to_dialogues,
+                filepaths[index],
+                agent_ids,
+                user_ids,
+                lazy,
+                record_filter,
+            )
+            for index in schedule
+        }
+        dialogues: List[Dialogue] = []
+        for index in range(len(filepaths)):
+            dialogues.extend(futures.pop(index).result())
+    return dialogues
+
+
+def _get_num_workers(max_workers: int, num_files: int) -> int:
+    """Returns the number of worker processes to parse files with.
+
+    Args:
+        max_workers: Maximum number of workers, or None for the number of
+          CPUs.
+        num_files: Number of files.
+
+    Raises:
+        ValueError: If max_workers is not positive.
+
+    Returns:
+        Number of workers, at most the number of files.
+    """
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be positive")
+    return min(max_workers or os.cpu_count() or 1, num_files)
@@ -0,0 +1,543 @@
+"""Columnar representation of a dialogue corpus.
+
+A DialogueCorpus packs the utterances of many dialogues into NumPy arrays,
+one row per utterance, so that corpus statistics can be computed with array
+operations instead of walking Dialogue objects:
+
+- dialogue offsets: the utterances of dialogue i are the rows
+  `dialogue_offsets[i]:dialogue_offsets[i + 1]`,
+- participant codes (`DialogueParticipant.value`),
+- intent IDs: the intents of the dialogue acts of utterance j are
+  `intent_ids[intent_offsets[j]:intent_offsets[j + 1]]`, as IDs of an
+  IntentRegistry (-1 for dialogue acts without intent),
+- text offsets into a single string holding all the utterance texts, or
+  into its UTF-8 encoding (e.g., memory-mapped from a corpus cache), which is
+  then decoded one utterance at a time,
+- timestamps, in seconds since the epoch (NaN if missing),
+- feedback codes (1 positive, 0 negative, -1 if missing).
+
+Slot-value annotations and metadata are not included.
+"""
+
+import math
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from dialoguekit.core.annotated_utterance import (
+    AnnotatedUtterance,
+    get_raw_dialogue_acts,
+)
+from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.core.feedback import BinaryFeedback
+from dialoguekit.core.intent_registry import (
+    IntentRegistry,
+    get_default_registry,
+)
+from dialoguekit.participant.participant import DialogueParticipant
+from dialoguekit.utils.dialogue_reader import (
+    _get_participant_ids,
+    _iter_dialogue_records,
+)
+
+_NO_INTENT = -1
+_NO_FEEDBACK = -1
+
+
+class DialogueCorpus:
+    def __init__(
+        self,
+        conversation_ids: List[str],
+        agent_ids: List[str],
+        user_ids: List[str],
+        dialogue_offsets: np.ndarray,
+        participants: np.ndarray,
+        intent_offsets: np.ndarray,
+        intent_ids: np.ndarray,
+        texts: Union[str, np.ndarray],
+        text_offsets: np.ndarray,
+        timestamps: np.ndarray,
+        feedback: np.ndarray,
+        intent_registry: IntentRegistry = None,
+    ) -> None:
+        """Represents a corpus of dialogues as columns.
+
+        Instances are normally created with `from_dialogues()` or
+        `from_export_files()`.
+
+        Args:
+            conversation_ids: Conversation IDs, per dialogue.
+            agent_ids: Agent IDs, per dialogue.
+            user_ids: User IDs, per dialogue.
+            dialogue_offsets: Offsets of the dialogues in the utterance rows.
+            participants: Participant codes, per utterance.
+            intent_offsets: Offsets of the utterances in the intent IDs.
+            intent_ids: Intent IDs of the dialogue acts.
+            texts: Texts of all the utterances, concatenated, as a string or
+              as an array of its UTF-8 bytes.
+            text_offsets: Offsets of the utterances in the texts, in
+              characters or in bytes, respectively.
+            timestamps: Timestamps, per utterance.
+            feedback: Feedback codes, per utterance.
+            intent_registry: Registry of the intent IDs. Defaults to None,
+              i.e., the default registry.
+        """
+        self.conversation_ids = conversation_ids
+        self.agent_ids = agent_ids
+        self.user_ids = user_ids
+        self.dialogue_offsets = dialogue_offsets
+        self.participants = participants
+        self.intent_offsets = intent_offsets
+        self.intent_ids = intent_ids
+        self.texts = texts
+        self.text_offsets = text_offsets
+        self.timestamps = timestamps
+        self.feedback = feedback
+        self._intent_registry = intent_registry or get_default_registry()
+
+    def __len__(self) -> int:
+        return len(self.conversation_ids)
+
+    @property
+    def num_utterances(self) -> int:
+        """Returns the number of utterances in the corpus."""
+        return len(self.participants)
+
+    @property
+    def intent_registry(self) -> IntentRegistry:
+        """Returns the registry of the intent IDs."""
+        return self._intent_registry
+
+    @classmethod
+    def from_dialogues(
+        cls,
+        dialogues: Iterable[Dialogue],
+        intent_registry: IntentRegistry = None,
+    ) -> "DialogueCorpus":
+        """Creates a corpus from dialogues, e.g., read by `json_to_dialogues()`.
+
+        Args:
+            dialogues: Dialogues.
+            intent_registry: Registry for the intent IDs. Defaults to None,
+              i.e., the default registry.
+
+        Returns:
+            Corpus.
+        """
+        builder = _CorpusBuilder(intent_registry or get_default_registry())
+        for dialogue in dialogues:
+            builder.add_dialogue(
+                dialogue.conversation_id, dialogue.agent_id, dialogue.user_id
+            )
+            for utterance in dialogue.utterances:
+                feedback = _NO_FEEDBACK
+                if utterance.utterance_id is not None:
+                    try:
+                        feedback = dialogue.get_utterance_feedback(
+                            utterance.utterance_id
+                        ).feedback.value
+                    except KeyError:
+                        pass
+                builder.add_utterance(
+                    utterance.participant.value,
+                    utterance.text,
+                    [
+                        da.intent.label if da.intent is not None else None
+                        for da in (
+                            get_raw_dialogue_acts(utterance)
+                            if isinstance(utterance, AnnotatedUtterance)
+                            else None
+                        )
+                        or []
+                    ],
+                    (
+                        utterance.timestamp.timestamp()
+                        if utterance.timestamp is not None
+                        else math.nan
+                    ),
+                    feedback,
+                )
+        return builder.build()
+
+    @classmethod
+    def from_export_files(
+        cls,
+        filepaths: Iterable[str],
+        intent_registry: IntentRegistry = None,
+        record_filter: Callable[[Dict[str, Any]], bool] = None,
+    ) -> "DialogueCorpus":
+        """Creates a corpus from export files, without creating Dialogues.
+
+        Args:
+            filepaths: Paths to JSON or JSON Lines export files, possibly
+              compressed.
+            intent_registry: Registry for the intent IDs. Defaults to None,
+              i.e., the default registry.
+            record_filter: Predicate on dialogues in JSON format, e.g., a
+              `RecordFilter`. Defaults to None.
+
+        Returns:
+            Corpus.
+        """
+        builder = _CorpusBuilder(intent_registry or get_default_registry())
+        for filepath in filepaths:
+            for record in _iter_dialogue_records(filepath):
+                if record_filter is None or record_filter(record):
+                    builder.add_record(record)
+        return builder.build()
+
+    @classmethod
+    def concatenate(
+        cls,
+        corpora: Sequence["DialogueCorpus"],
+        intent_registry: IntentRegistry = None,
+    ) -> "DialogueCorpus":
+        """Creates a corpus holding the dialogues of several corpora.
+
+        Args:
+            corpora: Corpora, with intent IDs of the same registry.
+            intent_registry: Registry of the intent IDs, for an empty list of
+              corpora. Defaults to None, i.e., the registry of the corpora.
+
+        Raises:
+            ValueError: If the corpora have different intent registries.
+
+        Returns:
+            Corpus with the dialogues of the corpora, in order.
+        """
+        registry = intent_registry or (
+            corpora[0].intent_registry if corpora else get_default_registry()
+        )
+        if any(corpus.intent_registry is not registry for corpus in corpora):
+            raise ValueError("Corpora must share the same intent registry")
+        if not corpora:
+            return _CorpusBuilder(registry).build()
+        if all(isinstance(c.texts, str) for c in corpora):
+            texts: Union[str, np.ndarray] = "".join(
+                c.texts for c in corpora  # type: ignore[misc]
+            )
+            text_offsets = [c.text_offsets for c in corpora]
+        else:
+            # Encoded texts are kept encoded, e.g., memory-mapped ones.
+            encoded = [c.get_encoded_texts() for c in corpora]
+            texts = np.concatenate([e[0] for e in encoded])
+            text_offsets = [e[1] for e in encoded]
+
+        def join(name: str) -> np.ndarray:
+            return np.concatenate([getattr(c, name) for c in corpora])
+
+        def join_offsets(offsets: List[np.ndarray]) -> np.ndarray:
+            bases = np.cumsum([0] + [o[-1] for o in offsets[:-1]])
+            return np.concatenate(
+                [offsets[0][:1]]
+                + [o[1:] + base for o, base in zip(offsets, bases)]
+            )
+
+        return cls(
+            conversation_ids=[i for c in corpora for i in c.conversation_ids],
+            agent_ids=[i for c in corpora for i in c.agent_ids],
+            user_ids=[i for c in corpora for i in c.user_ids],
+            dialogue_offsets=join_offsets(
+                [c.dialogue_offsets for c in corpora]
+            ),
+            participants=join("participants"),
+            intent_offsets=join_offsets([c.intent_offsets for c in corpora]),
+            intent_ids=join("intent_ids"),
+            texts=texts,
+            text_offsets=join_offsets(text_offsets),
+            timestamps=join("timestamps"),
+            feedback=join("feedback"),
+            intent_registry=registry,
+        )
+
+    def get_text(self, utterance_index: int) -> str:
+        """Returns the text of an utterance.
+
+        Args:
+            utterance_index: Row of the utterance.
+
+        Returns:
+            Utterance text.
+        """
+        start = self.text_offsets[utterance_index]
+        end = self.text_offsets[utterance_index + 1]
+        if isinstance(self.texts, str):
+            return self.texts[start:end]
+        return bytes(self.texts[start:end]).decode("utf-8")
+
+    def get_encoded_texts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the texts encoded in UTF-8, with their offsets in bytes.
+
+        Returns:
+            Array of the bytes of the texts, and offsets of the utterances in
+            it.
+        """
+        if not isinstance(self.texts, str):
+            return self.texts, self.text_offsets
+        codepoints = np.frombuffer(
+            self.texts.encode("utf-32-le"), dtype=np.uint32
+        )
+        sizes = (
+            1
+            + (codepoints >= 0x80)
+            + (codepoints >= 0x800)
+            + (codepoints >= 0x10000)
+        )
+        byte_offsets = np.concatenate(([0], np.cumsum(sizes)))
+        return (
+            np.frombuffer(self.texts.encode("utf-8"), dtype=np.uint8),
+            byte_offsets[self.text_offsets],
+        )
+
+    def get_utterance_counts(self) -> np.ndarray:
+        """Returns the number of utterances per dialogue."""
+        return np.diff(self.dialogue_offsets)
+
+    def get_turn_counts(self) -> np.ndarray:
+        """Returns the number of system-user turn pairs per dialogue.
+
+        As in `Evaluator.avg_turns()`, it is half the number of changes of
+        participant within the dialogue.
+
+        Returns:
+            Number of turn pairs per dialogue.
+        """
+        changes = np.zeros(self.num_utterances, dtype=bool)
+        changes[1:] = self.participants[1:] != self.participants[:-1]
+        changes[
+            self.dialogue_offsets[:-1][self.get_utterance_counts() > 0]
+        ] = False
+        return self._sum_per_dialogue(changes) / 2
+
+    def avg_turns(self) -> float:
+        """Returns the average number of turn pairs per dialogue."""
+        return float(self.get_turn_counts().mean())
+
+    def user_act_ratio(self) -> Dict[str, float]:
+        """Computes the number and ratio of utterances per participant.
+
+        Returns:
+            The same statistics as `Evaluator.user_act_ratio()`.
+        """
+        counts = np.bincount(
+            self.participants, minlength=len(DialogueParticipant)
+        )
+        statistics = {
+            participant.name: float(counts[participant.value])
+            for participant in DialogueParticipant
+            if counts[participant.value]
+        }
+        ratios = {
+            f"{sender}/{other_sender}": count / other_count
+            for sender, count in statistics.items()
+            for other_sender, other_count in statistics.items()
+            if sender != other_sender
+        }
+        return {**statistics, **ratios}
+
+    def get_repeats(self) -> np.ndarray:
+        """Finds utterances repeating the intents of the previous utterance.
+
+        An utterance is a repeat if the previous utterance of the dialogue is
+        from the same participant and has the same sequence of intents.
+
+        Returns:
+            Boolean array, per utterance.
+        """
+        n = self.num_utterances
+        lengths = np.diff(self.intent_offsets)
+        same_length = np.zeros(n, dtype=bool)
+        same_length[1:] = lengths[1:] == lengths[:-1]
+        # Compare the intents of utterance j with those of utterance j - 1,
+        # position by position, where both have the same number of intents.
+        owners = np.repeat(np.arange(n), lengths)
+        compared = same_length[owners]
+        positions = np.flatnonzero(compared)
+        previous = (
+            positions
+            - self.intent_offsets[owners[positions]]
+            + self.intent_offsets[owners[positions] - 1]
+        )
+        mismatches = np.bincount(
+            owners[positions][
+                self.intent_ids[positions] != self.intent_ids[previous]
+            ],
+            minlength=n,
+        )
+        repeats = same_length & (mismatches == 0)
+        repeats[1:] &= self.participants[1:] == self.participants[:-1]
+        repeats[
+            self.dialogue_offsets[:-1][self.get_utterance_counts() > 0]
+        ] = False
+        return repeats
+
+    def get_repeat_counts(self) -> np.ndarray:
+        """Returns the number of repeated utterances per dialogue."""
+        return self._sum_per_dialogue(self.get_repeats())
+
+    def get_intent_counts(
+        self, participant: Optional[DialogueParticipant] = None
+    ) -> Dict[str, int]:
+        """Counts the dialogue acts per intent.
+
+        Args:
+            participant: Participant whose utterances are counted. Defaults to
+              None, i.e., both.
+
+        Returns:
+            Number of dialogue acts per intent label.
+        """
+        intent_ids = self.intent_ids
+        if participant is not None:
+            owners = np.repeat(self.participants, np.diff(self.intent_offsets))
+            intent_ids = intent_ids[owners == participant.value]
+        counts = np.bincount(intent_ids[intent_ids != _NO_INTENT])
+        return {
+            self._intent_registry.get_intent_by_id(int(intent_id)).label: int(
+                counts[intent_id]
+            )
+            for intent_id in np.flatnonzero(counts)
+        }
+
+    def _sum_per_dialogue(self, values: np.ndarray) -> np.ndarray:
+        """Sums values per utterance over the utterances of each dialogue.
+
+        Args:
+            values: Values, per utterance.
+
+        Returns:
+            Sums, per dialogue.
+        """
+        cumulative = np.concatenate(([0], np.cumsum(values)))
+        return (
+            cumulative[self.dialogue_offsets[1:]]
+            - cumulative[self.dialogue_offsets[:-1]]
+        )
+
+
+class _CorpusBuilder:
+    def __init__(self, intent_registry: IntentRegistry) -> None:
+        """Accumulates the columns of a corpus.
+
+        Args:
+            intent_registry: Registry for the intent IDs.
+        """
+        self._intent_registry = intent_registry
+        self._conversation_ids: List[str] = []
+        self._agent_ids: List[str] = []
+        self._user_ids: List[str] = []
+        self._dialogue_offsets = [0]
+        self._participants: List[int] = []
+        self._intent_offsets = [0]
+        self._intent_ids: List[int] = []
+        self._texts: List[str] = []
+        self._text_offsets = [0]
+        self._timestamps: List[float] = []
+        self._feedback: List[int] = []
+
+    def add_dialogue(
+        self, conversation_id: str, agent_id: str, user_id: str
+    ) -> None:
+        """Starts a new dialogue.
+
+        Args:
+            conversation_id: Conversation ID.
+            agent_id: Agent ID.
+            user_id: User ID.
+        """
+        self._conversation_ids.append(conversation_id)
+        self._agent_ids.append(agent_id)
+        self._user_ids.append(user_id)
+        self._dialogue_offsets.append(self._dialogue_offsets[-1])
+
+    def add_utterance(
+        self,
+        participant: int,
+        text: str,
+        intents: List[Optional[str]],
+        timestamp: float,
+        feedback: int,
+    ) -> None:
+        """Adds an utterance to the current dialogue.
+
+        Args:
+            participant: Participant code.
+            text: Utterance text.
+            intents: Intent labels of the dialogue acts.
+            timestamp: Timestamp, in seconds since the epoch.
+            feedback: Feedback code.
+        """
+        self._participants.append(participant)
+        self._texts.append(text)
+        self._text_offsets.append(self._text_offsets[-1] + len(text))
+        for label in intents:
+            self._intent_ids.append(
+                self._intent_registry.get_intent(label).id
+                if label
+                else _NO_INTENT
+            )
+        self._intent_offsets.append(len(self._intent_ids))
+        self._timestamps.append(timestamp)
+        self._feedback.append(feedback)
+        self._dialogue_offsets[-1] += 1
+
+    def add_record(self, record: Dict[str, Any]) -> None:
+        """Adds a dialogue in the export format.
+
+        Args:
+            record: Dialogue, see `Dialogue.to_dict()`.
+        """
+        agent_id, user_id = _get_participant_ids(record)
+        self.add_dialogue(
+            record.get("conversation ID", record.get("conversation_id")),
+            agent_id,
+            user_id,
+        )
+        for utterance in record.get("conversation", []):
+            feedback = utterance.get("utterance_feedback")
+            timestamp = utterance.get("timestamp")
+            self.add_utterance(
+                DialogueParticipant[utterance["participant"]].value,
+                utterance.get("utterance", ""),
+                [da.get("intent") for da in utterance.get("dialogue_acts", [])],
+                (
+                    datetime.fromisoformat(timestamp).timestamp()
+                    if isinstance(timestamp, str)
+                    else math.nan
+                ),
+                (
+                    _NO_FEEDBACK
+                    if feedback is None
+                    else BinaryFeedback.POSITIVE.value
+                    if feedback == 1
+                    else BinaryFeedback.NEGATIVE.value
+                ),
+            )
+
+    def build(self) -> DialogueCorpus:
+        """Returns the corpus with the columns accumulated so far."""
+        return DialogueCorpus(
+            conversation_ids=self._conversation_ids,
+            agent_ids=self._agent_ids,
+            user_ids=self._user_ids,
+            dialogue_offsets=np.array(self._dialogue_offsets, dtype=np.int64),
+            participants=np.array(self._participants, dtype=np.int8),
+            intent_offsets=np.array(self._intent_offsets, dtype=np.int64),
+            intent_ids=np.array(self._intent_ids, dtype=np.int32),
+            texts="".join(self._texts),
+            text_offsets=np.array(self._text_offsets, dtype=np.int64),
+            timestamps=np.array(self._timestamps, dtype=np.float64),
+            feedback=np.array(self._feedback, dtype=np.int8),
+            intent_registry=self._intent_registry,
+        )
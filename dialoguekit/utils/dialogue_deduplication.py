@@ -0,0 +1,53 @@
+"""Deduplication of dialogue corpora.
+
+Dialogues are identified by their content fingerprint (see
+`Dialogue.fingerprint`), so duplicates are found in a single pass, e.g., when
+merging exports where the same dialogue was saved more than once.
+"""
+
+from typing import Dict, Iterable, Iterator, List
+
+from dialoguekit.core.dialogue import Dialogue
+
+
+def deduplicate_dialogues(dialogues: Iterable[Dialogue]) -> Iterator[Dialogue]:
+    """Filters out dialogues with the same content as an earlier one.
+
+    Only the fingerprints of the dialogues seen so far are kept in memory.
+
+    Args:
+        dialogues: Dialogues.
+
+    Yields:
+        The first dialogue with each fingerprint, in the input order.
+    """
+    seen = set()
+    for dialogue in dialogues:
+        fingerprint = dialogue.fingerprint
+        if fingerprint not in seen:
+            seen.add(fingerprint)
+            yield dialogue
+
+
+def find_duplicate_dialogues(
+    dialogues: Iterable[Dialogue],
+) -> Dict[str, List[str]]:
+    """Groups the conversation IDs of dialogues with the same content.
+
+    Args:
+        dialogues: Dialogues.
+
+    Returns:
+        Conversation IDs per fingerprint, for the fingerprints shared by more
+        than one dialogue.
+    """
+    groups: Dict[str, List[str]] = {}
+    for dialogue in dialogues:
+        groups.setdefault(dialogue.fingerprint, []).append(
+            dialogue.conversation_id
+        )
+    return {
+        fingerprint: conversation_ids
+        for fingerprint, conversation_ids in groups.items()
+        if len(conversation_ids) > 1
+    }
@@ -3,11 +3,12 @@
 import warnings
 from collections import defaultdict
 from copy import deepcopy
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Sequence, Union, cast
 
 from dialoguekit.core.annotated_utterance import AnnotatedUtterance
 from dialoguekit.core.dialogue import Dialogue
 from dialoguekit.core.intent import Intent
+from dialoguekit.core.intent_registry import intern_intent
 from dialoguekit.nlu.models.satisfaction_classifier import (
     SatisfactionClassifierSVM,
 )
@@ -153,11 +154,9 @@ class Evaluator:
             # Start dialogue with Agent first.
             for j, utterance in enumerate(dialogue.utterances):
                 if utterance.participant == DialogueParticipant.AGENT:
-                    dialogue_utterances_start_agent: List[
-                        AnnotatedUtterance
-                    ] = dialogue.utterances[
-                        j:
-                    ]  # type: ignore[assignment]
+                    dialogue_utterances_start_agent = cast(
+                        Sequence[AnnotatedUtterance], dialogue.get_view(j)
+                    )
                     break
             previous_sender = dialogue_utterances_start_agent[0].participant
             previous_intents = dialogue_utterances_start_agent[0].get_intents()
@@ -214,7 +213,7 @@ class Evaluator:
                     and utterance.participant == DialogueParticipant.USER
                 ):
                     intents = [
-                        Intent(intent.label.split(".")[0])
+                        intern_intent(intent.label.split(".")[0])
                         for intent in utterance.get_intents()
                     ]
                     dialogue_intents.extend(intents)
@@ -222,9 +221,10 @@ class Evaluator:
         dialogue_intents_set = set(dialogue_intents)
 
         for intent_str, penalty in self._reward_config.get("intents").items():
-            if Intent(intent_str) not in dialogue_intents_set:
+            intent = intern_intent(intent_str)
+            if intent not in dialogue_intents_set:
                 reward -= penalty
-                results["missing_intents"].append(Intent(intent_str))
+                results["missing_intents"].append(intent)
 
         for results_dialogue in results["dialogues"]:
             results_dialogue["reward"] = reward
@@ -1,15 +1,42 @@
-"""Methods for reading dialogue exports."""
+"""Methods for reading dialogue exports.
 
+Both export formats written by the DialogueConnector are supported: JSON files
+holding an array of dialogues and JSON Lines files holding one dialogue per
+line. Rotated export shards compressed with gzip ('.gz') or lzma ('.xz') are
+decompressed transparently.
+"""
+
+from __future__ import annotations
+
+import gzip
+import itertools
 import json
-from typing import Any, Dict, List
+import lzma
+from dataclasses import dataclass, field
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-from dialoguekit.core.annotated_utterance import AnnotatedUtterance
+from dialoguekit.core.annotated_utterance import (
+    AnnotatedUtterance,
+    get_raw_annotations,
+    get_raw_dialogue_acts,
+    get_raw_metadata,
+)
 from dialoguekit.core.annotation import Annotation
 from dialoguekit.core.dialogue import Dialogue
 from dialoguekit.core.dialogue_act import DialogueAct
-from dialoguekit.core.feedback import BinaryFeedback, UtteranceFeedback
-from dialoguekit.core.intent import Intent
+from dialoguekit.core.feedback import BinaryFeedback
+from dialoguekit.core.intent_registry import intern_intent
 from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
+from dialoguekit.core.utterance import Utterance
 from dialoguekit.participant import DialogueParticipant
 
 _FIELD_UTTERANCE = "utterance"
@@ -21,11 +48,15 @@ _FIELD_SLOT_VALUES = "slot_values"
 _FIELD_ANNOTATIONS = "annotations"
 _FIELD_CONVERSATION = "conversation"
 _FIELD_CONVERSATION_ID = "conversation_id"
+_FIELD_CONVERSATION_ID_EXPORT = "conversation ID"
 _FIELD_PARTICIPANT = "participant"
 _FIELD_AGENT = "agent"
 _FIELD_USER = "user"
 _FIELD_METADATA = "metadata"
 
+_CHUNK_SIZE = 1 << 16
+_DECODER = json.JSONDecoder()
+
 
 def json_to_annotated_utterance(
     json_utterance: Dict[Any, Any]
@@ -64,27 +95,187 @@ def json_to_annotated_utterance(
     utterance_text = json_utterance.get(_FIELD_UTTERANCE)
     utterance_id = json_utterance.get(_FIELD_UTTERANCE_ID)
 
+    return AnnotatedUtterance(
+        text=utterance_text,
+        utterance_id=utterance_id,
+        participant=participant,
+        dialogue_acts=_decode_dialogue_acts(json_utterance),
+        annotations=_decode_annotations(json_utterance),
+        metadata=_decode_metadata(json_utterance),
+    )
+
+
+# The comparison of AnnotatedUtterance is inherited, as it accepts annotated
+# utterances of any kind.
+@dataclass(eq=False, unsafe_hash=True, slots=True)
+class LazyAnnotatedUtterance(AnnotatedUtterance):
+    """Represents an annotated utterance backed by its JSON record.
+
+    The dialogue acts, annotations and metadata are decoded from the record
+    the first time they are read, each on its own, and then kept. Utterances
+    that are only looked at for their participant and intents thus never hold
+    the other annotations.
+    """
+
+    _record: Dict[str, Any] = field(
+        default=None, init=False, repr=False, compare=False, hash=False
+    )
+    _pending: Tuple[str, ...] = field(
+        default=(), init=False, repr=False, compare=False, hash=False
+    )
+
+    @classmethod
+    def from_record(
+        cls, json_utterance: Dict[Any, Any]
+    ) -> LazyAnnotatedUtterance:
+        """Creates an utterance from its JSON record, without decoding it.
+
+        Args:
+            json_utterance: JSON format of an utterance, see
+              `json_to_annotated_utterance()`. It must not be modified
+              afterwards.
+
+        Returns:
+            Utterance decoding its annotations on first access.
+        """
+        utterance = cls(
+            text=json_utterance.get(_FIELD_UTTERANCE),
+            participant=DialogueParticipant[
+                json_utterance.get(_FIELD_PARTICIPANT)
+            ],
+            utterance_id=json_utterance.get(_FIELD_UTTERANCE_ID),
+        )
+        utterance._record = json_utterance
+        utterance._pending = _LAZY_FIELDS
+        return utterance
+
+    def _load_container(self, name: str) -> Any:
+        """Decodes an annotation container from the record, only once.
+
+        Args:
+            name: Name of the field.
+
+        Returns:
+            Container, or None if the record has none.
+        """
+        if name not in self._pending:
+            return None
+        record = self._record
+        self._pending = tuple(n for n in self._pending if n != name)
+        if not self._pending:
+            self._record = None
+        return _DECODERS[name](record)
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        """Returns the state of the utterance without decoding its record.
+
+        Pickling (e.g., to return dialogues from a worker process) ships the
+        record of the pending fields and the containers decoded so far.
+        """
+        pending = self._pending
+        # Without pending fields, the raw getters do not decode the record.
+        self._pending = ()
+        try:
+            containers = (
+                get_raw_dialogue_acts(self),
+                get_raw_annotations(self),
+                get_raw_metadata(self),
+            )
+        finally:
+            self._pending = pending
+        return (
+            self.text,
+            self.participant,
+            self.utterance_id,
+            self.timestamp,
+            containers,
+            self._record,
+            pending,
+            self._revision,
+        )
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        """Restores the state returned by `__getstate__()`."""
+        # Incremented when the containers are assigned, then restored.
+        self._revision = 0
+        (
+            self.text,
+            self.participant,
+            self.utterance_id,
+            self.timestamp,
+            containers,
+            self._record,
+            self._pending,
+            revision,
+        ) = state
+        (
+            self.dialogue_acts,
+            self.annotations,
+            self.metadata,
+        ) = containers
+        self._revision = revision
+
+
+def _decode_dialogue_acts(
+    json_utterance: Dict[Any, Any]
+) -> Optional[List[DialogueAct]]:
+    """Decodes the dialogue acts of an utterance in JSON format.
+
+    Args:
+        json_utterance: JSON format of an utterance.
+
+    Returns:
+        Dialogue acts, or None if there are none.
+    """
     dialogue_acts = list()
     for da in json_utterance.get(_FIELD_DIALOGUE_ACTS, []):
         intent = da.get(_FIELD_INTENT)
         if intent:
-            intent = Intent(intent)
+            intent = intern_intent(intent)
 
-        annotations = da.get(_FIELD_SLOT_VALUES, [])
+        annotations = da.get(_FIELD_SLOT_VALUES)
         if annotations:
             annotations = [
                 SlotValueAnnotation(slot, value, start, end)
                 for slot, value, start, end in annotations
             ]
+        else:
+            # Empty containers are created on first access.
+            annotations = None
 
         dialogue_acts.append(DialogueAct(intent, annotations))
+    return dialogue_acts or None
 
-    annotations = json_utterance.get(_FIELD_ANNOTATIONS, [])
-    if annotations:
-        annotations = [
-            Annotation(key=key, value=value) for key, value in annotations
-        ]
 
+def _decode_annotations(
+    json_utterance: Dict[Any, Any]
+) -> Optional[List[Annotation]]:
+    """Decodes the annotations of an utterance in JSON format.
+
+    Args:
+        json_utterance: JSON format of an utterance.
+
+    Returns:
+        Annotations, or None if there are none.
+    """
+    annotations = json_utterance.get(_FIELD_ANNOTATIONS)
+    if not annotations:
+        return None
+    return [Annotation(key=key, value=value) for key, value in annotations]
+
+
+def _decode_metadata(
+    json_utterance: Dict[Any, Any]
+) -> Optional[Dict[str, Any]]:
+    """Decodes the metadata of an utterance in JSON format.
+
+    Args:
+        json_utterance: JSON format of an utterance.
+
+    Returns:
+        Fields of the utterance other than its text, participant and
+        annotations, or None if there are none.
+    """
     metadata = {}
     for k, v in json_utterance.items():
         if k not in (
@@ -98,14 +289,55 @@ def json_to_annotated_utterance(
             ]
         ):
             metadata[k] = v
+    return metadata or None
 
-    return AnnotatedUtterance(
-        text=utterance_text,
-        utterance_id=utterance_id,
-        participant=participant,
-        dialogue_acts=dialogue_acts,
-        annotations=annotations,
-        metadata=metadata,
+
+_DECODERS: Dict[str, Callable[[Dict[Any, Any]], Any]] = {
+    "dialogue_acts": _decode_dialogue_acts,
+    "annotations": _decode_annotations,
+    "metadata": _decode_metadata,
+}
+_LAZY_FIELDS = tuple(_DECODERS)
+
+
+def json_to_dialogue(
+    dialogue_data: Dict[str, Any], lazy: bool = False
+) -> Dialogue:
+    """Converts a dialogue from JSON format to Dialogue.
+
+    Args:
+        dialogue_data: JSON format of a dialogue, as found in exports.
+        lazy: Whether the annotations of the utterances are decoded on first
+          access, see `LazyAnnotatedUtterance`. Defaults to False.
+
+    Returns:
+        A Dialogue object representation of the json dialogue.
+    """
+    conversation_id = _get_conversation_id(dialogue_data)
+    agent_id, user_id = _get_participant_ids(dialogue_data)
+    to_utterance = (
+        LazyAnnotatedUtterance.from_record
+        if lazy
+        else json_to_annotated_utterance
+    )
+    utterances: List[Utterance] = []
+    feedbacks = {}
+    for utterance_data in dialogue_data.get(_FIELD_CONVERSATION):
+        utterance_feedback = utterance_data.get(_FIELD_UTTERANCE_FEEDBACK, None)
+        if utterance_feedback is not None:
+            feedbacks[len(utterances)] = (
+                BinaryFeedback.POSITIVE
+                if utterance_feedback == 1
+                else BinaryFeedback.NEGATIVE
+            )
+        utterances.append(to_utterance(utterance_data))
+    return Dialogue.from_records(
+        agent_id,
+        user_id,
+        utterances,
+        conversation_id=conversation_id,
+        feedbacks=feedbacks,
+        metadata=dialogue_data.get(_FIELD_METADATA, None),
     )
 
 
@@ -113,8 +345,15 @@ def json_to_dialogues(
     filepath: str,
     agent_ids: List[str] = None,
     user_ids: List[str] = None,
+    lazy: bool = False,
+    record_filter: Callable[[Dict[str, Any]], bool] = None,
 ) -> List[Dialogue]:
-    """Parses a JSON file containing dialogues.
+    """Parses a JSON or JSON Lines file containing dialogues.
+
+    The format is detected from the content of the file: a file starting with
+    an opening bracket is read as a JSON array, otherwise every non-empty line
+    is read as a dialogue. Files ending in '.gz' or '.xz' are decompressed.
+    To process the dialogues one at a time, see `iter_dialogues()`.
 
     Args:
         filepath: Path to JSON file containing the dialogues.
@@ -122,47 +361,223 @@ def json_to_dialogues(
           None.
         user_ids: List of users' id to filter loaded dialogues. Defaults to
           None.
+        lazy: Whether the annotations of the utterances are decoded on first
+          access, which saves time when only some of them are read, e.g.,
+          intents. Defaults to False.
+        record_filter: Predicate on dialogues in JSON format, checked before
+          they are converted, e.g., a `RecordFilter`. Defaults to None.
 
     Returns:
         A list of Dialogue objects.
     """
-    f = open(filepath, encoding="utf-8")
-    data = json.load(f)
+    return list(
+        iter_dialogues(filepath, agent_ids, user_ids, lazy, record_filter)
+    )
+
+
+def iter_dialogues(
+    filepath: str,
+    agent_ids: List[str] = None,
+    user_ids: List[str] = None,
+    lazy: bool = False,
+    record_filter: Callable[[Dict[str, Any]], bool] = None,
+) -> Iterator[Dialogue]:
+    """Iterates over the dialogues of a JSON or JSON Lines file.
+
+    The file is parsed incrementally, one dialogue at a time, so memory use
+    does not grow with the size of the file. Dialogues filtered out are
+    discarded before being converted.
 
-    dialogues = []
-    for dialogue_data in data:
-        conversation_id = dialogue_data.get(_FIELD_CONVERSATION_ID, None)
-        agent_id = dialogue_data.get(_FIELD_AGENT, {}).get("id", "Agent")
-        user_id = dialogue_data.get(_FIELD_USER, {}).get("id", "User")
+    Args:
+        filepath: Path to JSON file containing the dialogues.
+        agent_ids: List of agents' id to filter loaded dialogues. Defaults to
+          None.
+        user_ids: List of users' id to filter loaded dialogues. Defaults to
+          None.
+        lazy: Whether the annotations of the utterances are decoded on first
+          access. Defaults to False.
+        record_filter: Predicate on dialogues in JSON format, checked before
+          they are converted, e.g., a `RecordFilter`. Defaults to None.
+
+    Yields:
+        Dialogue objects, in the order of the file.
+    """
+    for dialogue_data in _iter_dialogue_records(filepath):
+        agent_id, user_id = _get_participant_ids(dialogue_data)
         if (agent_ids and agent_id not in agent_ids) or (
             user_ids and user_id not in user_ids
         ):
             # Filter loaded dialogues based on agent_ids and/or user_ids if
             # provided
             continue
-        dialogue = Dialogue(agent_id, user_id, conversation_id)
-        metadata = dialogue_data.get(_FIELD_METADATA, None)
-        if metadata:
-            dialogue._metadata = metadata
-
-        for utterance_data in dialogue_data.get(_FIELD_CONVERSATION):
-            annotated_utterance = json_to_annotated_utterance(utterance_data)
-            dialogue.add_utterance(annotated_utterance)
-            utterance_feedback = utterance_data.get(
-                _FIELD_UTTERANCE_FEEDBACK, None
+        if record_filter is not None and not record_filter(dialogue_data):
+            continue
+        yield json_to_dialogue(dialogue_data, lazy=lazy)
+
+
+def _get_conversation_id(dialogue_data: Dict[str, Any]) -> Optional[str]:
+    """Returns the conversation ID of a dialogue in JSON format.
+
+    Args:
+        dialogue_data: JSON format of a dialogue.
+
+    Returns:
+        Conversation ID, or None if there is none.
+    """
+    return dialogue_data.get(
+        _FIELD_CONVERSATION_ID,
+        dialogue_data.get(_FIELD_CONVERSATION_ID_EXPORT, None),
+    )
+
+
+def _get_participant_ids(dialogue_data: Dict[str, Any]) -> Tuple[str, str]:
+    """Returns the agent and user IDs of a dialogue in JSON format.
+
+    Args:
+        dialogue_data: JSON format of a dialogue.
+
+    Returns:
+        Agent ID and user ID, defaulting to "Agent" and "User".
+    """
+    agent_id = dialogue_data.get(_FIELD_AGENT, {}).get("id", "Agent")
+    user_id = dialogue_data.get(_FIELD_USER, {}).get("id", "User")
+    return agent_id, user_id
+
+
+def _iter_dialogue_records(filepath: str) -> Iterator[Dict[str, Any]]:
+    """Iterates over the dialogues of an export file in JSON format.
+
+    Args:
+        filepath: Path to a JSON or JSON Lines export file, possibly
+          compressed.
+
+    Yields:
+        Dialogues in JSON format.
+    """
+    with _open_export_file(filepath) as f:
+        first_char = f.read(1)
+        while first_char.isspace():
+            first_char = f.read(1)
+        if first_char == "[":
+            yield from _iter_array_items(f)
+            return
+        lines = itertools.chain([first_char + f.readline()], f)
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _iter_array_items(f: IO[str]) -> Iterator[Any]:
+    """Parses the items of a JSON array incrementally.
+
+    Args:
+        f: File, positioned after the opening bracket of the array.
+
+    Yields:
+        Items of the array.
+    """
+    for _, _, item in _scan_array_items(f):
+        yield item
+
+
+def _scan_array_items(f: IO[str]) -> Iterator[Tuple[int, int, Any]]:
+    """Parses the items of a JSON array incrementally, with their positions.
+
+    The file is read in chunks, and items are decoded as soon as they are
+    complete. Items larger than a chunk are read in growing chunks, so that
+    decoding is attempted a logarithmic number of times.
+
+    Args:
+        f: File, positioned after the opening bracket of the array.
+
+    Raises:
+        json.JSONDecodeError: If the array is not valid JSON.
+
+    Yields:
+        Start and end positions of the items, in characters from the initial
+        position of the file, and items.
+    """
+    buffer = ""
+    # Position in the file of the start of the buffer.
+    base = 0
+    pos = 0
+    expect_item = True
+    while True:
+        pos = _skip_whitespace(buffer, pos)
+        if pos == len(buffer):
+            buffer, base, pos = (
+                _read_chunk(f, buffer, pos, _CHUNK_SIZE),
+                base + pos,
+                0,
             )
-            if utterance_feedback is not None:
-                dialogue.add_utterance_feedback(
-                    UtteranceFeedback(
-                        utterance_id=annotated_utterance.utterance_id,
-                        feedback=(
-                            BinaryFeedback.POSITIVE
-                            if utterance_feedback == 1
-                            else BinaryFeedback.NEGATIVE
-                        ),
-                    ),
-                    annotated_utterance.utterance_id,
-                )
-        dialogues.append(dialogue)
-
-    return dialogues
+            continue
+        if buffer[pos] == "]":
+            return
+        if not expect_item:
+            if buffer[pos] != ",":
+                raise json.JSONDecodeError("Expecting ','", buffer, pos)
+            pos += 1
+            expect_item = True
+            continue
+        try:
+            item, end = _DECODER.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # The item may continue past the end of the buffer.
+            size = max(_CHUNK_SIZE, len(buffer) - pos)
+            buffer, base, pos = _read_chunk(f, buffer, pos, size), base + pos, 0
+            continue
+        yield base + pos, base + end, item
+        pos = end
+        expect_item = False
+
+
+def _read_chunk(f: IO[str], buffer: str, pos: int, size: int) -> str:
+    """Reads a chunk of a file into a buffer, dropping what was parsed.
+
+    Args:
+        f: File.
+        buffer: Buffer.
+        pos: Position of the first character to keep in the buffer.
+        size: Number of characters to read.
+
+    Raises:
+        json.JSONDecodeError: If the end of the file is reached.
+
+    Returns:
+        The rest of the buffer followed by the chunk.
+    """
+    chunk = f.read(size)
+    if not chunk:
+        raise json.JSONDecodeError("Unterminated array", buffer, pos)
+    return buffer[pos:] + chunk
+
+
+def _skip_whitespace(buffer: str, pos: int) -> int:
+    """Returns the position of the first non-whitespace character from pos.
+
+    Args:
+        buffer: Text.
+        pos: Start position.
+
+    Returns:
+        Position, or the length of the buffer if there is none.
+    """
+    while pos < len(buffer) and buffer[pos] in " \t\n\r":
+        pos += 1
+    return pos
+
+
+def _open_export_file(filepath: str) -> IO[str]:
+    """Opens an export file for reading, decompressing it if needed.
+
+    Args:
+        filepath: Path to the export file.
+
+    Returns:
+        The export file, opened in text mode.
+    """
+    if filepath.endswith(".gz"):
+        return gzip.open(filepath, "rt", encoding="utf-8")
+    if filepath.endswith(".xz"):
+        return lzma.open(filepath, "rt", encoding="utf-8")
+    return open(filepath, encoding="utf-8")
@@ -0,0 +1,455 @@
+"""Index of the dialogues of export files, for random access.
+
+An ExportIndex scans export files once and records, in an SQLite database,
+the conversation, agent and user IDs of each dialogue along with the byte
+offset and length of its record in the file. A dialogue can then be retrieved
+by seeking to its record and decoding only that record, instead of reading
+the whole file.
+
+Both JSON Lines files and JSON arrays are supported, possibly compressed;
+offsets in compressed files are offsets in the decompressed content, so
+retrieving a dialogue from a compressed file decompresses the file up to its
+record. Files are reindexed when their size or modification time changes;
+JSON Lines files that were appended to are only indexed from where their last
+indexing stopped.
+"""
+
+import gzip
+import io
+import json
+import lzma
+import os
+import sqlite3
+import threading
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from typing import Union
+
+from dialoguekit.core.dialogue import Dialogue
+from dialoguekit.utils.corpus_loader import get_corpus_files
+from dialoguekit.utils.dialogue_reader import (
+    _get_conversation_id,
+    _get_participant_ids,
+    _scan_array_items,
+    json_to_dialogue,
+)
+
+_FORMAT_JSON = "json"
+_FORMAT_JSONL = "jsonl"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS export_file (
+    pk INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    format TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    indexed_size INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS record (
+    pk INTEGER PRIMARY KEY,
+    file_pk INTEGER NOT NULL REFERENCES export_file (pk) ON DELETE CASCADE,
+    conversation_id TEXT,
+    agent_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS record_conversation_id
+    ON record (conversation_id);
+CREATE INDEX IF NOT EXISTS record_agent_id ON record (agent_id);
+CREATE INDEX IF NOT EXISTS record_user_id ON record (user_id);
+CREATE INDEX IF NOT EXISTS record_file ON record (file_pk);
+"""
+
+_INSERT_RECORD = (
+    "INSERT INTO record (file_pk, conversation_id, agent_id, user_id, "
+    "offset, length) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# Positions, IDs and record of a dialogue found in an export file.
+_Entry = Tuple[int, int, Optional[str], str, str]
+
+
+class ExportIndex:
+    def __init__(self, database: str = ":memory:") -> None:
+        """Represents an index of the dialogues of export files.
+
+        Args:
+            database: Path to the database file. Defaults to an in-memory
+              database.
+        """
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(
+            database, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        if database != ":memory:":
+            self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def index_files(self, paths: Union[str, Iterable[str]]) -> int:
+        """Indexes export files, skipping those that are up to date.
+
+        Args:
+            paths: Directory holding the export files, glob pattern, or list of
+              paths of export files (see `get_corpus_files()`).
+
+        Returns:
+            Number of dialogues indexed.
+        """
+        return sum(
+            self.index_file(filepath) for filepath in get_corpus_files(paths)
+        )
+
+    def index_file(self, filepath: str) -> int:
+        """Indexes an export file, unless it is up to date.
+
+        Args:
+            filepath: Path to a JSON or JSON Lines export file, possibly
+              compressed.
+
+        Returns:
+            Number of dialogues indexed.
+        """
+        stat = _stat(filepath)
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                num_indexed = self._index_file(cursor, filepath, stat)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        return num_indexed
+
+    def get_record(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the record of the dialogue with a given conversation ID.
+
+        The export file holding the record is reindexed first if it has
+        changed since it was indexed.
+
+        Args:
+            conversation_id: Conversation ID.
+
+        Returns:
+            The last indexed dialogue with the conversation ID, in JSON
+            format, or None if there is no such dialogue.
+        """
+        location = self._locate(conversation_id)
+        if location is None:
+            return None
+        filepath, offset, length, up_to_date = location
+        if not up_to_date:
+            self.index_file(filepath)
+            location = self._locate(conversation_id)
+            if location is None:
+                return None
+            filepath, offset, length, _ = location
+        with _open_binary(filepath) as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def get_dialogue(
+        self, conversation_id: str, lazy: bool = False
+    ) -> Optional[Dialogue]:
+        """Returns the dialogue with a given conversation ID.
+
+        Args:
+            conversation_id: Conversation ID.
+            lazy: Whether the annotations of the utterances are decoded on
+              first access, see `json_to_dialogue()`. Defaults to False.
+
+        Returns:
+            The last indexed dialogue with the conversation ID, or None if
+            there is no such dialogue.
+        """
+        record = self.get_record(conversation_id)
+        if record is None:
+            return None
+        return json_to_dialogue(record, lazy=lazy)
+
+    def find_conversation_ids(
+        self, agent_id: str = None, user_id: str = None
+    ) -> List[str]:
+        """Returns the conversation IDs of the dialogues of participants.
+
+        Args:
+            agent_id: Agent ID. Defaults to None.
+            user_id: User ID. Defaults to None.
+
+        Returns:
+            Conversation IDs, in the order the dialogues were indexed.
+        """
+        conditions = []
+        params: List[Any] = []
+        if agent_id is not None:
+            conditions.append("agent_id = ?")
+            params.append(agent_id)
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT conversation_id FROM record WHERE "
+                f"{' AND '.join(conditions) or '1'} ORDER BY pk",
+                params,
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _index_file(
+        self, cursor: sqlite3.Cursor, filepath: str, stat: Tuple[int, ...]
+    ) -> int:
+        """Indexes an export file within the write transaction.
+
+        Args:
+            cursor: Cursor of the write transaction.
+            filepath: Path to the export file.
+            stat: Size, modification time and inode of the file.
+
+        Returns:
+            Number of dialogues indexed.
+        """
+        size, mtime_ns, inode = stat
+        row = cursor.execute(
+            "SELECT pk, format, size, mtime_ns, inode, indexed_size "
+            "FROM export_file WHERE path = ?",
+            [filepath],
+        ).fetchone()
+        start = 0
+        if row is not None:
+            file_pk, file_format, *indexed_stat, indexed_size = row
+            if tuple(indexed_stat) == stat:
+                return 0
+            if (
+                file_format == _FORMAT_JSONL
+                and not _is_compressed(filepath)
+                and inode == indexed_stat[2]
+                and size >= indexed_size
+            ):
+                # Appended to since it was indexed.
+                start = indexed_size
+            else:
+                cursor.execute(
+                    "DELETE FROM record WHERE file_pk = ?", [file_pk]
+                )
+        else:
+            file_pk = None
+
+        with _open_binary(filepath) as f:
+            file_format, entries, indexed_size = _scan_export_file(f, start)
+        if file_pk is None:
+            file_pk = cursor.execute(
+                "INSERT INTO export_file (path, format, size, mtime_ns, "
+                "inode, indexed_size) VALUES (?, ?, ?, ?, ?, ?)",
+                [filepath, file_format, size, mtime_ns, inode, indexed_size],
+            ).lastrowid
+        else:
+            cursor.execute(
+                "UPDATE export_file SET format = ?, size = ?, mtime_ns = ?, "
+                "inode = ?, indexed_size = ? WHERE pk = ?",
+                [file_format, size, mtime_ns, inode, indexed_size, file_pk],
+            )
+        cursor.executemany(
+            _INSERT_RECORD,
+            [
+                (file_pk, conversation_id, agent_id, user_id, offset, length)
+                for offset, length, conversation_id, agent_id, user_id in (
+                    entries
+                )
+            ],
+        )
+        return len(entries)
+
+    def _locate(
+        self, conversation_id: str
+    ) -> Optional[Tuple[str, int, int, bool]]:
+        """Finds the record of a dialogue.
+
+        Args:
+            conversation_id: Conversation ID.
+
+        Returns:
+            Path of the export file, offset and length of the record, and
+            whether the file is unchanged since it was indexed; None if there
+            is no such dialogue.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT f.path, r.offset, r.length, f.size, f.mtime_ns, "
+                "f.inode FROM record r JOIN export_file f ON f.pk = r.file_pk "
+                "WHERE r.pk = (SELECT MAX(pk) FROM record "
+                "WHERE conversation_id = ?)",
+                [conversation_id],
+            ).fetchone()
+        if row is None:
+            return None
+        filepath, offset, length, *indexed_stat = row
+        try:
+            up_to_date = _stat(filepath) == tuple(indexed_stat)
+        except FileNotFoundError:
+            return None
+        return filepath, offset, length, up_to_date
+
+
+def _scan_export_file(
+    f: IO[bytes], start: int = 0
+) -> Tuple[str, List[_Entry], int]:
+    """Scans an export file for the positions and IDs of its dialogues.
+
+    Args:
+        f: Export file, opened in binary mode.
+        start: Offset to start from, for JSON Lines files. Defaults to 0.
+
+    Returns:
+        Format of the file, entries with the offset, length, conversation ID,
+        agent ID and user ID of each dialogue, and the size of the indexed
+        content.
+    """
+    if start > 0:
+        f.seek(start)
+        entries, indexed_size = _scan_lines(f, start)
+        return _FORMAT_JSONL, entries, indexed_size
+
+    first = f.read(1)
+    while first.isspace():
+        first = f.read(1)
+    if first != b"[":
+        entries, indexed_size = _scan_lines(f, f.tell() - len(first), first)
+        return _FORMAT_JSONL, entries, indexed_size
+
+    array_start = f.tell()
+    # Read as latin-1, so that positions in characters are offsets in bytes.
+    text = io.TextIOWrapper(f, encoding="latin-1", newline="")
+    entries = [
+        (array_start + item_start, item_end - item_start)
+        + tuple(_from_latin1(value) for value in _get_ids(item))
+        for item_start, item_end, item in _scan_array_items(text)
+    ]
+    text.detach()
+    # Arrays are always indexed whole.
+    return _FORMAT_JSON, entries, 0
+
+
+def _scan_lines(
+    f: IO[bytes], offset: int, prefix: bytes = b""
+) -> Tuple[List[_Entry], int]:
+    """Scans the lines of a JSON Lines file.
+
+    A last line that is incomplete, e.g., being written, is left out.
+
+    Args:
+        f: File, opened in binary mode.
+        offset: Offset of the current position of the file, minus the length
+          of the prefix.
+        prefix: Beginning of the first line, already read. Defaults to an
+          empty string.
+
+    Returns:
+        Entries of the dialogues and offset of the end of the last complete
+        line.
+    """
+    entries: List[_Entry] = []
+    lines: Iterator[bytes] = iter(f)
+    if prefix:
+        lines = _chain_first(prefix + f.readline(), f)
+    for line in lines:
+        if not line.endswith(b"\n"):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+        elif line.strip():
+            record = json.loads(line)
+        else:
+            offset += len(line)
+            continue
+        entries.append((offset, len(line)) + _get_ids(record))
+        offset += len(line)
+    return entries, offset
+
+
+def _chain_first(first: bytes, rest: Iterable[bytes]) -> Iterator[bytes]:
+    """Yields a line, then the lines of a file.
+
+    Args:
+        first: First line.
+        rest: Other lines.
+
+    Yields:
+        Lines.
+    """
+    yield first
+    yield from rest
+
+
+def _get_ids(record: Dict[str, Any]) -> Tuple[Optional[str], str, str]:
+    """Returns the conversation, agent and user IDs of a dialogue.
+
+    Args:
+        record: Dialogue in JSON format.
+
+    Returns:
+        Conversation ID, agent ID and user ID.
+    """
+    return (_get_conversation_id(record), *_get_participant_ids(record))
+
+
+def _from_latin1(value: Any) -> Any:
+    """Decodes a string read as latin-1 from UTF-8 content.
+
+    Non-ASCII characters are usually escaped in exports, in which case the
+    string is left as is.
+
+    Args:
+        value: Value.
+
+    Returns:
+        Decoded value.
+    """
+    if not isinstance(value, str) or value.isascii():
+        return value
+    try:
+        return value.encode("latin-1").decode("utf-8")
+    except UnicodeError:
+        return value
+
+
+def _is_compressed(filepath: str) -> bool:
+    return filepath.endswith((".gz", ".xz"))
+
+
+def _open_binary(filepath: str) -> IO[bytes]:
+    """Opens an export file for reading in binary mode, decompressing it.
+
+    Args:
+        filepath: Path to the export file.
+
+    Returns:
+        The export file, seekable in its decompressed content.
+    """
+    if filepath.endswith(".gz"):
+        return gzip.open(filepath, "rb")  # type: ignore[return-value]
+    if filepath.endswith(".xz"):
+        return lzma.open(filepath, "rb")  # type: ignore[return-value]
+    return open(filepath, "rb")
+
+
+def _stat(filepath: str) -> Tuple[int, int, int]:
+    """Returns the size, modification time and inode of a file.
+
+    Args:
+        filepath: Path to the file.
+
+    Returns:
+        Size in bytes, modification time in nanoseconds and inode number.
+    """
+    stat = os.stat(filepath)
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
@@ -0,0 +1,194 @@
+"""Filters on dialogues in the export format.
+
+A RecordFilter is checked on the JSON record of a dialogue, before any
+utterance is built, so that the dialogues it rejects cost no more than their
+parsing. Filters are predicates on records, and can be passed to the readers
+(see `iter_dialogues()`) or to other functions taking records. Filters are
+combined with `&`, and are picklable, so that they can be applied in worker
+processes (see `iter_corpus()`).
+
+Dialogue times are those encoded in conversation IDs: the generation time of
+generated IDs (see `dialoguekit.core.id_generator`), or the Unix time in
+seconds ending legacy '{agent}-{user}-{time}' IDs. Dialogues whose
+conversation ID encodes no time are rejected by filters on time.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
+
+from dialoguekit.core.id_generator import get_id_timestamp
+from dialoguekit.utils.dialogue_reader import (
+    _FIELD_CONVERSATION,
+    _FIELD_DIALOGUE_ACTS,
+    _FIELD_INTENT,
+    _FIELD_UTTERANCE_FEEDBACK,
+    _get_conversation_id,
+    _get_participant_ids,
+)
+
+_Check = Tuple[Callable[[Dict[str, Any], Any], bool], Any]
+
+
+class RecordFilter:
+    def __init__(
+        self,
+        agent_ids: Collection[str] = None,
+        user_ids: Collection[str] = None,
+        min_conversation_id: str = None,
+        max_conversation_id: str = None,
+        start: datetime = None,
+        end: datetime = None,
+        min_turns: int = None,
+        max_turns: int = None,
+        intents: Collection[str] = None,
+        has_feedback: bool = None,
+    ) -> None:
+        """Represents a filter on dialogues in JSON format.
+
+        A dialogue passes the filter if it meets all the given criteria.
+
+        Args:
+            agent_ids: Agent IDs to keep. Defaults to None.
+            user_ids: User IDs to keep. Defaults to None.
+            min_conversation_id: Smallest conversation ID (inclusive).
+              Defaults to None.
+            max_conversation_id: Largest conversation ID (exclusive).
+              Defaults to None.
+            start: Earliest dialogue time (inclusive), timezone-aware.
+              Defaults to None.
+            end: Latest dialogue time (exclusive), timezone-aware. Defaults
+              to None.
+            min_turns: Minimum number of utterances. Defaults to None.
+            max_turns: Maximum number of utterances. Defaults to None.
+            intents: Intent labels, one of which must be the intent of a
+              dialogue act of the dialogue. Defaults to None.
+            has_feedback: Whether the dialogue must have, or must not have,
+              feedback on an utterance. Defaults to None.
+
+        Raises:
+            ValueError: If start or end has no timezone.
+        """
+        for bound in (start, end):
+            if bound is not None and bound.utcoffset() is None:
+                raise ValueError("start and end must be timezone-aware")
+        # Cheapest checks first, so that most dialogues are rejected early.
+        self._checks: List[_Check] = []
+        if agent_ids is not None:
+            self._checks.append((_check_agent, frozenset(agent_ids)))
+        if user_ids is not None:
+            self._checks.append((_check_user, frozenset(user_ids)))
+        if min_conversation_id is not None or max_conversation_id is not None:
+            self._checks.append(
+                (
+                    _check_conversation_id,
+                    (min_conversation_id, max_conversation_id),
+                )
+            )
+        if start is not None or end is not None:
+            self._checks.append((_check_time, (start, end)))
+        if min_turns is not None or max_turns is not None:
+            self._checks.append((_check_turns, (min_turns, max_turns)))
+        if has_feedback is not None:
+            self._checks.append((_check_feedback, has_feedback))
+        if intents is not None:
+            self._checks.append((_check_intents, frozenset(intents)))
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        """Checks whether a dialogue passes the filter.
+
+        Args:
+            record: Dialogue in JSON format.
+
+        Returns:
+            True if the dialogue meets all the criteria.
+        """
+        for check, argument in self._checks:
+            if not check(record, argument):
+                return False
+        return True
+
+    def __and__(self, other: RecordFilter) -> RecordFilter:
+        """Combines two filters into one passing the dialogues both pass."""
+        combined = RecordFilter()
+        combined._checks = self._checks + other._checks
+        return combined
+
+
+def _check_agent(record: Dict[str, Any], agent_ids: Collection[str]) -> bool:
+    return _get_participant_ids(record)[0] in agent_ids
+
+
+def _check_user(record: Dict[str, Any], user_ids: Collection[str]) -> bool:
+    return _get_participant_ids(record)[1] in user_ids
+
+
+def _check_conversation_id(
+    record: Dict[str, Any], bounds: Tuple[str, str]
+) -> bool:
+    conversation_id = _get_conversation_id(record)
+    if conversation_id is None:
+        return False
+    low, high = bounds
+    return (low is None or conversation_id >= low) and (
+        high is None or conversation_id < high
+    )
+
+
+def _check_time(
+    record: Dict[str, Any], bounds: Tuple[datetime, datetime]
+) -> bool:
+    timestamp = _get_dialogue_time(str(_get_conversation_id(record)))
+    if timestamp is None:
+        return False
+    start, end = bounds
+    return (start is None or timestamp >= start) and (
+        end is None or timestamp < end
+    )
+
+
+def _get_dialogue_time(conversation_id: str) -> Optional[datetime]:
+    """Returns the time encoded in a conversation ID.
+
+    Args:
+        conversation_id: Generated or legacy conversation ID.
+
+    Returns:
+        Time in UTC, or None if the ID encodes no time.
+    """
+    try:
+        return get_id_timestamp(conversation_id)
+    except ValueError:
+        pass
+    _, separator, seconds = conversation_id.rpartition("-")
+    if not separator or not seconds.isascii() or not seconds.isdigit():
+        return None
+    try:
+        return datetime.fromtimestamp(int(seconds), timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def _check_turns(record: Dict[str, Any], bounds: Tuple[int, int]) -> bool:
+    num_turns = len(record.get(_FIELD_CONVERSATION) or [])
+    low, high = bounds
+    return (low is None or num_turns >= low) and (
+        high is None or num_turns <= high
+    )
+
+
+def _check_feedback(record: Dict[str, Any], has_feedback: bool) -> bool:
+    found = any(
+        utterance.get(_FIELD_UTTERANCE_FEEDBACK) is not None
+        for utterance in record.get(_FIELD_CONVERSATION) or []
+    )
+    return found == has_feedback
+
+
+def _check_intents(record: Dict[str, Any], intents: Collection[str]) -> bool:
+    for utterance in record.get(_FIELD_CONVERSATION) or []:
+        for da in utterance.get(_FIELD_DIALOGUE_ACTS) or []:
+            if da.get(_FIELD_INTENT) in intents:
+                return True
+    return False
@@ -0,0 +1 @@
+"""Module level init for connector."""
@@ -0,0 +1,182 @@
+"""Tests for the AsyncDialogueConnector."""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, List, Set
+from unittest import mock
+
+from dialoguekit.connector import (
+    AsyncDialogueConnector,
+    InMemoryMetricsSink,
+    SQLiteDialogueStore,
+    TurnLog,
+)
+from dialoguekit.core import AnnotatedUtterance, Utterance
+from dialoguekit.participant import AsyncAgent, AsyncUser, DialogueParticipant
+from sample_agents.parrot_agent import ParrotAgent
+
+_DELAY = 0.1
+_NUM_CONVERSATIONS = 100
+
+
+class AsyncParrotAgent(AsyncAgent):
+    async def welcome(self) -> None:
+        """Sends the agent's welcome message."""
+        await self._dialogue_connector.register_agent_utterance(
+            AnnotatedUtterance("Hello", participant=DialogueParticipant.AGENT)
+        )
+
+    async def goodbye(self) -> None:
+        """Sends the agent's goodbye message."""
+
+    async def receive_utterance(self, utterance: Utterance) -> None:
+        """Parrots the utterance after waiting on (simulated) I/O."""
+        await asyncio.sleep(_DELAY)
+        await self._dialogue_connector.register_agent_utterance(
+            AnnotatedUtterance(
+                "(Parroting) " + utterance.text,
+                participant=DialogueParticipant.AGENT,
+            )
+        )
+
+
+async def _converse(connector: AsyncDialogueConnector, texts: List[str]):
+    """Starts a conversation and sends user inputs."""
+    await connector.start()
+    for text in texts:
+        await connector._user.handle_input(text)
+
+
+def test_concurrent_conversations() -> None:
+    """Tests that conversations wait on their agents concurrently."""
+    connectors = [
+        AsyncDialogueConnector(
+            agent=AsyncParrotAgent("Parrot"),
+            user=AsyncUser(f"USR{i}"),
+            platform=mock.MagicMock(),
+            save_dialogue_history=False,
+        )
+        for i in range(_NUM_CONVERSATIONS)
+    ]
+
+    async def main():
+        await asyncio.gather(
+            *[_converse(connector, ["Hi"]) for connector in connectors]
+        )
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    assert time.perf_counter() - start < _DELAY * _NUM_CONVERSATIONS / 10
+    for connector in connectors:
+        assert [u.text for u in connector.dialogue_history.utterances] == [
+            "Hello",
+            "Hi",
+            "(Parroting) Hi",
+        ]
+
+
+def test_sync_agent(tmp_path, monkeypatch) -> None:
+    """Tests that synchronous agents are run through an adapter."""
+    monkeypatch.chdir(tmp_path)
+    sink = InMemoryMetricsSink()
+    connector = AsyncDialogueConnector(
+        agent=ParrotAgent("Parrot"),
+        user=AsyncUser("USR01"),
+        platform=mock.MagicMock(),
+        metrics_sink=sink,
+    )
+    assert connector._agent.to_dict() == {"id": "Parrot", "type": "AGENT"}
+
+    asyncio.run(_converse(connector, ["Hi"]))
+    assert [u.text for u in connector.dialogue_history.utterances] == [
+        "Hello, I'm Parrot. What can I help u with?",
+        "Hi",
+        "(Parroting) Hi",
+    ]
+    assert "ParrotAgent" in sink.get_latency_report()
+
+    asyncio.run(_converse(connector, ["EXIT"]))
+    assert connector.dialogue_history.utterances == []
+    assert (tmp_path / "dialogue_export" / "Parrot_USR01.json").exists()
+
+
+class ClosingAgent(ParrotAgent):
+    def receive_utterance(self, utterance: Utterance) -> None:
+        """Says goodbye and closes the conversation itself."""
+        self._dialogue_connector.register_agent_utterance(
+            AnnotatedUtterance("Bye", participant=DialogueParticipant.AGENT)
+        )
+        self._dialogue_connector.close()
+
+
+def test_sync_agent_close(tmp_path, monkeypatch) -> None:
+    """Tests that connector coroutines called by sync agents are awaited."""
+    monkeypatch.chdir(tmp_path)
+    connector = AsyncDialogueConnector(
+        agent=ClosingAgent("Parrot"),
+        user=AsyncUser("USR01"),
+        platform=mock.MagicMock(),
+    )
+    asyncio.run(_converse(connector, ["Hi"]))
+
+    assert connector.dialogue_history.utterances == []
+    with open(tmp_path / "dialogue_export" / "Parrot_USR01.json") as f:
+        (dialogue,) = json.load(f)
+    assert [u["utterance"] for u in dialogue["conversation"]] == [
+        "Hello, I'm Parrot. What can I help u with?",
+        "Hi",
+        "Bye",
+    ]
+
+
+class ThreadRecordingTurnLog(TurnLog):
+    def __init__(self, log_dir: str) -> None:
+        """Turn log recording the threads it is written from."""
+        super().__init__(log_dir)
+        self.events: List[str] = []
+        self.threads: Set[int] = set()
+
+    def _write(self, event: str, *args: Any) -> None:
+        self.events.append(event)
+        self.threads.add(threading.get_ident())
+        super()._write(event, *args)
+
+
+class ThreadRecordingStore(SQLiteDialogueStore):
+    threads: Set[int] = set()
+
+    def save_dialogues(self, dialogues: List[Dict[str, Any]]) -> None:
+        self.threads.add(threading.get_ident())
+        super().save_dialogues(dialogues)
+
+
+def test_blocking_io_off_loop(tmp_path) -> None:
+    """Tests that turn log records and stores are written in the executor."""
+    turn_log = ThreadRecordingTurnLog(str(tmp_path))
+    store = ThreadRecordingStore()
+    connector = AsyncDialogueConnector(
+        agent=AsyncParrotAgent("Parrot"),
+        user=AsyncUser("USR01"),
+        platform=mock.MagicMock(),
+        turn_log=turn_log,
+        dialogue_store=store,
+    )
+
+    async def main() -> int:
+        await _converse(connector, ["Hi"])
+        await connector.close()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+    assert turn_log.events == [
+        "start",
+        "utterance",
+        "utterance",
+        "utterance",
+        "end",
+    ]
+    assert loop_thread not in turn_log.threads | store.threads
+    assert len(store.find_dialogues(user_id="USR01")) == 1
+    turn_log.close()
@@ -0,0 +1,136 @@
+"""Tests for the batch simulation runner."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from dialoguekit.connector import (
+    SQLiteDialogueStore,
+    iter_simulated_dialogues,
+    run_simulations,
+)
+from dialoguekit.core import AnnotatedUtterance, Utterance
+from dialoguekit.participant import DialogueParticipant, User
+from dialoguekit.utils import RecordFilter
+from dialoguekit.utils.dialogue_reader import json_to_dialogues
+from sample_agents.parrot_agent import ParrotAgent
+
+
+class SimulatedUser(User):
+    def __init__(self, id: str, num_turns: int) -> None:
+        """Simulated user saying random numbers, then EXIT.
+
+        Args:
+            id: User ID.
+            num_turns: Number of utterances before saying EXIT.
+        """
+        super().__init__(id)
+        self._num_turns = num_turns
+
+    def receive_utterance(self, utterance: Utterance) -> None:
+        """Responds to the agent."""
+        text = str(random.randint(0, 1000)) if self._num_turns else "EXIT"
+        self._num_turns -= 1
+        self._dialogue_connector.register_user_utterance(
+            AnnotatedUtterance(text, participant=DialogueParticipant.USER)
+        )
+
+
+def _create_agent(seed: int) -> ParrotAgent:
+    """Creates a parrot agent."""
+    return ParrotAgent("Parrot")
+
+
+def _create_user(seed: int) -> SimulatedUser:
+    """Creates a user saying EXIT after a number of turns given by the seed."""
+    return SimulatedUser(f"USR{seed % 2}", num_turns=seed % 4)
+
+
+def _create_failing_user(seed: int) -> SimulatedUser:
+    """Creates a simulated user, failing for odd seeds."""
+    if seed % 2:
+        raise RuntimeError("Simulator failure")
+    return _create_user(seed)
+
+
+def _get_texts(dialogue: Dict[str, Any]) -> List[str]:
+    """Returns the texts of the utterances of a dialogue in export format."""
+    return [utterance["utterance"] for utterance in dialogue["conversation"]]
+
+
+def test_iter_simulated_dialogues() -> None:
+    """Tests that conversations are bounded and returned in seed order."""
+    start = datetime.now(timezone.utc) - timedelta(seconds=1)
+    dialogues = list(
+        iter_simulated_dialogues(
+            _create_agent,
+            _create_user,
+            range(10),
+            max_turns=6,
+            processes=2,
+            chunk_size=3,
+        )
+    )
+    assert [d["metadata"]["seed"] for d in dialogues] == list(range(10))
+    for seed, dialogue in enumerate(dialogues):
+        # Welcome, user turns with their replies, EXIT and goodbye.
+        assert len(dialogue["conversation"]) == min(2 * (seed % 4) + 3, 6)
+        assert dialogue["user"] == {"id": f"USR{seed % 2}", "type": "USER"}
+
+    # Conversations are reproducible from their seeds, under new IDs.
+    rerun = list(
+        iter_simulated_dialogues(
+            _create_agent, _create_user, [7], max_turns=6, processes=1
+        )
+    )
+    assert rerun[0]["conversation ID"] != dialogues[7]["conversation ID"]
+    assert _get_texts(rerun[0]) == _get_texts(dialogues[7])
+    assert rerun[0]["metadata"] == {"seed": 7}
+
+    # IDs encode the time, so simulated dialogues fall in time ranges.
+    record_filter = RecordFilter(start=start)
+    assert all(record_filter(dialogue) for dialogue in dialogues)
+
+
+def test_iter_simulated_dialogues_failure() -> None:
+    """Tests that failing conversations are skipped."""
+    dialogues = iter_simulated_dialogues(
+        _create_agent, _create_failing_user, range(6), processes=2
+    )
+    assert [d["metadata"]["seed"] for d in dialogues] == [0, 2, 4]
+
+    with pytest.raises(ValueError):
+        next(iter_simulated_dialogues(_create_agent, _create_user, [], 0))
+
+
+def test_run_simulations(tmp_path) -> None:
+    """Tests that simulated dialogues are saved to a store or export files."""
+    store = SQLiteDialogueStore()
+    assert (
+        run_simulations(
+            _create_agent,
+            _create_user,
+            range(8),
+            processes=2,
+            chunk_size=3,
+            dialogue_store=store,
+        )
+        == 8
+    )
+    assert len(store.find_dialogues(user_id="USR1")) == 4
+
+    export_dir = str(tmp_path)
+    assert (
+        run_simulations(
+            _create_agent, _create_user, range(5), export_dir=export_dir
+        )
+        == 5
+    )
+    dialogues = json_to_dialogues(str(tmp_path / "Parrot_USR0.jsonl"))
+    assert [d.metadata["seed"] for d in dialogues] == [0, 2, 4]
+
+    # Simulating the same seeds again saves new dialogues.
+    run_simulations(_create_agent, _create_user, range(8), dialogue_store=store)
+    assert len(store.find_dialogues(user_id="USR1")) == 8
@@ -0,0 +1,151 @@
+"""Tests for the DialogueConnector."""
+
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from dialoguekit.connector import DialogueConnector, ExportFormat
+from dialoguekit.core import AnnotatedUtterance
+from dialoguekit.participant import DialogueParticipant, User
+from dialoguekit.utils.dialogue_reader import json_to_dialogues
+from sample_agents.parrot_agent import ParrotAgent
+
+
+def _run_conversation(
+    export_format: ExportFormat, user_id: str = "USR01"
+) -> DialogueConnector:
+    """Runs a short conversation with a parrot agent and closes it.
+
+    Args:
+        export_format: Export format used by the connector.
+        user_id: User ID.
+
+    Returns:
+        The closed dialogue connector.
+    """
+    user = User(user_id)
+    connector = DialogueConnector(
+        agent=ParrotAgent("Parrot"),
+        user=user,
+        platform=mock.MagicMock(),
+        export_format=export_format,
+    )
+    connector.start()
+    connector.register_user_utterance(
+        AnnotatedUtterance("Hello", participant=DialogueParticipant.USER)
+    )
+    connector.close()
+    return connector
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch) -> str:
+    """Runs the test from a temporary directory and returns the export path."""
+    monkeypatch.chdir(tmp_path)
+    return os.path.join(tmp_path, "dialogue_export")
+
+
+@pytest.mark.parametrize(
+    "export_format, file_name",
+    [
+        (ExportFormat.JSON, "Parrot_USR01.json"),
+        (ExportFormat.JSONL, "Parrot_USR01.jsonl"),
+    ],
+)
+def test_export_round_trip(
+    export_dir: str, export_format: ExportFormat, file_name: str
+) -> None:
+    """Tests that exported dialogues are read back in both formats."""
+    _run_conversation(export_format)
+    _run_conversation(export_format)
+
+    filepath = os.path.join(export_dir, file_name)
+    dialogues = json_to_dialogues(filepath)
+    assert len(dialogues) == 2
+    assert dialogues[0].agent_id == "Parrot"
+    assert dialogues[0].user_id == "USR01"
+    assert [u.text for u in dialogues[0].utterances] == [
+        "Hello, I'm Parrot. What can I help u with?",
+        "Hello",
+        "(Parroting) Hello",
+    ]
+
+
+def test_export_jsonl_one_dialogue_per_line(export_dir: str) -> None:
+    """Tests that the JSONL export appends one dialogue per line."""
+    connector = _run_conversation(ExportFormat.JSONL)
+    _run_conversation(ExportFormat.JSONL)
+
+    with open(os.path.join(export_dir, "Parrot_USR01.jsonl")) as f:
+        lines = f.readlines()
+    assert len(lines) == 2
+    dialogue = json.loads(lines[0])
+    assert dialogue["agent"] == {"id": "Parrot", "type": "AGENT"}
+    assert (
+        dialogue["conversation ID"]
+        == connector.dialogue_history.conversation_id
+    )
+    assert len(connector.dialogue_history.utterances) == 0
+
+
+def test_export_empty_dialogue(export_dir: str) -> None:
+    """Tests that empty dialogues are not exported."""
+    connector = DialogueConnector(
+        agent=ParrotAgent("Parrot"),
+        user=User("USR01"),
+        platform=mock.MagicMock(),
+        export_format=ExportFormat.JSONL,
+    )
+    connector.close()
+    assert not os.path.exists(export_dir)
+
+
+def test_bounded_history(export_dir: str) -> None:
+    """Tests that spilled utterances are exported and then removed."""
+    connector = DialogueConnector(
+        agent=ParrotAgent("Parrot"),
+        user=User("USR01"),
+        platform=mock.MagicMock(),
+        export_format=ExportFormat.JSONL,
+        max_utterances_in_memory=2,
+    )
+    connector.start()
+    for text in ["One", "Two", "Three"]:
+        connector.register_user_utterance(
+            AnnotatedUtterance(text, participant=DialogueParticipant.USER)
+        )
+    assert len(connector.dialogue_history.utterances) == 2
+    spill_filepath = connector.dialogue_history.spill_filepath
+    assert os.path.exists(spill_filepath)
+
+    connector.close()
+    assert not os.path.exists(spill_filepath)
+    dialogues = json_to_dialogues(
+        os.path.join(export_dir, "Parrot_USR01.jsonl")
+    )
+    assert len(dialogues[0].utterances) == 7
+    assert dialogues[0].utterances[-1].text == "(Parroting) Three"
+
+
+def test_bounded_history_not_saved(export_dir: str) -> None:
+    """Tests that the spill file is removed when the history is not saved."""
+    connector = DialogueConnector(
+        agent=ParrotAgent("Parrot"),
+        user=User("USR01"),
+        platform=mock.MagicMock(),
+        save_dialogue_history=False,
+        max_utterances_in_memory=1,
+    )
+    connector.start()
+    connector.register_user_utterance(
+        AnnotatedUtterance("One", participant=DialogueParticipant.USER)
+    )
+    spill_filepath = connector.dialogue_history.spill_filepath
+    assert os.path.exists(spill_filepath)
+
+    connector.close()
+    assert not os.path.exists(spill_filepath)
+    assert connector.dialogue_history.spill_filepath is None
+    assert not os.path.exists(export_dir)
@@ -0,0 +1,265 @@
+"""Tests for writing dialogue exports."""
+
+import gzip
+import json
+import lzma
+import multiprocessing
+import os
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+from dialoguekit.connector import (
+    DialogueConnector,
+    compact_export_shards,
+    read_manifest,
+    select_export_files,
+)
+from dialoguekit.connector import dialogue_export
+from dialoguekit.connector.dialogue_export import (
+    Compression,
+    ExportFormat,
+    RotationPolicy,
+    export_dialogues,
+    get_export_filepath,
+)
+from dialoguekit.participant import User
+from sample_agents.parrot_agent import ParrotAgent
+
+_NUM_PROCESSES = 4
+_NUM_DIALOGUES = 25
+
+
+def _read(filepath: str, export_format: ExportFormat):
+    """Returns the dialogues of an export file."""
+    with open(filepath) as f:
+        if export_format == ExportFormat.JSON:
+            return json.load(f)
+        return [json.loads(line) for line in f]
+
+
+def _read_shard(filepath: str):
+    """Returns the dialogues of a rotated shard."""
+    open_fn = {".gz": gzip.open, ".xz": lzma.open}.get(
+        os.path.splitext(filepath)[1], open
+    )
+    with open_fn(filepath, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+def _export_many(filepath: str, export_format: ExportFormat, worker: int):
+    """Exports dialogues one at a time."""
+    for i in range(_NUM_DIALOGUES):
+        export_dialogues(filepath, [{"worker": worker, "i": i}], export_format)
+
+
+@pytest.mark.parametrize("content", ["", "[]", "[]\n", '[{"i": 0}]  \n'])
+def test_extend_json(tmp_path, content: str) -> None:
+    """Tests that dialogues are added to existing JSON arrays."""
+    filepath = str(tmp_path / "A_U.json")
+    with open(filepath, "w") as f:
+        f.write(content)
+    expected = json.loads(content) if content else []
+
+    export_dialogues(filepath, [{"i": 1}, {"i": 2}])
+    export_dialogues(filepath, [{"i": 3}])
+    assert _read(filepath, ExportFormat.JSON) == expected + [
+        {"i": 1},
+        {"i": 2},
+        {"i": 3},
+    ]
+
+
+def test_extend_json_invalid(tmp_path) -> None:
+    """Tests that files not holding a JSON array are left untouched."""
+    filepath = str(tmp_path / "A_U.json")
+    with open(filepath, "w") as f:
+        f.write('{"i": 0}')
+    with pytest.raises(ValueError):
+        export_dialogues(filepath, [{"i": 1}])
+    with open(filepath) as f:
+        assert f.read() == '{"i": 0}'
+
+
+@pytest.mark.parametrize("export_format", list(ExportFormat))
+def test_concurrent_export(tmp_path, export_format: ExportFormat) -> None:
+    """Tests that no dialogue is lost when processes export to one file."""
+    filepath = str(tmp_path / f"A_U.{export_format.value}")
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(
+            target=_export_many, args=(filepath, export_format, worker)
+        )
+        for worker in range(_NUM_PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    dialogues = _read(filepath, export_format)
+    assert len(dialogues) == _NUM_PROCESSES * _NUM_DIALOGUES
+    for worker in range(_NUM_PROCESSES):
+        assert [d["i"] for d in dialogues if d["worker"] == worker] == list(
+            range(_NUM_DIALOGUES)
+        )
+
+
+def test_compact_export_shards(tmp_path) -> None:
+    """Tests that shards are merged into the main export files."""
+    export_dir = str(tmp_path)
+    main_file = get_export_filepath(export_dir, "A.1", "U", ExportFormat.JSONL)
+    export_dialogues(main_file, [{"i": 0}], ExportFormat.JSONL)
+    for shard, i in (("w1", 1), ("w2", 2), ("w1", 3)):
+        export_dialogues(
+            get_export_filepath(
+                export_dir, "A.1", "U", ExportFormat.JSONL, shard
+            ),
+            [{"i": i}],
+            ExportFormat.JSONL,
+        )
+    export_dialogues(
+        get_export_filepath(export_dir, "B", "U", ExportFormat.JSONL, "w1"),
+        [{"i": 4}],
+        ExportFormat.JSONL,
+    )
+
+    compacted = compact_export_shards(export_dir)
+    assert sorted(compacted) == sorted(
+        [main_file, os.path.join(export_dir, "B_U.jsonl")]
+    )
+    assert sorted(os.listdir(export_dir)) == ["A.1_U.jsonl", "B_U.jsonl"]
+    assert [d["i"] for d in _read(main_file, ExportFormat.JSONL)] == [
+        0,
+        1,
+        3,
+        2,
+    ]
+    assert compact_export_shards(export_dir) == []
+
+
+def test_connector_sharded_export(tmp_path, monkeypatch) -> None:
+    """Tests that the connector exports to the shard of its worker."""
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError):
+        DialogueConnector(
+            agent=ParrotAgent("Parrot"),
+            user=User("USR01"),
+            platform=mock.MagicMock(),
+            shard_exports=True,
+        )
+
+    connector = DialogueConnector(
+        agent=ParrotAgent("Parrot"),
+        user=User("USR01"),
+        platform=mock.MagicMock(),
+        export_format=ExportFormat.JSONL,
+        shard_exports=True,
+    )
+    connector.start()
+    connector.close()
+
+    (file_name,) = os.listdir("dialogue_export")
+    assert file_name.startswith("Parrot_USR01.shard-")
+    compact_export_shards("dialogue_export")
+    assert os.listdir("dialogue_export") == ["Parrot_USR01.jsonl"]
+
+
+@pytest.mark.parametrize(
+    "rotation",
+    [
+        RotationPolicy(max_bytes=1),
+        RotationPolicy(max_age=0, compression=Compression.LZMA),
+        RotationPolicy(max_bytes=1, compression=Compression.NONE),
+    ],
+)
+def test_export_rotation(tmp_path, rotation: RotationPolicy) -> None:
+    """Tests that export files are rotated into shards listed in a manifest."""
+    export_dir = str(tmp_path)
+    filepath = get_export_filepath(export_dir, "A.1", "U", ExportFormat.JSONL)
+    for i in range(3):
+        export_dialogues(
+            filepath, [{"i": i}], ExportFormat.JSONL, rotation=rotation
+        )
+
+    manifest = read_manifest(export_dir)
+    assert [shard["dialogues"] for shard in manifest["shards"]] == [1, 1]
+    assert list(manifest["active"]) == ["A.1_U.jsonl"]
+    for i, shard in enumerate(manifest["shards"]):
+        assert shard["file"].endswith(".jsonl" + rotation.compression.value)
+        assert shard["source"] == "A.1_U.jsonl"
+        assert shard["start"] <= shard["end"]
+        assert _read_shard(os.path.join(export_dir, shard["file"])) == [
+            {"i": i}
+        ]
+    assert _read(filepath, ExportFormat.JSONL) == [{"i": 2}]
+    assert not [f for f in os.listdir(export_dir) if f.endswith(".part")]
+
+    files = select_export_files(export_dir)
+    assert files[-1] == filepath
+    assert [_read_shard(f)[0]["i"] for f in files] == [0, 1, 2]
+
+
+def test_export_rotation_reused_inode(tmp_path) -> None:
+    """Tests that start times are not taken from rotated files."""
+    export_dir = str(tmp_path)
+    filepath = get_export_filepath(export_dir, "A", "U", ExportFormat.JSONL)
+    rotation = RotationPolicy(max_age=3600)
+    open(filepath, "w").close()
+    stat = os.stat(filepath)
+    # Left over from a rotated file with the same inode.
+    dialogue_export._active_starts[os.path.abspath(filepath)] = (
+        stat.st_dev,
+        stat.st_ino,
+        0.0,
+    )
+    for i in range(3):
+        export_dialogues(
+            filepath, [{"i": i}], ExportFormat.JSONL, rotation=rotation
+        )
+
+    assert read_manifest(export_dir)["shards"] == []
+    assert len(_read(filepath, ExportFormat.JSONL)) == 3
+    assert [
+        key
+        for key in dialogue_export._active_starts
+        if key.startswith(export_dir)
+    ] == [os.path.abspath(filepath)]
+
+
+def test_select_export_files(tmp_path) -> None:
+    """Tests that export files outside of a time range are skipped."""
+    export_dir = str(tmp_path)
+    filepath = get_export_filepath(export_dir, "A", "U", ExportFormat.JSONL)
+    rotation = RotationPolicy(max_bytes=1)
+    for i in range(2):
+        export_dialogues(
+            filepath, [{"i": i}], ExportFormat.JSONL, rotation=rotation
+        )
+    export_dialogues(
+        get_export_filepath(export_dir, "B", "U", ExportFormat.JSONL),
+        [{"i": 2}],
+        ExportFormat.JSONL,
+    )
+
+    now = datetime.now()
+    assert len(select_export_files(export_dir)) == 3
+    assert select_export_files(export_dir, start=now + timedelta(hours=1)) == [
+        filepath,
+        os.path.join(export_dir, "B_U.jsonl"),
+    ]
+    assert select_export_files(export_dir, end=now - timedelta(hours=1)) == [
+        os.path.join(export_dir, "B_U.jsonl")
+    ]
+
+
+def test_export_rotation_json(tmp_path) -> None:
+    """Tests that rotation is rejected for JSON exports."""
+    with pytest.raises(ValueError):
+        export_dialogues(
+            str(tmp_path / "A_U.json"),
+            [{"i": 0}],
+            ExportFormat.JSON,
+            rotation=RotationPolicy(max_bytes=1),
+        )
@@ -0,0 +1,118 @@
+"""Tests for the background export writer."""
+
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from dialoguekit.connector import (
+    DialogueConnector,
+    ExportFormat,
+    ExportWriter,
+    FsyncPolicy,
+    get_export_writer,
+)
+from dialoguekit.core import AnnotatedUtterance
+from dialoguekit.participant import DialogueParticipant, User
+from sample_agents.parrot_agent import ParrotAgent
+
+
+def _read_lines(filepath: str):
+    """Returns the JSON records of a JSON Lines file."""
+    with open(filepath) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_batching(tmp_path) -> None:
+    """Tests that dialogues to the same file are written in one call."""
+    filepath = str(tmp_path / "export" / "A_U.jsonl")
+    writer = ExportWriter(max_batch_size=10, max_delay=60)
+    with mock.patch(
+        "dialoguekit.connector.export_writer.export_dialogues"
+    ) as export_dialogues:
+        for i in range(3):
+            writer.submit(filepath, {"conversation ID": i})
+        assert writer.flush(timeout=5)
+        export_dialogues.assert_called_once_with(
+            filepath,
+            [{"conversation ID": i} for i in range(3)],
+            ExportFormat.JSONL,
+            fsync=False,
+            rotation=None,
+        )
+    writer.shutdown()
+
+
+def test_batch_size_trigger(tmp_path) -> None:
+    """Tests that a full batch is written without waiting for the delay."""
+    filepath = str(tmp_path / "A_U.jsonl")
+    writer = ExportWriter(max_batch_size=2, max_delay=60)
+    writer.submit(filepath, {"conversation ID": 0})
+    writer.submit(filepath, {"conversation ID": 1})
+    writer.submit(filepath, {"conversation ID": 2})
+    writer.shutdown(timeout=5)
+
+    records = _read_lines(filepath)
+    assert [r["conversation ID"] for r in records] == [0, 1, 2]
+
+
+def test_shutdown_drains_queue(tmp_path) -> None:
+    """Tests that pending dialogues are written on shutdown."""
+    writer = ExportWriter(max_batch_size=100, max_delay=60)
+    for i in range(5):
+        writer.submit(
+            str(tmp_path / f"A_U{i % 2}.json"), {"i": i}, ExportFormat.JSON
+        )
+    writer.shutdown(timeout=5)
+
+    with open(tmp_path / "A_U0.json") as f:
+        assert [d["i"] for d in json.load(f)] == [0, 2, 4]
+    with open(tmp_path / "A_U1.json") as f:
+        assert [d["i"] for d in json.load(f)] == [1, 3]
+    assert writer.closed
+    with pytest.raises(RuntimeError):
+        writer.submit(str(tmp_path / "A_U.jsonl"), {})
+
+
+@mock.patch("os.fsync")
+def test_fsync_policy(fsync, tmp_path) -> None:
+    """Tests that the batch fsync policy forces written files to disk."""
+    writer = ExportWriter(fsync_policy=FsyncPolicy.BATCH)
+    writer.submit(str(tmp_path / "A_U.jsonl"), {})
+    writer.submit(str(tmp_path / "B_U.jsonl"), {})
+    writer.shutdown(timeout=5)
+    assert fsync.call_count == 2
+
+
+def test_get_export_writer() -> None:
+    """Tests that the process-wide writer is shared."""
+    writer = get_export_writer()
+    assert get_export_writer() is writer
+    writer.shutdown()
+    assert get_export_writer() is not writer
+
+
+def test_connector_with_writer(tmp_path, monkeypatch) -> None:
+    """Tests that the connector hands the dialogue to the writer on close."""
+    monkeypatch.chdir(tmp_path)
+    writer = ExportWriter()
+    connector = DialogueConnector(
+        agent=ParrotAgent("Parrot"),
+        user=User("USR01"),
+        platform=mock.MagicMock(),
+        export_format=ExportFormat.JSONL,
+        export_writer=writer,
+    )
+    connector.start()
+    connector.register_user_utterance(
+        AnnotatedUtterance("Hello", participant=DialogueParticipant.USER)
+    )
+    connector.close()
+    writer.shutdown(timeout=5)
+
+    records = _read_lines(
+        os.path.join(tmp_path, "dialogue_export", "Parrot_USR01.jsonl")
+    )
+    assert len(records) == 1
+    assert len(records[0]["conversation"]) == 3
@@ -0,0 +1,78 @@
+"""Tests for the metrics sinks and turn timings."""
+
+import time
+from unittest import mock
+
+from dialoguekit.connector import DialogueConnector, InMemoryMetricsSink
+from dialoguekit.core import AnnotatedUtterance, Utterance
+from dialoguekit.participant import DialogueParticipant, User
+from sample_agents.parrot_agent import ParrotAgent
+
+_DELAY = 0.05
+
+
+class SlowParrotAgent(ParrotAgent):
+    def receive_utterance(self, utterance: Utterance) -> None:
+        """Parrots the utterance after a delay."""
+        time.sleep(_DELAY)
+        super().receive_utterance(utterance)
+
+
+def test_in_memory_metrics_sink() -> None:
+    """Tests counters, histograms and percentiles."""
+    sink = InMemoryMetricsSink(max_samples=100)
+    tags = {"agent_class": "A", "participant": "USER"}
+    for value in range(200, 0, -1):
+        sink.observe("dispatch", float(value), tags)
+    sink.observe("dispatch", 1000.0, {"agent_class": "B"})
+    sink.increment("turns", tags=tags)
+    sink.increment("turns", 2, tags=dict(reversed(tags.items())))
+
+    assert sink.get_counter("turns", tags) == 3
+    assert sink.get_counter("turns") == 0
+    assert len(sink.get_observations("dispatch", tags)) == 100
+    assert sink.get_latency_report() == {
+        "A": {"dispatch": {"count": 100, "p50": 50, "p95": 95, "p99": 99}},
+        "B": {"dispatch": {"count": 1, "p50": 1000, "p95": 1000, "p99": 1000}},
+    }
+
+    sink.reset()
+    assert sink.get_latency_report() == {}
+
+
+def test_connector_turn_timings(tmp_path, monkeypatch) -> None:
+    """Tests that the time an agent takes is reported as its dispatch."""
+    monkeypatch.chdir(tmp_path)
+    sink = InMemoryMetricsSink()
+    connector = DialogueConnector(
+        agent=SlowParrotAgent("Parrot"),
+        user=User("USR01"),
+        platform=mock.MagicMock(),
+        metrics_sink=sink,
+    )
+    connector.start()
+    connector.register_user_utterance(
+        AnnotatedUtterance("Hello", participant=DialogueParticipant.USER)
+    )
+    connector.close()
+
+    user_tags = {"agent_class": "SlowParrotAgent", "participant": "USER"}
+    agent_tags = {"agent_class": "SlowParrotAgent", "participant": "AGENT"}
+    assert sink.get_counter("turns", user_tags) == 1
+    assert sink.get_counter("turns", agent_tags) == 2
+    (user_dispatch,) = sink.get_observations("dispatch", user_tags)
+    assert user_dispatch >= _DELAY
+    assert all(
+        dispatch < _DELAY
+        for dispatch in sink.get_observations("dispatch", agent_tags)
+    )
+
+    report = sink.get_latency_report()["SlowParrotAgent"]
+    assert set(report) == {
+        "history_append",
+        "platform_display",
+        "dispatch",
+        "export",
+    }
+    assert report["history_append"]["count"] == 3
+    assert report["export"]["count"] == 1
@@ -0,0 +1,159 @@
+"""Tests for the SQLite dialogue store."""
+
+import datetime
+from typing import Any, Dict
+from unittest import mock
+
+import pytest
+
+from dialoguekit.connector import DialogueConnector, SQLiteDialogueStore
+from dialoguekit.core import (
+    AnnotatedUtterance,
+    Annotation,
+    Dialogue,
+    Intent,
+    SlotValueAnnotation,
+)
+from dialoguekit.core.dialogue_act import DialogueAct
+from dialoguekit.core.feedback import BinaryFeedback, UtteranceFeedback
+from dialoguekit.participant import DialogueParticipant, User
+from sample_agents.parrot_agent import ParrotAgent
+
+
+def _export(dialogue: Dialogue) -> Dict[str, Any]:
+    """Returns a dialogue in the export format."""
+    dialogue_as_dict = dialogue.to_dict()
+    dialogue_as_dict["agent"] = {"id": dialogue.agent_id, "type": "AGENT"}
+    dialogue_as_dict["user"] = {"id": dialogue.user_id, "type": "USER"}
+    return dialogue_as_dict
+
+
+def _dialogue(agent_id: str, user_id: str, conversation_id: str) -> Dialogue:
+    """Returns an annotated dialogue with metadata and feedback."""
+    dialogue = Dialogue(agent_id, user_id, conversation_id)
+    dialogue.metadata.update({"description": "Dialogue for testing"})
+    dialogue.add_utterance(
+        AnnotatedUtterance(
+            "Hello",
+            participant=DialogueParticipant.AGENT,
+            dialogue_acts=[DialogueAct(Intent("GREETINGS"))],
+            annotations=[Annotation("STATE", "start")],
+            metadata={"satisfaction": 3},
+        )
+    )
+    dialogue.add_utterance(
+        AnnotatedUtterance(
+            "I like action movies",
+            participant=DialogueParticipant.USER,
+            dialogue_acts=[
+                DialogueAct(
+                    Intent("DISCLOSE"),
+                    [
+                        SlotValueAnnotation("GENRE", "action", 7, 13),
+                        SlotValueAnnotation("TYPE", "movies"),
+                    ],
+                ),
+                DialogueAct(Intent("ELICIT")),
+            ],
+        )
+    )
+    utterance_id = f"{conversation_id}_{user_id}_1"
+    dialogue.add_utterance_feedback(
+        UtteranceFeedback(utterance_id, BinaryFeedback.NEGATIVE), utterance_id
+    )
+    return dialogue
+
+
+@pytest.fixture
+def store() -> SQLiteDialogueStore:
+    """SQLite dialogue store fixture."""
+    store = SQLiteDialogueStore()
+    yield store
+    store.close()
+
+
+def test_round_trip(store: SQLiteDialogueStore) -> None:
+    """Tests that saved dialogues are read back unchanged."""
+    dialogue = _dialogue("A1", "U1", "CNV1")
+    store.save_dialogue(_export(dialogue))
+
+    loaded = store.get_dialogue("CNV1")
+    assert loaded == dialogue
+    assert loaded.conversation_id == "CNV1"
+    assert loaded.metadata == dialogue.metadata
+    assert loaded.to_dict() == dialogue.to_dict()
+    assert (
+        loaded.get_utterance_feedback("CNV1_U1_1").feedback
+        == BinaryFeedback.NEGATIVE
+    )
+    assert store.get_dialogue("CNV2") is None
+
+
+def test_find_dialogues(store: SQLiteDialogueStore) -> None:
+    """Tests lookup by agent, user and time range."""
+    before = datetime.datetime.now()
+    store.save_dialogues(
+        [
+            _export(_dialogue("A1", "U1", "CNV1")),
+            _export(_dialogue("A1", "U2", "CNV2")),
+        ]
+    )
+    after = datetime.datetime.now() + datetime.timedelta(seconds=1)
+    store.save_dialogue(_export(_dialogue("A2", "U1", "CNV3")))
+
+    def ids(**kwargs):
+        return [d.conversation_id for d in store.find_dialogues(**kwargs)]
+
+    assert ids() == ["CNV1", "CNV2", "CNV3"]
+    assert ids(agent_id="A1") == ["CNV1", "CNV2"]
+    assert ids(user_id="U1") == ["CNV1", "CNV3"]
+    assert ids(agent_id="A2", user_id="U2") == []
+    assert ids(start=before, end=after) == ["CNV1", "CNV2", "CNV3"]
+    assert ids(start=after) == []
+
+
+def test_failed_save_is_rolled_back(store: SQLiteDialogueStore) -> None:
+    """Tests that a failing batch leaves no partial dialogue behind."""
+    invalid = {"conversation ID": "CNV2", "conversation": [{}]}
+    with pytest.raises(Exception):
+        store.save_dialogues([_export(_dialogue("A1", "U1", "CNV1")), invalid])
+    assert store.find_dialogues() == []
+
+
+def test_persistence(tmp_path) -> None:
+    """Tests that dialogues are kept in the database file."""
+    database = str(tmp_path / "dialogues.sqlite")
+    store = SQLiteDialogueStore(database)
+    store.save_dialogue(_export(_dialogue("A1", "U1", "CNV1")))
+    store.close()
+
+    store = SQLiteDialogueStore(database)
+    store.save_dialogue(_export(_dialogue("A1", "U1", "CNV2")))
+    assert [d.conversation_id for d in store.find_dialogues()] == [
+        "CNV1",
+        "CNV2",
+    ]
+    store.close()
+
+
+def test_connector_with_store(store: SQLiteDialogueStore) -> None:
+    """Tests that the connector saves the dialogue to the store on close."""
+    connector = DialogueConnector(
+        agent=ParrotAgent("Parrot"),
+        user=User("USR01"),
+        platform=mock.MagicMock(),
+        dialogue_store=store,
+    )
+    conversation_id = connector.dialogue_history.conversation_id
+    connector.start()
+    connector.register_user_utterance(
+        AnnotatedUtterance("Hello", participant=DialogueParticipant.USER)
+    )
+    connector.close()
+
+    dialogue = store.get_dialogue(conversation_id)
+    assert [u.text for u in dialogue.utterances] == [
+        "Hello, I'm Parrot. What can I help u with?",
+        "Hello",
+        "(Parroting) Hello",
+    ]
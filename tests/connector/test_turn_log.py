@@ -0,0 +1,157 @@
+"""Tests for the turn log."""
+
+import json
+import os
+from unittest import mock
+
+from dialoguekit.connector import (
+    DialogueConnector,
+    ExportWriter,
+    TurnLog,
+    recover_dialogues,
+)
+from dialoguekit.connector.dialogue_export import ExportFormat
+from dialoguekit.core import AnnotatedUtterance
+from dialoguekit.core.feedback import BinaryFeedback
+from dialoguekit.participant import DialogueParticipant, User
+from dialoguekit.utils.dialogue_reader import json_to_dialogue
+from sample_agents.parrot_agent import ParrotAgent
+
+
+def _start_conversation(
+    turn_log: TurnLog, conversation_id: str = None
+) -> DialogueConnector:
+    """Starts a conversation logged to a turn log, without closing it.
+
+    Args:
+        turn_log: Turn log.
+        conversation_id: Conversation ID. Defaults to None.
+
+    Returns:
+        The dialogue connector.
+    """
+    connector = DialogueConnector(
+        agent=ParrotAgent("Parrot"),
+        user=User("USR01"),
+        platform=mock.MagicMock(),
+        conversation_id=conversation_id,
+        save_dialogue_history=False,
+        turn_log=turn_log,
+    )
+    connector.start()
+    connector.register_user_utterance(
+        AnnotatedUtterance("Hello", participant=DialogueParticipant.USER)
+    )
+    return connector
+
+
+def test_recover_dialogues(tmp_path) -> None:
+    """Tests that an unfinished conversation is recovered from the log."""
+    log_dir = str(tmp_path)
+    turn_log = TurnLog(log_dir)
+    connector = _start_conversation(turn_log)
+    utterance_id = connector.dialogue_history.utterances[-1].utterance_id
+    connector.register_user_feedback(BinaryFeedback.POSITIVE, utterance_id)
+
+    # The log of a running process is not recovered.
+    assert recover_dialogues(log_dir) == []
+
+    # Simulates a crash.
+    turn_log.close()
+    with open(turn_log.filepath, "a") as log_file:
+        log_file.write('{"event": "utter')
+
+    (dialogue_data,) = recover_dialogues(log_dir)
+    history = connector.dialogue_history
+    assert dialogue_data["agent"] == {"id": "Parrot", "type": "AGENT"}
+    assert dialogue_data["user"] == {"id": "USR01", "type": "USER"}
+    assert dialogue_data["conversation"][-1]["utterance_feedback"] == 1
+    dialogue = json_to_dialogue(dialogue_data)
+    assert dialogue.conversation_id == history.conversation_id
+    assert [u.text for u in dialogue.utterances] == [
+        u.text for u in history.utterances
+    ]
+
+    assert len(recover_dialogues(log_dir, remove=True)) == 1
+    assert os.listdir(log_dir) == []
+    assert recover_dialogues(log_dir) == []
+
+
+def test_ended_dialogue_not_recovered(tmp_path) -> None:
+    """Tests that closed conversations are not recovered."""
+    log_dir = str(tmp_path)
+    turn_log = TurnLog(log_dir)
+    _start_conversation(turn_log).close()
+    turn_log.close()
+    assert recover_dialogues(log_dir) == []
+
+
+def test_turn_log_restart(tmp_path) -> None:
+    """Tests that the log file is removed once all conversations ended."""
+    log_dir = str(tmp_path)
+    turn_log = TurnLog(log_dir, max_bytes=1)
+    first = _start_conversation(turn_log, "CNV1")
+    second = _start_conversation(turn_log, "CNV2")
+    first.close()
+    assert os.path.exists(turn_log.filepath)
+    second.close()
+    assert not os.path.exists(turn_log.filepath)
+
+    _start_conversation(turn_log, "CNV3")
+    turn_log.close()
+    (dialogue_data,) = recover_dialogues(log_dir)
+    assert dialogue_data["conversation ID"] == "CNV3"
+
+
+def test_turn_log_roll_over(tmp_path) -> None:
+    """Tests that ended conversations are dropped while others stay open."""
+    log_dir = str(tmp_path)
+    turn_log = TurnLog(log_dir, max_bytes=4096)
+    open_connector = _start_conversation(turn_log, "CNV0")
+    sizes = []
+    for index in range(1, 100):
+        _start_conversation(turn_log, f"CNV{index}").close()
+        sizes.append(os.path.getsize(turn_log.filepath))
+    assert max(sizes) < 2 * 4096
+    open_connector.register_user_utterance(
+        AnnotatedUtterance("Still there", participant=DialogueParticipant.USER)
+    )
+
+    turn_log.close()
+    (dialogue_data,) = recover_dialogues(log_dir)
+    assert dialogue_data["conversation ID"] == "CNV0"
+    assert [u["utterance"] for u in dialogue_data["conversation"]] == [
+        u.text for u in open_connector.dialogue_history.utterances
+    ]
+    assert os.listdir(log_dir) == [os.path.basename(turn_log.filepath)]
+
+
+def test_turn_log_end_after_export(tmp_path, monkeypatch) -> None:
+    """Tests that the end is only logged once the export is written."""
+    monkeypatch.chdir(tmp_path)
+    turn_log = TurnLog(str(tmp_path / "turns"))
+    export_writer = ExportWriter(max_delay=60)
+    connector = DialogueConnector(
+        agent=ParrotAgent("Parrot"),
+        user=User("USR01"),
+        platform=mock.MagicMock(),
+        export_format=ExportFormat.JSONL,
+        export_writer=export_writer,
+        turn_log=turn_log,
+    )
+    connector.start()
+    connector.register_user_utterance(
+        AnnotatedUtterance("Hello", participant=DialogueParticipant.USER)
+    )
+    connector.close()
+
+    def _read_events():
+        with open(turn_log.filepath) as log_file:
+            return [json.loads(line)["event"] for line in log_file]
+
+    assert "end" not in _read_events()
+    assert export_writer.flush(timeout=10)
+    export_writer.shutdown()
+    assert _read_events()[-1] == "end"
+    turn_log.close()
+    assert recover_dialogues(str(tmp_path / "turns")) == []
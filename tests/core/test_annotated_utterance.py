@@ -1,8 +1,15 @@
 """Tests for the Utterance class."""
 
 from dialoguekit.core import AnnotatedUtterance, Intent
+from dialoguekit.core.annotated_utterance import (
+    get_raw_annotations,
+    get_raw_dialogue_acts,
+)
 from dialoguekit.core.annotation import Annotation
 from dialoguekit.core.dialogue_act import DialogueAct
+from dialoguekit.core.dialogue_act import (
+    get_raw_annotations as get_raw_da_annotations,
+)
 from dialoguekit.core.slot_value_annotation import SlotValueAnnotation
 from dialoguekit.participant import DialogueParticipant
 
@@ -96,3 +103,58 @@ def test_add_dialogue_acts() -> None:
 
     assert u1.get_intents() == [Intent("1"), Intent("2")]
     assert u1.num_dialogue_act_annotations() == 1
+
+
+def test_compact_layout() -> None:
+    """Tests that utterances are slotted and create containers lazily."""
+    u1 = AnnotatedUtterance("Test1", participant=DialogueParticipant.USER)
+    assert not hasattr(u1, "__dict__")
+    assert u1.get_intents() == []
+    assert u1.num_dialogue_act_annotations() == 0
+    assert get_raw_dialogue_acts(u1) is None
+
+    u1.metadata["key"] = "value"
+    u1.annotations.append(Annotation("key", "value"))
+    u1.dialogue_acts.append(DialogueAct(Intent("1")))
+    u1.dialogue_acts[0].annotations.append(SlotValueAnnotation("year", "2023"))
+    assert u1.metadata == {"key": "value"}
+    assert u1.get_intents() == [Intent("1")]
+    assert u1.num_dialogue_act_annotations() == 1
+
+
+def test_compact_comparison() -> None:
+    """Tests that missing containers compare equal to empty ones."""
+    u1 = AnnotatedUtterance("Test1", participant=DialogueParticipant.USER)
+    u2 = AnnotatedUtterance(
+        "Test1",
+        participant=DialogueParticipant.USER,
+        dialogue_acts=[],
+        annotations=[],
+        metadata={},
+    )
+    revision = u1.revision
+    assert u1 == u2
+    assert hash(u1) == hash(u2)
+    assert DialogueAct(Intent("1")) == DialogueAct(Intent("1"), [])
+    assert get_raw_dialogue_acts(u1) is None
+    assert u1.revision == revision
+
+
+def test_comparison_keeps_revision() -> None:
+    """Tests that comparing utterances does not change their revision."""
+    u1 = AnnotatedUtterance(
+        "Test1",
+        participant=DialogueParticipant.USER,
+        dialogue_acts=[DialogueAct(Intent("1"))],
+    )
+    u2 = AnnotatedUtterance(
+        "Test1",
+        participant=DialogueParticipant.USER,
+        dialogue_acts=[DialogueAct(Intent("1"), [])],
+    )
+    revisions = (u1.revision, u2.revision)
+    assert u1 == u2
+    assert u1 != AnnotatedUtterance("Test1", DialogueParticipant.USER)
+    assert (u1.revision, u2.revision) == revisions
+    assert get_raw_annotations(u1) is None
+    assert get_raw_da_annotations(get_raw_dialogue_acts(u1)[0]) is None
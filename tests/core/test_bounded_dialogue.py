@@ -0,0 +1,139 @@
+"""Tests for the BoundedDialogue class."""
+
+import os
+
+import pytest
+
+from dialoguekit.core import BoundedDialogue, Dialogue, Utterance
+from dialoguekit.core.feedback import BinaryFeedback, UtteranceFeedback
+from dialoguekit.participant import DialogueParticipant
+
+
+def _add_utterances(dialogue: Dialogue, num_utterances: int) -> None:
+    """Adds alternating agent and user utterances to a dialogue."""
+    for i in range(num_utterances):
+        dialogue.add_utterance(
+            Utterance(
+                f"Utterance {i}",
+                participant=(
+                    DialogueParticipant.USER
+                    if i % 2
+                    else DialogueParticipant.AGENT
+                ),
+            )
+        )
+
+
+@pytest.fixture
+def spill_dir(tmp_path) -> str:
+    """Directory of the spill files."""
+    return str(tmp_path / "dialogue_spill")
+
+
+def test_spill(spill_dir: str) -> None:
+    """Tests that only the last utterances are kept in memory."""
+    dialogue = BoundedDialogue(
+        "agent-001", "USR01", "CNV1", max_utterances=3, spill_dir=spill_dir
+    )
+    unbounded = Dialogue("agent-001", "USR01", "CNV1")
+    _add_utterances(dialogue, 10)
+    _add_utterances(unbounded, 10)
+
+    assert len(dialogue.utterances) == 3
+    assert dialogue.num_spilled == 7
+    assert dialogue.current_turn_id == 10
+    assert dialogue.utterances[-1].utterance_id == "CNV1_USR01_9"
+    assert dialogue.to_dict() == unbounded.to_dict()
+    assert dialogue.fingerprint == unbounded.fingerprint
+    assert [r["utterance"] for r in dialogue.iter_serialized(6)] == [
+        f"Utterance {i}" for i in range(6, 10)
+    ]
+
+
+def test_spill_cache(spill_dir: str) -> None:
+    """Tests that serialized utterances stay cached as others are spilled."""
+    dialogue = BoundedDialogue(
+        "agent-001", "USR01", "CNV1", max_utterances=3, spill_dir=spill_dir
+    )
+    _add_utterances(dialogue, 53)
+    assert len(dialogue._records) <= 3
+    assert [r["utterance"] for r in dialogue.iter_serialized(50)] == [
+        f"Utterance {i}" for i in range(50, 53)
+    ]
+
+    dialogue = BoundedDialogue(
+        "agent-001", "USR01", "CNV1", max_utterances=3, spill_dir=spill_dir
+    )
+    _add_utterances(dialogue, 3)
+    last = next(dialogue.iter_serialized(2))
+    _add_utterances(dialogue, 2)
+    assert next(dialogue.iter_serialized(2)) is last
+
+
+@pytest.mark.skipif(
+    not os.path.isdir("/proc/self/fd"), reason="Needs /proc/self/fd"
+)
+def test_spill_file_closed(spill_dir: str) -> None:
+    """Tests that the spill file is not kept open between spills."""
+    dialogue = BoundedDialogue(
+        "agent-001", "USR01", "CNV1", max_utterances=1, spill_dir=spill_dir
+    )
+    _add_utterances(dialogue, 3)
+    open_files = [
+        os.path.realpath(os.path.join("/proc/self/fd", fd))
+        for fd in os.listdir("/proc/self/fd")
+    ]
+    assert os.path.realpath(dialogue.spill_filepath) not in open_files
+
+
+def test_clear(spill_dir: str) -> None:
+    """Tests that clearing a dialogue removes the spilled utterances."""
+    dialogue = BoundedDialogue(
+        "agent-001", "USR01", "CNV1", max_utterances=2, spill_dir=spill_dir
+    )
+    unbounded = Dialogue("agent-001", "USR01", "CNV1")
+    _add_utterances(dialogue, 5)
+    spill_filepath = dialogue.spill_filepath
+
+    dialogue.clear()
+    assert not os.path.exists(spill_filepath)
+    assert dialogue.num_spilled == 0
+    assert dialogue.current_turn_id == 0
+    assert dialogue.to_dict()["conversation"] == []
+
+    _add_utterances(dialogue, 3)
+    _add_utterances(unbounded, 3)
+    assert dialogue.to_dict() == unbounded.to_dict()
+    assert dialogue.fingerprint == unbounded.fingerprint
+
+
+def test_feedback_on_spilled_utterance(spill_dir: str) -> None:
+    """Tests that feedback is applied to spilled utterances."""
+    dialogue = BoundedDialogue(
+        "agent-001", "USR01", "CNV1", max_utterances=1, spill_dir=spill_dir
+    )
+    _add_utterances(dialogue, 3)
+    dialogue.add_utterance_feedback(
+        UtteranceFeedback("CNV1_agent-001_0", BinaryFeedback.NEGATIVE),
+        "CNV1_agent-001_0",
+    )
+    assert dialogue.to_dict()["conversation"][0]["utterance_feedback"] == 0
+
+
+def test_discard_spilled(spill_dir: str) -> None:
+    """Tests removing the spill file."""
+    dialogue = BoundedDialogue(
+        "agent-001", "USR01", "CNV1", max_utterances=2, spill_dir=spill_dir
+    )
+    assert dialogue.spill_filepath is None
+    _add_utterances(dialogue, 4)
+    spill_filepath = dialogue.spill_filepath
+    assert os.path.exists(spill_filepath)
+
+    dialogue.discard_spilled()
+    assert not os.path.exists(spill_filepath)
+    assert dialogue.num_spilled == 0
+    assert len(dialogue.to_dict()["conversation"]) == 2
+
+    with pytest.raises(ValueError):
+        BoundedDialogue("agent-001", "USR01", max_utterances=0)
@@ -1,8 +1,5 @@
 """Tests for the Dialogue class."""
 
-import calendar
-import datetime
-
 import pytest
 
 from dialoguekit.core import (
@@ -16,6 +13,7 @@ from dialoguekit.core import (
 from dialoguekit.core.dialogue_act import DialogueAct
 from dialoguekit.core.feedback import BinaryFeedback, UtteranceFeedback
 from dialoguekit.participant import DialogueParticipant
+from dialoguekit.utils.dialogue_reader import json_to_dialogue
 
 
 # Dialogue history object to be shared across multiple test cases.
@@ -112,9 +110,9 @@ def test_initialization():
     dialogue_1 = Dialogue(agent_id, user_id, conversation_id)
     assert dialogue_1.conversation_id == conversation_id
     dialogue_2 = Dialogue(agent_id, user_id)
-    date = datetime.datetime.utcnow()
-    utc_time = calendar.timegm(date.utctimetuple())
-    assert dialogue_2.conversation_id == f"{agent_id}-{user_id}-{str(utc_time)}"
+    dialogue_3 = Dialogue(agent_id, user_id)
+    assert len(dialogue_2.conversation_id) == 26
+    assert dialogue_2.conversation_id < dialogue_3.conversation_id
 
 
 def test_ids(dialogue_history_1: Dialogue) -> None:
@@ -245,3 +243,256 @@ def test_to_dict_d3(dialogue_history_3: Dialogue) -> None:
     assert dialogue_dict_3.get("metadata") is None
     assert len(dialogue_dict_3.get("conversation")) == 0
     assert len(dialogue_dict_3.keys()) == 4
+
+
+def _copy_dialogue(dialogue: Dialogue, conversation_id: str) -> Dialogue:
+    """Copies the content of a dialogue under a new conversation ID."""
+    copy = Dialogue(dialogue.agent_id, dialogue.user_id, conversation_id)
+    copy.metadata.update(dialogue.metadata)
+    for utterance in dialogue.utterances:
+        copy.add_utterance(
+            AnnotatedUtterance(
+                utterance.text,
+                participant=utterance.participant,
+                dialogue_acts=utterance.dialogue_acts,
+                annotations=utterance.annotations,
+                metadata=dict(utterance.metadata),
+            )
+        )
+    return copy
+
+
+def test_fingerprint(dialogue_history_2: Dialogue) -> None:
+    """Tests that the fingerprint depends on the content only.
+
+    Args:
+        dialogue_history_2: Test Dialogue object 2.
+    """
+    copy = _copy_dialogue(dialogue_history_2, "CNV2")
+    assert copy != dialogue_history_2
+    assert copy.fingerprint == dialogue_history_2.fingerprint
+
+    copy.utterances[0].metadata["satisfaction"] = 3
+    assert copy.fingerprint == dialogue_history_2.fingerprint
+    copy._fingerprint_digest = None
+    assert copy.fingerprint != dialogue_history_2.fingerprint
+
+    fingerprint = copy.fingerprint
+    copy.add_utterance(Utterance("Blue", participant=DialogueParticipant.USER))
+    assert copy.fingerprint != fingerprint
+
+
+class _Mood:
+    def __init__(self, label: str) -> None:
+        self.label = label
+
+
+def test_fingerprint_metadata(dialogue_history_2: Dialogue) -> None:
+    """Tests that the fingerprint covers the metadata of the dialogue.
+
+    Args:
+        dialogue_history_2: Test Dialogue object 2.
+    """
+    copy = _copy_dialogue(dialogue_history_2, "CNV2")
+    copy.metadata["seed"] = 1
+    assert copy.fingerprint != dialogue_history_2.fingerprint
+    fingerprint = copy.fingerprint
+    copy.metadata["seed"] = 2
+    assert copy.fingerprint != fingerprint
+    del copy.metadata["seed"]
+
+    # Values that are not JSON types are encoded by content, not address.
+    values = [
+        {
+            "mood": _Mood("happy"),
+            "participant": DialogueParticipant.USER,
+            "tags": {"b", "a"},
+        }
+        for _ in range(2)
+    ]
+    copy.metadata.update(values[0])
+    other = _copy_dialogue(dialogue_history_2, "CNV3")
+    other.metadata.update(values[1])
+    assert copy.fingerprint == other.fingerprint
+    other.metadata["mood"] = _Mood("sad")
+    assert copy.fingerprint != other.fingerprint
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_fingerprint_exported(dialogue_history_2: Dialogue, lazy: bool) -> None:
+    """Tests that exported copies of a dialogue have the same fingerprint.
+
+    Args:
+        dialogue_history_2: Test Dialogue object 2.
+        lazy: Whether the annotations are decoded lazily.
+    """
+    copies = []
+    for conversation_id in ["CNV2", "CNV3"]:
+        copy = _copy_dialogue(dialogue_history_2, conversation_id)
+        utterance_id = copy.utterances[1].utterance_id
+        copy.add_utterance_feedback(
+            UtteranceFeedback(utterance_id, BinaryFeedback.POSITIVE),
+            utterance_id,
+        )
+        record = copy.to_dict()
+        # As exported by the dialogue connector.
+        record["agent"] = {"id": record["agent"], "type": "AGENT"}
+        record["user"] = {"id": record["user"], "type": "USER"}
+        copies.append(json_to_dialogue(record, lazy=lazy))
+
+    assert "utterance ID" in copies[0].utterances[0].metadata
+    assert copies[0].fingerprint == copies[1].fingerprint
+    assert copies[0].fingerprint == dialogue_history_2.fingerprint
+    # Exported dialogues are deduplicated by fingerprint.
+    assert len({copy.fingerprint for copy in copies}) == 1
+
+
+def test_ordered_comparison() -> None:
+    """Tests that dialogues with the same utterances in another order differ."""
+    utterances = [
+        Utterance("Hello", DialogueParticipant.AGENT, utterance_id="1"),
+        Utterance("Hi", DialogueParticipant.USER, utterance_id="2"),
+    ]
+    dialogue_1 = Dialogue("agent-001", "USR01", "CNV1")
+    dialogue_2 = Dialogue("agent-001", "USR01", "CNV1")
+    dialogue_3 = Dialogue("agent-001", "USR01", "CNV1")
+    for utterance in utterances:
+        dialogue_1.add_utterance(utterance)
+        dialogue_2.add_utterance(utterance)
+    for utterance in reversed(utterances):
+        dialogue_3.add_utterance(utterance)
+
+    assert dialogue_1 == dialogue_2
+    assert dialogue_1 != dialogue_3
+    assert dialogue_1.fingerprint == dialogue_2.fingerprint
+    assert dialogue_1.fingerprint != dialogue_3.fingerprint
+
+
+def test_iter_serialized() -> None:
+    """Tests that serialized utterances are cached until they may change."""
+    dialogue = Dialogue("agent-001", "USR01", "CNV1")
+    dialogue.add_utterance(
+        AnnotatedUtterance("Hello", participant=DialogueParticipant.AGENT)
+    )
+    dialogue.add_utterance(
+        AnnotatedUtterance("Hi", participant=DialogueParticipant.USER)
+    )
+    records = list(dialogue.iter_serialized())
+    assert [record["utterance"] for record in records] == ["Hello", "Hi"]
+    assert list(dialogue.iter_serialized())[0] is records[0]
+    assert next(dialogue.iter_serialized(start=1)) is records[1]
+    exported = dialogue.to_dict()
+    assert exported["conversation"] == records
+    # Exported utterances are copies, so modifying them leaves the cache be.
+    exported["conversation"][0]["utterance"] = "Modified"
+    exported["conversation"][0]["dialogue_acts"].append({"intent": "X"})
+    assert records[0]["utterance"] == "Hello"
+    assert dialogue.to_dict()["conversation"][0]["dialogue_acts"] == []
+    shared = dialogue.to_dict(copy=False)
+    assert shared["conversation"][0] is records[0]
+
+    dialogue.utterances[0].metadata["satisfaction"] = 3
+    dialogue.add_utterance_feedback(
+        UtteranceFeedback("CNV1_USR01_1", BinaryFeedback.POSITIVE),
+        "CNV1_USR01_1",
+    )
+    dialogue.add_utterance(
+        Utterance("Bye", participant=DialogueParticipant.AGENT)
+    )
+    updated = list(dialogue.iter_serialized())
+    assert updated[0]["satisfaction"] == 3
+    assert updated[1]["utterance_feedback"] == 1
+    assert updated[2]["utterance"] == "Bye"
+    assert all(old is not new for old, new in zip(records, updated))
+
+    dialogue.utterances[2].text = "Goodbye"
+    assert list(dialogue.iter_serialized())[2]["utterance"] == "Goodbye"
+
+
+def test_clear(dialogue_history_2: Dialogue) -> None:
+    """Tests that clearing a dialogue also clears its caches.
+
+    Args:
+        dialogue_history_2: Test Dialogue object 2.
+    """
+    dialogue = _copy_dialogue(dialogue_history_2, "CNV2")
+    utterance_id = dialogue.utterances[0].utterance_id
+    dialogue.add_utterance_feedback(
+        UtteranceFeedback(utterance_id, BinaryFeedback.POSITIVE),
+        utterance_id,
+    )
+    records = list(dialogue.iter_serialized())
+    fingerprint = dialogue.fingerprint
+
+    dialogue.clear()
+    assert dialogue.current_turn_id == 0
+    assert dialogue.to_dict()["conversation"] == []
+    assert dialogue.metadata == dialogue_history_2.metadata
+    assert dialogue.fingerprint != fingerprint
+
+    dialogue.add_utterance(
+        AnnotatedUtterance("Bye", participant=DialogueParticipant.AGENT)
+    )
+    assert dialogue.utterances[0].utterance_id == utterance_id
+    record = next(dialogue.iter_serialized())
+    assert record is not records[0]
+    assert record["utterance"] == "Bye"
+    assert "utterance_feedback" not in record
+
+
+def test_from_records(dialogue_history_2: Dialogue) -> None:
+    """Tests that bulk construction matches adding utterances one by one.
+
+    Args:
+        dialogue_history_2: Test Dialogue object 2.
+    """
+    utterances = [
+        AnnotatedUtterance(
+            utterance.text,
+            participant=utterance.participant,
+            dialogue_acts=utterance.dialogue_acts,
+            annotations=utterance.annotations,
+        )
+        for utterance in dialogue_history_2.utterances
+    ]
+    dialogue = Dialogue.from_records(
+        "agent-002",
+        "USR02",
+        utterances,
+        conversation_id="CNV1",
+        feedbacks={2: BinaryFeedback.POSITIVE},
+        metadata={"description": "Dialogue fixture for testing"},
+    )
+    assert dialogue._utterances is utterances
+    assert dialogue.fingerprint == dialogue_history_2.fingerprint
+    assert utterances[0].utterance_id is None
+
+    assert dialogue.to_dict() == dialogue_history_2.to_dict()
+    assert [utterance.utterance_id for utterance in utterances] == [
+        "CNV1_agent-002_0",
+        "CNV1_USR02_1",
+        "CNV1_agent-002_2",
+    ]
+    assert dialogue == dialogue_history_2
+
+    dialogue.add_utterance(
+        Utterance("Blue", participant=DialogueParticipant.USER)
+    )
+    assert dialogue.utterances[-1].utterance_id == "CNV1_USR02_3"
+
+
+def test_from_records_pending_feedback() -> None:
+    """Tests that feedback is assigned before it is read."""
+    dialogue = Dialogue.from_records(
+        "agent-001",
+        "USR01",
+        [
+            Utterance("Hello", DialogueParticipant.AGENT, utterance_id="U1"),
+            Utterance("Hi", DialogueParticipant.USER),
+        ],
+        conversation_id="CNV1",
+        feedbacks={0: BinaryFeedback.NEGATIVE},
+    )
+    feedback = dialogue.get_utterance_feedback("U1")
+    assert feedback == UtteranceFeedback("U1", BinaryFeedback.NEGATIVE)
+    assert dialogue.utterances[1].utterance_id == "CNV1_USR01_1"
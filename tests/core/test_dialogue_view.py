@@ -0,0 +1,68 @@
+"""Tests for the DialogueView class."""
+
+import pytest
+
+from dialoguekit.core import Dialogue, DialogueView, Utterance
+from dialoguekit.participant import DialogueParticipant
+
+
+@pytest.fixture
+def dialogue() -> Dialogue:
+    """Dialogue with five utterances."""
+    dialogue = Dialogue("agent-001", "USR01", "CNV1")
+    for i in range(5):
+        dialogue.add_utterance(
+            Utterance(
+                f"Utterance {i}",
+                participant=(
+                    DialogueParticipant.USER
+                    if i % 2
+                    else DialogueParticipant.AGENT
+                ),
+            )
+        )
+    return dialogue
+
+
+def test_view(dialogue: Dialogue) -> None:
+    """Tests that a view refers to a range of the utterances."""
+    view = dialogue.get_view(1, 4)
+    assert isinstance(view, DialogueView)
+    assert len(view) == 3
+    assert view[0] is dialogue.utterances[1]
+    assert view[-1] is dialogue.utterances[3]
+    assert list(view) == dialogue.utterances[1:4]
+    assert dialogue.utterances[2] in view
+    with pytest.raises(IndexError):
+        view[3]
+
+    sub_view = view[1:]
+    assert (sub_view.start, sub_view.stop) == (2, 4)
+    assert view.get_texts() == ["Utterance 1", "Utterance 2", "Utterance 3"]
+    assert sub_view.get_text(" ") == "Utterance 2 Utterance 3"
+
+    dialogue.add_utterance(
+        Utterance("Utterance 5", participant=DialogueParticipant.USER)
+    )
+    assert len(dialogue.get_view(-2)) == 2
+    assert len(dialogue.get_view(4, 2)) == 0
+
+
+def test_last_n(dialogue: Dialogue) -> None:
+    """Tests views of the last utterances."""
+    assert list(dialogue.get_last_n(2)) == dialogue.utterances[-2:]
+    assert list(dialogue.get_last_n(10)) == dialogue.utterances
+    assert list(dialogue.get_last_n()) == dialogue.utterances
+
+
+def test_iter_windows(dialogue: Dialogue) -> None:
+    """Tests the windows of the last utterances at every turn."""
+    windows = list(dialogue.iter_windows(2))
+    assert [(window.start, window.stop) for window in windows] == [
+        (0, 1),
+        (0, 2),
+        (1, 3),
+        (2, 4),
+        (3, 5),
+    ]
+    assert windows[-1].get_text() == "Utterance 3 .Utterance 4"
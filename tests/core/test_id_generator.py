@@ -0,0 +1,51 @@
+"""Tests for the generation of IDs."""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+
+from dialoguekit.core.id_generator import (
+    IdGenerator,
+    generate_id,
+    get_id_timestamp,
+    get_min_id,
+)
+
+
+def test_monotonic() -> None:
+    """Tests that IDs are increasing, also within a millisecond."""
+    generator = IdGenerator()
+    with mock.patch("time.time_ns", return_value=1_700_000_000_000_000_000):
+        ids = [generator.generate() for _ in range(1000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 1000
+    assert all(len(id) == 26 for id in ids)
+
+
+def test_threads() -> None:
+    """Tests that IDs generated by concurrent threads are unique."""
+    ids = []
+
+    def generate() -> None:
+        ids.extend(generate_id() for _ in range(1000))
+
+    threads = [threading.Thread(target=generate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(ids)) == 8000
+
+
+def test_timestamps() -> None:
+    """Tests decoding timestamps and time range bounds."""
+    before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+    id = generate_id()
+    assert before <= get_id_timestamp(id) <= datetime.now(timezone.utc)
+    assert get_min_id(before) <= id < get_min_id(before + timedelta(hours=1))
+    with pytest.raises(ValueError):
+        get_id_timestamp("not an ID")
+    with pytest.raises(ValueError):
+        get_id_timestamp("U" * 26)
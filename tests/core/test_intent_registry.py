@@ -0,0 +1,70 @@
+"""Tests for the IntentRegistry class."""
+
+import copy
+import pickle
+
+import pytest
+
+from dialoguekit.core import Intent, IntentRegistry
+from dialoguekit.core.intent_registry import get_default_registry, intern_intent
+
+
+@pytest.fixture
+def registry() -> IntentRegistry:
+    """Registry with a three-level hierarchy."""
+    registry = IntentRegistry()
+    inform = registry.get_intent("INFORM")
+    disclose = registry.get_intent("DISCLOSE", main_intent=inform)
+    registry.get_intent("DISCLOSE.NON-DISCLOSE", main_intent=disclose)
+    registry.get_intent("BYE")
+    return registry
+
+
+def test_interning(registry: IntentRegistry) -> None:
+    """Tests that each label has one canonical intent with a stable ID."""
+    bye = registry.get_intent("BYE")
+    assert registry.get_intent("BYE") is bye
+    assert bye.id == 3
+    assert registry.get_intent_by_id(3) is bye
+    assert registry.get_id(Intent("BYE")) == 3
+    assert registry.get_ids([bye, Intent("NEW")]) == [3, 4]
+    assert len(registry) == 5
+    assert "NEW" in registry
+    assert bye != registry.get_intent("INFORM")
+    assert Intent("BYE").id is None
+
+
+def test_hierarchy(registry: IntentRegistry) -> None:
+    """Tests the ancestor and descendant IDs."""
+    inform = registry.get_intent("INFORM")
+    non_disclose = registry.get_intent("DISCLOSE.NON-DISCLOSE")
+    assert non_disclose.main_intent.main_intent is inform
+    assert registry.get_ancestor_ids(non_disclose) == {0, 1}
+    assert registry.get_descendant_ids(inform) == {1, 2}
+    assert registry.get_descendant_ids(inform) is registry.get_descendant_ids(
+        inform
+    )
+    assert registry.get_ancestor_ids(inform) == frozenset()
+    assert registry.is_sub_intent(non_disclose, inform)
+    assert not registry.is_sub_intent(inform, non_disclose)
+    assert not registry.is_sub_intent(registry.get_intent("BYE"), inform)
+
+
+def test_conflicting_main_intent(registry: IntentRegistry) -> None:
+    """Tests registering a label with another main intent."""
+    with pytest.raises(ValueError):
+        registry.get_intent("DISCLOSE", main_intent=Intent("BYE"))
+    with pytest.raises(ValueError):
+        registry.get_intent("BYE", main_intent=Intent("INFORM"))
+
+
+def test_copy_and_pickle() -> None:
+    """Tests that canonical intents survive copying and pickling."""
+    intent = intern_intent("TEST-COPY")
+    assert copy.deepcopy(intent) is intent
+    assert pickle.loads(pickle.dumps(intent)) is intent
+    assert pickle.loads(pickle.dumps(get_default_registry())) is (
+        get_default_registry()
+    )
+    with pytest.raises(TypeError):
+        pickle.dumps(IntentRegistry().get_intent("TEST-COPY"))
@@ -48,3 +48,11 @@ def test_comparison():
     a1 = SlotValueAnnotation(value="test1", slot="slot1", start=0, end=1)
     a2 = SlotValueAnnotation(value="test1", slot="slot1", start=0, end=2)
     assert a1 != a2
+
+
+def test_slots() -> None:
+    """Tests that slot-value annotations have no instance dictionary."""
+    annotation = SlotValueAnnotation("year", "2023", 5, 9)
+    assert not hasattr(annotation, "__dict__")
+    assert annotation.key == annotation.slot == "year"
+    assert annotation == SlotValueAnnotation("year", "2023", 5, 9)
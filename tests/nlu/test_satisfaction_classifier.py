@@ -49,3 +49,16 @@ def test_classify_last_n_dialogue(dialogue_history_1):
     )
     assert isinstance(label_full, int)
     assert label == 2
+
+
+@pytest.mark.usefixtures("dialogue_history_1")
+def test_classify_windows(dialogue_history_1):
+    """Tests classifying the last utterances at every turn."""
+    sf = SatisfactionClassifierSVM()
+
+    labels = sf.classify_windows(dialogue=dialogue_history_1, last_n=2)
+    assert len(labels) == len(dialogue_history_1.utterances)
+    assert labels[-1] == sf.classify_last_n_dialogue(
+        dialogue=dialogue_history_1, last_n=2
+    )
+    assert labels[0] == sf.classify_view(dialogue_history_1.get_view(0, 1))
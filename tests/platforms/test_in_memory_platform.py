@@ -0,0 +1,32 @@
+"""Tests for the InMemoryPlatform."""
+
+from dialoguekit.platforms import InMemoryPlatform
+from sample_agents import ParrotAgent
+
+
+def test_run_script() -> None:
+    """Tests that agent utterances are recorded per user."""
+    platform = InMemoryPlatform(ParrotAgent, {"save_dialogue_history": False})
+    utterances = platform.run_script("USR01", ["Hi", "EXIT", "Ignored"])
+    assert [u.text for u in utterances] == [
+        "Hello, I'm Parrot. What can I help u with?",
+        "(Parroting) Hi",
+        "It was nice talking to you. Bye",
+    ]
+    assert platform.get_agent_utterances("USR01") == []
+
+
+def test_interleaved_sessions() -> None:
+    """Tests that sessions of several users are kept apart."""
+    platform = InMemoryPlatform(ParrotAgent, {"save_dialogue_history": False})
+    platform.connect("USR01")
+    platform.connect("USR02")
+    platform.message("USR01", "One")
+    platform.message("USR02", "Two")
+    platform.message("USR01", "Three")
+    assert [u.text for u in platform.get_agent_utterances("USR01")[1:]] == [
+        "(Parroting) One",
+        "(Parroting) Three",
+    ]
+    assert len(platform.pop_agent_utterances("USR02")) == 2
+    assert platform.get_agent_utterances("USR02") == []
@@ -0,0 +1,171 @@
+"""Tests for the corpus cache."""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from dialoguekit.core.intent_registry import IntentRegistry
+from dialoguekit.utils import DialogueCorpus
+from dialoguekit.utils.corpus_cache import (
+    _PREFIX,
+    _align,
+    _read_header,
+    get_cache_filepath,
+    load_cached_corpus,
+    read_sidecar,
+)
+
+_FILEPATH = "tests/data/annotated_dialogues.json"
+_COLUMNS = [
+    "dialogue_offsets",
+    "participants",
+    "intent_offsets",
+    "intent_ids",
+    "timestamps",
+    "feedback",
+]
+
+
+def _assert_same_corpus(corpus: DialogueCorpus, expected: DialogueCorpus):
+    """Asserts that two corpora have the same columns."""
+    assert corpus.conversation_ids == expected.conversation_ids
+    assert corpus.agent_ids == expected.agent_ids
+    assert corpus.user_ids == expected.user_ids
+    assert corpus.num_utterances == expected.num_utterances
+    assert [corpus.get_text(i) for i in range(corpus.num_utterances)] == [
+        expected.get_text(i) for i in range(expected.num_utterances)
+    ]
+    for name in _COLUMNS:
+        np.testing.assert_array_equal(
+            getattr(corpus, name), getattr(expected, name)
+        )
+
+
+@pytest.fixture
+def export_filepath(tmp_path) -> str:
+    """Copy of the test export file."""
+    filepath = str(tmp_path / "annotated_dialogues.json")
+    shutil.copy(_FILEPATH, filepath)
+    return filepath
+
+
+def test_load_cached_corpus(export_filepath: str) -> None:
+    """Tests that sidecars are written, then memory-mapped."""
+    expected = DialogueCorpus.from_export_files([_FILEPATH])
+    sidecar_path = get_cache_filepath(export_filepath)
+
+    corpus = load_cached_corpus(export_filepath)
+    assert os.path.exists(sidecar_path)
+    _assert_same_corpus(corpus, expected)
+
+    cached = load_cached_corpus(export_filepath)
+    _assert_same_corpus(cached, expected)
+    for name in ["participants", "intent_ids", "texts"]:
+        assert isinstance(getattr(cached, name).base, np.memmap)
+    assert cached.get_intent_counts() == expected.get_intent_counts()
+
+
+def test_load_cached_corpus_invalidation(export_filepath: str) -> None:
+    """Tests that sidecars of modified export files are rebuilt."""
+    load_cached_corpus(export_filepath)
+    with open(_FILEPATH) as f:
+        content = f.read()
+    with open(export_filepath, "w") as f:
+        f.write(content.replace('"CNV1"', '"CNV2"'))
+    os.utime(export_filepath, ns=(0, 0))
+
+    assert read_sidecar(get_cache_filepath(export_filepath)) is not None
+    corpus = load_cached_corpus(export_filepath)
+    assert corpus.conversation_ids[0] == "CNV2"
+    assert load_cached_corpus(export_filepath).conversation_ids[0] == "CNV2"
+
+
+def test_load_cached_corpus_invalid_sidecar(export_filepath: str) -> None:
+    """Tests that truncated or foreign sidecars are ignored."""
+    sidecar_path = get_cache_filepath(export_filepath)
+    load_cached_corpus(export_filepath)
+    with open(sidecar_path, "r+b") as f:
+        f.truncate(os.path.getsize(sidecar_path) // 2)
+    assert read_sidecar(sidecar_path) is None
+    with open(sidecar_path, "wb") as f:
+        f.write(b"{}")
+    assert read_sidecar(sidecar_path) is None
+    assert len(load_cached_corpus(export_filepath)) == 3
+
+
+def test_load_cached_corpus_encoded_texts(tmp_path) -> None:
+    """Tests that non-ASCII texts are decoded per utterance."""
+    filepath = str(tmp_path / "export.json")
+    texts = ["Bonjour, ça va ?", "Très bien 👍", "", "Merci"]
+    record = {
+        "conversation ID": "CNV1",
+        "agent": {"id": "Agent"},
+        "user": {"id": "USR01"},
+        "conversation": [
+            {
+                "participant": "USER" if index % 2 else "AGENT",
+                "utterance": text,
+                "dialogue_acts": [{"intent": "INFORM"}],
+            }
+            for index, text in enumerate(texts)
+        ],
+    }
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump([record], f, ensure_ascii=False)
+    load_cached_corpus(filepath)
+
+    # A registry giving other IDs to the intents.
+    registry = IntentRegistry()
+    registry.get_intent("OTHER")
+    cached = load_cached_corpus(filepath, registry)
+    assert [cached.get_text(i) for i in range(len(texts))] == texts
+    assert cached.get_intent_counts() == {"INFORM": 4}
+
+    parsed = DialogueCorpus.from_export_files([filepath], registry)
+    both = DialogueCorpus.concatenate([cached, parsed])
+    assert [both.get_text(i) for i in range(2 * len(texts))] == 2 * texts
+    assert both.get_intent_counts() == {"INFORM": 8}
+
+
+def test_load_cached_corpus_corrupt_sidecar(export_filepath: str) -> None:
+    """Tests that sidecars with inconsistent arrays are rebuilt."""
+    expected = DialogueCorpus.from_export_files([_FILEPATH])
+    sidecar_path = get_cache_filepath(export_filepath)
+    load_cached_corpus(export_filepath)
+
+    header = _read_header(sidecar_path)
+    descriptor = header["arrays"]["text_offsets"]
+    offset = (
+        _align(_PREFIX.size + header["length"])
+        + descriptor["offset"]
+        + (descriptor["length"] - 1) * 8
+    )
+    with open(sidecar_path, "r+b") as f:
+        f.seek(offset)
+        f.write((10**9).to_bytes(8, "little"))
+    assert read_sidecar(sidecar_path) is None
+
+    _assert_same_corpus(load_cached_corpus(export_filepath), expected)
+    assert read_sidecar(sidecar_path) is not None
+
+
+def test_load_cached_corpus_multiple_files(
+    export_filepath: str, tmp_path
+) -> None:
+    """Tests that the corpora of several export files are concatenated."""
+    other_filepath = str(tmp_path / "other.json")
+    shutil.copy(_FILEPATH, other_filepath)
+    corpus = load_cached_corpus([export_filepath, other_filepath])
+    expected = DialogueCorpus.from_export_files([_FILEPATH, _FILEPATH])
+    _assert_same_corpus(corpus, expected)
+    assert len(corpus) == 6
+    np.testing.assert_array_equal(
+        corpus.get_turn_counts(), expected.get_turn_counts()
+    )
+
+    cached = load_cached_corpus([export_filepath, other_filepath])
+    _assert_same_corpus(cached, expected)
+    assert isinstance(cached.texts, np.ndarray)
@@ -0,0 +1,137 @@
+"""Tests for the corpus loader."""
+
+import json
+import lzma
+import os
+from concurrent.futures import Future
+from typing import Any, List
+
+import pytest
+
+from dialoguekit.utils import corpus_loader
+from dialoguekit.utils.corpus_loader import (
+    get_corpus_files,
+    iter_corpus,
+    load_corpus,
+)
+from dialoguekit.utils.dialogue_reader import (
+    LazyAnnotatedUtterance,
+    json_to_dialogues,
+)
+
+_FILEPATH = "tests/data/annotated_dialogues.json"
+
+
+@pytest.fixture
+def export_dir(tmp_path) -> str:
+    """Export directory with one file per test dialogue.
+
+    The files are named in the order of the dialogues, and the second one,
+    which is the longest, is written in JSON Lines format.
+    """
+    with open(_FILEPATH) as f:
+        data = json.load(f)
+    for index, dialogue_data in enumerate(data):
+        if index == 1:
+            filepath = tmp_path / f"{index}.jsonl"
+            filepath.write_text(json.dumps(dialogue_data) + "\n")
+        else:
+            filepath = tmp_path / f"{index}.json"
+            filepath.write_text(json.dumps([dialogue_data]))
+    (tmp_path / "manifest.json").write_text("{}")
+    (tmp_path / "notes.txt").write_text("")
+    return str(tmp_path)
+
+
+def test_get_corpus_files(export_dir: str) -> None:
+    """Tests the listing of the export files of a corpus."""
+    expected = [
+        os.path.join(export_dir, file_name)
+        for file_name in ["0.json", "1.jsonl", "2.json"]
+    ]
+    assert get_corpus_files(export_dir) == expected
+    assert get_corpus_files(os.path.join(export_dir, "*.json")) == [
+        expected[0],
+        expected[2],
+    ]
+    # Caches and indexes next to the export files are not exports.
+    open(os.path.join(export_dir, "0.json.corpus"), "w").close()
+    open(os.path.join(export_dir, "index.db"), "w").close()
+    assert get_corpus_files(os.path.join(export_dir, "*")) == expected
+    assert get_corpus_files(export_dir) == expected
+    assert get_corpus_files(reversed(expected)) == expected[::-1]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2, None])
+def test_load_corpus(export_dir: str, max_workers: int) -> None:
+    """Tests that dialogues are loaded in the order of the files."""
+    dialogues = load_corpus(export_dir, max_workers=max_workers)
+    assert dialogues == json_to_dialogues(_FILEPATH)
+    assert [dialogue.conversation_id for dialogue in dialogues][0] == "CNV1"
+
+    dialogues = iter_corpus(
+        export_dir, user_ids=["TEST03"], max_workers=max_workers
+    )
+    assert [dialogue.user_id for dialogue in dialogues] == ["TEST03"]
+
+
+def test_load_corpus_invalid(export_dir: str) -> None:
+    """Tests that the number of workers must be positive."""
+    with pytest.raises(ValueError):
+        load_corpus(export_dir, max_workers=0)
+
+
+def test_iter_corpus_lazy(export_dir: str) -> None:
+    """Tests that workers return lazy utterances undecoded."""
+    dialogues = list(iter_corpus(export_dir, lazy=True, max_workers=2))
+    expected = json_to_dialogues(_FILEPATH, lazy=True)
+    utterance = dialogues[0]._utterances[0]
+    assert isinstance(utterance, LazyAnnotatedUtterance)
+    assert utterance._record is not None
+    # Containers read when pickled would have incremented the revision.
+    assert utterance.revision == expected[0]._utterances[0].revision
+    assert dialogues == expected
+
+
+def test_get_corpus_files_compressed(tmp_path) -> None:
+    """Tests that compressed JSON exports are listed."""
+    with open(_FILEPATH, "rb") as f:
+        data = f.read()
+    with lzma.open(tmp_path / "export.json.xz", "wb") as f:
+        f.write(data)
+    filepath = str(tmp_path / "export.json.xz")
+    assert get_corpus_files(str(tmp_path)) == [filepath]
+    assert load_corpus(str(tmp_path)) == json_to_dialogues(_FILEPATH)
+
+
+class InlineExecutor:
+    submitted: List[Any] = []
+
+    def __init__(self, max_workers: int) -> None:
+        """Executor running tasks on submission, recording their arguments."""
+
+    def __enter__(self) -> "InlineExecutor":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def submit(self, function, *args: Any) -> Future:
+        self.submitted.append(args[0])
+        future: Future = Future()
+        future.set_result(function(*args))
+        return future
+
+
+def test_iter_corpus_window(monkeypatch, export_dir: str) -> None:
+    """Tests that files are submitted in order, two per worker at most."""
+    monkeypatch.setattr(corpus_loader, "ProcessPoolExecutor", InlineExecutor)
+    InlineExecutor.submitted = []
+    for index in range(3, 6):
+        with open(os.path.join(export_dir, f"{index}.json"), "w") as f:
+            f.write("[]")
+    dialogues = iter_corpus(export_dir, max_workers=2)
+    assert next(dialogues).conversation_id == "CNV1"
+    assert InlineExecutor.submitted == get_corpus_files(export_dir)[:4]
+    assert len(list(dialogues)) == 2
+    assert len(InlineExecutor.submitted) == 6
@@ -0,0 +1,119 @@
+"""Tests for the DialogueCorpus class."""
+
+from typing import List
+
+import numpy as np
+import pytest
+
+from dialoguekit.core import AnnotatedUtterance, Dialogue, Intent
+from dialoguekit.core.dialogue_act import DialogueAct
+from dialoguekit.core.feedback import BinaryFeedback, UtteranceFeedback
+from dialoguekit.participant import DialogueParticipant
+from dialoguekit.utils import DialogueCorpus, Evaluator
+from dialoguekit.utils.dialogue_reader import json_to_dialogues
+
+_FILEPATH = "tests/data/annotated_dialogues.json"
+
+
+@pytest.fixture
+def annotated_dialogues() -> List[Dialogue]:
+    """Test dialogue fixture."""
+    return json_to_dialogues(filepath=_FILEPATH)
+
+
+def _add_utterance(
+    dialogue: Dialogue, participant: DialogueParticipant, *intents: str
+) -> None:
+    """Adds an utterance with one dialogue act per intent."""
+    dialogue.add_utterance(
+        AnnotatedUtterance(
+            " ".join(intents),
+            participant=participant,
+            dialogue_acts=[DialogueAct(Intent(intent)) for intent in intents],
+        )
+    )
+
+
+def test_from_export_files(annotated_dialogues: List[Dialogue]) -> None:
+    """Tests that both constructors give the same columns."""
+    corpus = DialogueCorpus.from_dialogues(annotated_dialogues)
+    corpus_from_files = DialogueCorpus.from_export_files([_FILEPATH])
+
+    assert len(corpus) == len(annotated_dialogues) == 3
+    assert corpus.num_utterances == sum(
+        len(dialogue.utterances) for dialogue in annotated_dialogues
+    )
+    assert corpus.conversation_ids == corpus_from_files.conversation_ids
+    assert corpus.texts == corpus_from_files.texts
+    for column in [
+        "dialogue_offsets",
+        "participants",
+        "intent_offsets",
+        "intent_ids",
+        "text_offsets",
+        "feedback",
+    ]:
+        assert np.array_equal(
+            getattr(corpus, column), getattr(corpus_from_files, column)
+        )
+    assert corpus.get_text(0) == annotated_dialogues[0].utterances[0].text
+
+
+def test_evaluator_metrics(annotated_dialogues: List[Dialogue]) -> None:
+    """Tests that metrics match those of the Evaluator."""
+    corpus = DialogueCorpus.from_dialogues(annotated_dialogues)
+    evaluator = Evaluator(
+        annotated_dialogues,
+        {
+            "full_set_points": 20,
+            "intents": {},
+            "repeat_penalty": 1,
+            "cost": 1,
+        },
+    )
+    assert corpus.avg_turns() == pytest.approx(evaluator.avg_turns())
+    assert corpus.user_act_ratio() == pytest.approx(
+        dict(evaluator.user_act_ratio())
+    )
+
+
+def test_repeats_and_intents() -> None:
+    """Tests repeat detection and intent counts."""
+    dialogue_1 = Dialogue("agent-001", "USR01", "CNV1")
+    _add_utterance(dialogue_1, DialogueParticipant.AGENT, "GREETING")
+    _add_utterance(dialogue_1, DialogueParticipant.USER, "DISCLOSE", "BYE")
+    _add_utterance(dialogue_1, DialogueParticipant.USER, "DISCLOSE", "BYE")
+    _add_utterance(dialogue_1, DialogueParticipant.USER, "DISCLOSE")
+    dialogue_1.add_utterance_feedback(
+        UtteranceFeedback("CNV1_agent-001_0", BinaryFeedback.POSITIVE),
+        "CNV1_agent-001_0",
+    )
+    dialogue_2 = Dialogue("agent-001", "USR01", "CNV2")
+    _add_utterance(dialogue_2, DialogueParticipant.USER, "DISCLOSE")
+    _add_utterance(dialogue_2, DialogueParticipant.AGENT, "GREETING")
+    _add_utterance(dialogue_2, DialogueParticipant.AGENT, "GREETING")
+
+    corpus = DialogueCorpus.from_dialogues(
+        [dialogue_1, Dialogue("a", "u"), dialogue_2]
+    )
+    assert corpus.get_utterance_counts().tolist() == [4, 0, 3]
+    assert corpus.get_repeats().tolist() == [
+        False,
+        False,
+        True,
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert corpus.get_repeat_counts().tolist() == [1, 0, 1]
+    assert corpus.get_turn_counts().tolist() == [0.5, 0, 0.5]
+    assert corpus.feedback.tolist() == [1, -1, -1, -1, -1, -1, -1]
+    assert corpus.get_intent_counts() == {
+        "GREETING": 3,
+        "DISCLOSE": 4,
+        "BYE": 2,
+    }
+    assert corpus.get_intent_counts(DialogueParticipant.AGENT) == {
+        "GREETING": 3
+    }
@@ -0,0 +1,46 @@
+"""Tests for the deduplication of dialogue corpora."""
+
+from typing import List
+
+from dialoguekit.core import Dialogue, Utterance
+from dialoguekit.participant import DialogueParticipant
+from dialoguekit.utils.dialogue_deduplication import (
+    deduplicate_dialogues,
+    find_duplicate_dialogues,
+)
+
+
+def _create_dialogue(conversation_id: str, texts: List[str]) -> Dialogue:
+    """Creates a dialogue with alternating agent and user utterances."""
+    dialogue = Dialogue("agent-001", "USR01", conversation_id)
+    for i, text in enumerate(texts):
+        dialogue.add_utterance(
+            Utterance(
+                text,
+                participant=(
+                    DialogueParticipant.USER
+                    if i % 2
+                    else DialogueParticipant.AGENT
+                ),
+            )
+        )
+    return dialogue
+
+
+def test_deduplicate_dialogues() -> None:
+    """Tests keeping the first dialogue of each content."""
+    dialogues = [
+        _create_dialogue("CNV1", ["Hello", "Hi"]),
+        _create_dialogue("CNV2", ["Hello", "Bye"]),
+        _create_dialogue("CNV3", ["Hello", "Hi"]),
+        _create_dialogue("CNV4", ["Hi", "Hello"]),
+        _create_dialogue("CNV5", ["Hello", "Bye"]),
+    ]
+    assert [
+        dialogue.conversation_id
+        for dialogue in deduplicate_dialogues(dialogues)
+    ] == ["CNV1", "CNV2", "CNV4"]
+    assert sorted(find_duplicate_dialogues(dialogues).values()) == [
+        ["CNV1", "CNV3"],
+        ["CNV2", "CNV5"],
+    ]
@@ -1,13 +1,23 @@
 """Tests for the dialogue reader."""
 
+import gzip
+import json
+import lzma
+import pickle
 from typing import List
 
 import pytest
 
+from dialoguekit.core.annotation import Annotation
 from dialoguekit.core.feedback import BinaryFeedback
 from dialoguekit.core.intent import Intent
 from dialoguekit.participant import DialogueParticipant
-from dialoguekit.utils.dialogue_reader import json_to_dialogues
+from dialoguekit.utils import dialogue_reader
+from dialoguekit.utils.dialogue_reader import (
+    LazyAnnotatedUtterance,
+    iter_dialogues,
+    json_to_dialogues,
+)
 
 
 def test_json_to_dialogues() -> None:
@@ -74,3 +84,123 @@ def test_json_to_dialogues_filtered(
         user_ids=user_ids,
     )
     assert len(dialogues) == expected_dialogue_count
+
+
+def test_json_to_dialogues_jsonl(tmp_path) -> None:
+    """Tests reading of dialogues in JSON Lines format."""
+    with open("tests/data/annotated_dialogues.json") as f:
+        data = json.load(f)
+    filepath = tmp_path / "annotated_dialogues.jsonl"
+    with open(filepath, "w") as f:
+        for dialogue_data in data:
+            f.write(json.dumps(dialogue_data) + "\n")
+
+    dialogues = json_to_dialogues(filepath=str(filepath))
+    expected = json_to_dialogues(filepath="tests/data/annotated_dialogues.json")
+    assert dialogues == expected
+    assert dialogues[0].conversation_id == "CNV1"
+
+    dialogues = json_to_dialogues(
+        filepath=str(filepath), agent_ids=["MovieBotTester"]
+    )
+    assert len(dialogues) == 1
+
+
+@pytest.mark.parametrize(
+    "extension,open_fn", [(".gz", gzip.open), (".xz", lzma.open)]
+)
+def test_json_to_dialogues_compressed(tmp_path, extension, open_fn) -> None:
+    """Tests reading of compressed JSON Lines exports."""
+    with open("tests/data/annotated_dialogues.json") as f:
+        data = json.load(f)
+    filepath = tmp_path / f"annotated_dialogues.jsonl{extension}"
+    with open_fn(filepath, "wt") as f:
+        for dialogue_data in data:
+            f.write(json.dumps(dialogue_data) + "\n")
+
+    dialogues = json_to_dialogues(filepath=str(filepath))
+    expected = json_to_dialogues(filepath="tests/data/annotated_dialogues.json")
+    assert dialogues == expected
+
+
+def test_json_to_dialogues_lazy() -> None:
+    """Tests that lazily decoded dialogues match eagerly decoded ones."""
+    dialogues = json_to_dialogues(
+        filepath="tests/data/annotated_dialogues.json", lazy=True
+    )
+    expected = json_to_dialogues(filepath="tests/data/annotated_dialogues.json")
+
+    utterance = dialogues[0]._utterances[0]
+    assert isinstance(utterance, LazyAnnotatedUtterance)
+    assert utterance.get_intents() == [Intent("DISCLOSE.NON-DISCLOSE")]
+    assert utterance._pending == ("annotations", "metadata")
+
+    assert [d.to_dict() for d in dialogues] == [d.to_dict() for d in expected]
+    assert dialogues == expected
+    assert utterance._record is None
+
+
+def test_lazy_annotated_utterance() -> None:
+    """Tests that containers are decoded once and can then be modified."""
+    utterance = LazyAnnotatedUtterance.from_record(
+        {
+            "participant": "USER",
+            "utterance": "Hi",
+            "annotations": [["STATE", "start"]],
+        }
+    )
+    assert utterance.dialogue_acts == []
+    utterance.annotations.clear()
+    assert utterance.annotations == []
+    assert utterance.metadata == {}
+
+
+def test_lazy_annotated_utterance_pickle() -> None:
+    """Tests that pickling keeps the pending fields undecoded."""
+    record = {
+        "participant": "USER",
+        "utterance": "Hi",
+        "dialogue_acts": [{"intent": "GREETING"}],
+        "annotations": [["STATE", "start"]],
+    }
+    utterance = LazyAnnotatedUtterance.from_record(record)
+    assert utterance.get_intents() == [Intent("GREETING")]
+    revision = utterance.revision
+
+    restored = pickle.loads(pickle.dumps(utterance))
+    assert utterance._pending == ("annotations", "metadata")
+    assert utterance.revision == revision
+    assert restored._pending == ("annotations", "metadata")
+    assert restored._record == record
+    assert restored.revision == revision
+    assert restored == utterance
+    assert restored.annotations == [Annotation("STATE", "start")]
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1 << 16])
+def test_iter_dialogues(monkeypatch, tmp_path, chunk_size: int) -> None:
+    """Tests incremental parsing of JSON arrays across chunk boundaries."""
+    monkeypatch.setattr(dialogue_reader, "_CHUNK_SIZE", chunk_size)
+    with open("tests/data/annotated_dialogues.json") as f:
+        data = json.load(f)
+    filepath = tmp_path / "annotated_dialogues.json"
+    filepath.write_text("\n " + json.dumps(data, indent=2) + "\n")
+
+    dialogues = iter_dialogues(str(filepath), user_ids=["TEST03"])
+    assert next(dialogues).conversation_id == "CNV1"
+    assert next(dialogues, None) is None
+
+    expected = [dialogue_reader.json_to_dialogue(d) for d in data]
+    assert list(iter_dialogues(str(filepath))) == expected
+    filepath.write_text("[]")
+    assert list(iter_dialogues(str(filepath))) == []
+
+
+def test_iter_dialogues_invalid(tmp_path) -> None:
+    """Tests that truncated JSON arrays are reported."""
+    filepath = tmp_path / "truncated.json"
+    filepath.write_text('[{"conversation": []}, {"conversation": [')
+    dialogues = iter_dialogues(str(filepath))
+    assert next(dialogues).utterances == []
+    with pytest.raises(json.JSONDecodeError):
+        next(dialogues)
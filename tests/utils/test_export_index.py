@@ -0,0 +1,127 @@
+"""Tests for the ExportIndex class."""
+
+import gzip
+import json
+import os
+import shutil
+from typing import Any, Dict, List
+
+import pytest
+
+from dialoguekit.utils import ExportIndex
+from dialoguekit.utils.dialogue_reader import json_to_dialogues
+
+_FILEPATH = "tests/data/annotated_dialogues.json"
+
+
+def _record(conversation_id: str, user_id: str) -> Dict[str, Any]:
+    """Returns a dialogue in JSON format."""
+    return {
+        "conversation ID": conversation_id,
+        "agent": {"id": "Agent"},
+        "user": {"id": user_id},
+        "conversation": [
+            {"participant": "AGENT", "utterance": f"Hi {user_id}"},
+            {"participant": "USER", "utterance": "Bonjour, ça va ?"},
+        ],
+    }
+
+
+def _write_lines(filepath: str, records: List[Dict[str, Any]]) -> None:
+    """Appends dialogues to a JSON Lines file."""
+    with open(filepath, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+@pytest.fixture
+def index():
+    """Export index fixture."""
+    index = ExportIndex()
+    yield index
+    index.close()
+
+
+def test_get_dialogue_array(index: ExportIndex) -> None:
+    """Tests random access to the dialogues of a JSON array."""
+    assert index.index_file(_FILEPATH) == 3
+    assert index.index_file(_FILEPATH) == 0
+    expected = json_to_dialogues(_FILEPATH)
+    for dialogue in expected:
+        assert index.get_dialogue(dialogue.conversation_id) == dialogue
+    assert index.get_dialogue("unknown") is None
+
+
+def test_get_record_utf8(tmp_path, index: ExportIndex) -> None:
+    """Tests that offsets are in bytes when IDs are not ASCII."""
+    filepath = str(tmp_path / "export.json")
+    records = [_record("CNVé", "USRé"), _record("CNV2", "USR02")]
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+    index.index_file(filepath)
+    assert index.find_conversation_ids(user_id="USRé") == ["CNVé"]
+    assert index.get_record("CNVé") == records[0]
+    assert index.get_record("CNV2") == records[1]
+
+
+def test_get_record_compressed(tmp_path, index: ExportIndex) -> None:
+    """Tests random access to the dialogues of a compressed file."""
+    filepath = str(tmp_path / "export.jsonl.gz")
+    records = [_record(f"CNV{i}", f"USR{i % 2}") for i in range(4)]
+    with gzip.open(filepath, "wt") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+
+    assert index.index_files(str(tmp_path)) == 4
+    assert index.get_record("CNV2") == records[2]
+    assert index.find_conversation_ids(agent_id="Agent", user_id="USR1") == [
+        "CNV1",
+        "CNV3",
+    ]
+
+
+def test_index_file_appended(tmp_path, index: ExportIndex) -> None:
+    """Tests that only the new lines of a JSON Lines file are indexed."""
+    filepath = str(tmp_path / "export.jsonl")
+    _write_lines(filepath, [_record("CNV1", "USR01")])
+    with open(filepath, "a") as f:
+        # Line being written.
+        f.write('{"conversation ID": "CNV2"')
+    assert index.index_file(filepath) == 1
+
+    with open(filepath, "a") as f:
+        f.write(', "conversation": []}\n')
+    _write_lines(filepath, [_record("CNV3", "USR03")])
+    assert index.index_file(filepath) == 2
+    assert index.find_conversation_ids() == ["CNV1", "CNV2", "CNV3"]
+    assert index.get_record("CNV3") == _record("CNV3", "USR03")
+
+
+def test_get_record_rewritten(tmp_path, index: ExportIndex) -> None:
+    """Tests that files changed since they were indexed are reindexed."""
+    filepath = str(tmp_path / "export.json")
+    shutil.copy(_FILEPATH, filepath)
+    index.index_file(filepath)
+
+    records = [_record("CNV2", "USR02"), _record("CNV1", "USR01")]
+    with open(filepath, "w") as f:
+        json.dump(records, f)
+    os.utime(filepath, ns=(0, 0))
+    assert index.get_record("CNV1") == records[1]
+    assert index.find_conversation_ids() == ["CNV2", "CNV1"]
+
+    os.remove(filepath)
+    assert index.get_record("CNV1") is None
+
+
+def test_export_index_persistent(tmp_path) -> None:
+    """Tests that the index is kept in the database file."""
+    database = str(tmp_path / "index.db")
+    index = ExportIndex(database)
+    index.index_file(_FILEPATH)
+    index.close()
+
+    index = ExportIndex(database)
+    assert index.index_file(_FILEPATH) == 0
+    assert index.get_record("CNV1")["conversation_id"] == "CNV1"
+    index.close()
@@ -0,0 +1,97 @@
+"""Tests for the RecordFilter class."""
+
+import pickle
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+import pytest
+
+from dialoguekit.core.id_generator import get_min_id
+from dialoguekit.utils import RecordFilter
+from dialoguekit.utils.dialogue_reader import json_to_dialogues
+
+_TIME = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def record() -> Dict[str, Any]:
+    """Dialogue in JSON format fixture."""
+    return {
+        "conversation ID": get_min_id(_TIME),
+        "agent": {"id": "Agent"},
+        "user": {"id": "USR01"},
+        "conversation": [
+            {
+                "participant": "AGENT",
+                "utterance": "Hello",
+                "dialogue_acts": [{"intent": "GREETINGS"}],
+            },
+            {
+                "participant": "USER",
+                "utterance": "Hi",
+                "utterance_feedback": 1,
+            },
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    [
+        ({}, True),
+        ({"agent_ids": ["Agent"], "user_ids": ["USR01"]}, True),
+        ({"user_ids": ["USR02"]}, False),
+        ({"min_conversation_id": get_min_id(_TIME)}, True),
+        ({"max_conversation_id": get_min_id(_TIME)}, False),
+        ({"start": _TIME, "end": _TIME + timedelta(seconds=1)}, True),
+        ({"start": _TIME + timedelta(seconds=1)}, False),
+        ({"end": _TIME}, False),
+        ({"min_turns": 2, "max_turns": 2}, True),
+        ({"min_turns": 3}, False),
+        ({"intents": ["BYE", "GREETINGS"]}, True),
+        ({"intents": ["BYE"]}, False),
+        ({"has_feedback": True}, True),
+        ({"has_feedback": False}, False),
+    ],
+)
+def test_record_filter(
+    record: Dict[str, Any], kwargs: Dict[str, Any], expected: bool
+) -> None:
+    """Tests the criteria of filters, one at a time."""
+    assert RecordFilter(**kwargs)(record) is expected
+
+
+def test_record_filter_composition(record: Dict[str, Any]) -> None:
+    """Tests that combined filters require both filters to pass."""
+    by_user = RecordFilter(user_ids=["USR01"])
+    by_turns = RecordFilter(min_turns=2)
+    assert (by_user & by_turns)(record)
+    assert not (by_user & RecordFilter(intents=["BYE"]))(record)
+    assert pickle.loads(pickle.dumps(by_user & by_turns))(record)
+
+
+def test_record_filter_legacy_ids(record: Dict[str, Any]) -> None:
+    """Tests time filters on IDs that are not generated."""
+    timestamp = int(_TIME.timestamp())
+    record["conversation ID"] = f"Agent-USR01-{timestamp}"
+    assert RecordFilter(start=_TIME, end=_TIME + timedelta(seconds=1))(record)
+    assert not RecordFilter(end=_TIME)(record)
+    record["conversation ID"] = "CNV1"
+    assert not RecordFilter(start=_TIME)(record)
+    del record["conversation ID"]
+    assert not RecordFilter(min_conversation_id="A")(record)
+
+
+def test_json_to_dialogues_record_filter() -> None:
+    """Tests that dialogues are filtered when reading exports."""
+    dialogues = json_to_dialogues(
+        "tests/data/annotated_dialogues.json",
+        record_filter=RecordFilter(min_turns=25, has_feedback=False),
+    )
+    assert [len(dialogue.utterances) for dialogue in dialogues] == [59, 27]
+
+
+def test_record_filter_naive_time() -> None:
+    """Tests that time bounds must be timezone-aware."""
+    with pytest.raises(ValueError):
+        RecordFilter(start=datetime(2024, 5, 1))